@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'django_filters',
     'drf_spectacular',
@@ -57,6 +58,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.bus.InvalidationBusMiddleware',
 ]
 
 ROOT_URLCONF = 'app.urls'
@@ -94,6 +96,65 @@ DATABASES = {
 }
 
 
+# Caches
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'tokens': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tokens',
+        'TIMEOUT': int(os.environ.get('TOKEN_CACHE_TIMEOUT', 300)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('TOKEN_CACHE_MAX_ENTRIES',
+                                              10000)),
+        },
+    },
+    'responses': {
+        'BACKEND': {
+            'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+            'file': 'django.core.cache.backends.filebased.FileBasedCache',
+            'redis': 'django_redis.cache.RedisCache',
+        }[os.environ.get('RESPONSE_CACHE_BACKEND', 'locmem')],
+        'LOCATION': os.environ.get('RESPONSE_CACHE_LOCATION', 'responses'),
+        'TIMEOUT': int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 300)),
+    },
+}
+
+TOKEN_CACHE_ALIAS = 'tokens'
+
+# Cache of serialized list responses. RESPONSE_CACHE_BACKEND picks locmem,
+# file (LOCATION is a directory) or redis (LOCATION is a redis:// URL and
+# the optional django-redis package must be installed).
+RESPONSE_CACHE_ALIAS = 'responses'
+
+# Lifetimes in seconds of signed access tokens and their refresh tokens.
+ACCESS_TOKEN_LIFETIME = int(os.environ.get('ACCESS_TOKEN_LIFETIME', 300))
+REFRESH_TOKEN_LIFETIME = int(os.environ.get('REFRESH_TOKEN_LIFETIME',
+                                            14 * 24 * 60 * 60))
+
+# Number of per-user name prefix indexes kept in memory for autocomplete.
+AUTOCOMPLETE_MAX_USERS = int(os.environ.get('AUTOCOMPLETE_MAX_USERS', 1000))
+
+# Cache holding the per-user collection versions behind list and detail
+# ETags. It must be shared by every worker process in production.
+COLLECTION_VERSION_CACHE_ALIAS = os.environ.get(
+    'COLLECTION_VERSION_CACHE_ALIAS', 'default')
+
+# Broadcast of model changes to the in-process caches of other workers:
+# 'none', 'postgres' (LISTEN/NOTIFY on the LOCATION channel) or 'file'
+# (LOCATION is a file every worker on the host appends to).
+INVALIDATION_BUS_BACKEND = os.environ.get('INVALIDATION_BUS_BACKEND', 'none')
+INVALIDATION_BUS_LOCATION = os.environ.get('INVALIDATION_BUS_LOCATION',
+                                           'cache_invalidation')
+
+# Maintain and serve the denormalized recipe documents. Run the
+# rebuild_recipe_documents command before turning this on.
+RECIPE_DOCUMENTS_ENABLED = os.environ.get('RECIPE_DOCUMENTS_ENABLED') == '1'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -4,6 +4,7 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 
 from .models import User, Recipe, Tag, Ingredient
+from .signals import rows_changed
 
 
 class UserAdmin(BaseUserAdmin):
@@ -41,7 +42,16 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
+class RecipeAdmin(admin.ModelAdmin):
+    """ Define the admin pages for recipes. """
+    def save_related(self, request, form, formsets, change):
+        """ Save the relations and report the recipe as changed. """
+        super().save_related(request, form, formsets, change)
+        rows_changed.send(sender=Recipe, user_ids=[form.instance.user_id],
+                          ids=[form.instance.id])
+
+
 admin.site.register(User, UserAdmin)
-admin.site.register(Recipe)
+admin.site.register(Recipe, RecipeAdmin)
 admin.site.register(Tag)
 admin.site.register(Ingredient)
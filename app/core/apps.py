@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.models import Field, ForeignObject
+        from .lookups import Any
+        Field.register_lookup(Any)
+        ForeignObject.register_lookup(Any)
+        from . import autocomplete  # noqa
+        from . import versions  # noqa
+        from . import bus  # noqa
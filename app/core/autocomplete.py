@@ -0,0 +1,138 @@
+"""In-process prefix index module for tag and ingredient autocomplete."""
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.models import Tag, Ingredient
+from core.signals import rows_changed, invalidation_received
+
+from rest_framework import response
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+
+
+class PrefixIndex:
+    """Names of one user sorted case-insensitively for prefix lookups."""
+    def __init__(self, rows):
+        entries = sorted((name.casefold(), name, pk) for pk, name in rows)
+        self.keys = [key for key, _, _ in entries]
+        self.items = [{'id': pk, 'name': name} for _, name, pk in entries]
+
+    def lookup(self, prefix, limit):
+        """Return up to limit items whose names start with prefix."""
+        prefix = prefix.casefold()
+        start = bisect_left(self.keys, prefix)
+        stop = min(start + limit, len(self.keys))
+        end = start
+        while end < stop and self.keys[end].startswith(prefix):
+            end += 1
+        return self.items[start:end]
+
+
+class PrefixIndexCache:
+    """Thread safe LRU cache of prefix indexes by model and user.
+
+    Indexes are built lazily on first lookup. An index built while an
+    invalidation ran is returned but not cached, so a lookup racing with
+    a write never keeps serving the names it read before the write.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._indexes = OrderedDict()
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def get(self, model, user_id):
+        """Return the prefix index of the user's model names."""
+        key = (model._meta.label_lower, user_id)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+            epoch = self._epoch
+
+        index = PrefixIndex(model.objects.filter(user_id=user_id)
+                            .values_list('id', 'name'))
+        with self._lock:
+            if epoch == self._epoch:
+                self._indexes[key] = index
+                while len(self._indexes) > self.max_size:
+                    self._indexes.popitem(last=False)
+        return index
+
+    def invalidate(self, model, *user_ids):
+        """Drop the cached indexes of the users' model names."""
+        with self._lock:
+            self._epoch += 1
+            for user_id in user_ids:
+                self._indexes.pop((model._meta.label_lower, user_id), None)
+
+    def clear(self):
+        """Drop every cached index."""
+        with self._lock:
+            self._epoch += 1
+            self._indexes.clear()
+
+
+autocomplete_cache = PrefixIndexCache(settings.AUTOCOMPLETE_MAX_USERS)
+
+
+def invalidate_names(model, user_ids):
+    """Drop the users' indexes now and again once the write commits."""
+    autocomplete_cache.invalidate(model, *user_ids)
+    transaction.on_commit(
+        lambda: autocomplete_cache.invalidate(model, *user_ids))
+
+
+@receiver([post_save, post_delete], sender=Tag)
+@receiver([post_save, post_delete], sender=Ingredient)
+def invalidate_saved_name(sender, instance, **kwargs):
+    """Drop the index of a saved or deleted tag or ingredient."""
+    invalidate_names(sender, [instance.user_id])
+
+
+@receiver(rows_changed, sender=Tag)
+@receiver(rows_changed, sender=Ingredient)
+def invalidate_changed_names(sender, user_ids, **kwargs):
+    """Drop the indexes of users whose names were bulk written."""
+    invalidate_names(sender, user_ids)
+
+
+@receiver(invalidation_received, sender=Tag)
+@receiver(invalidation_received, sender=Ingredient)
+def invalidate_received_names(sender, user_ids, **kwargs):
+    """Drop the indexes of users whose names another process changed."""
+    autocomplete_cache.invalidate(sender, *user_ids)
+
+
+class AutocompleteMixin:
+    """View mixin adding a name prefix autocomplete action."""
+    autocomplete_limit = 10
+    autocomplete_max_limit = 50
+
+    def get_autocomplete_limit(self):
+        """Return the number of suggestions asked for by the request."""
+        limit = self.request.query_params.get('limit')
+        if limit is None:
+            return self.autocomplete_limit
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer.'})
+        if limit < 1:
+            raise ValidationError({'limit': 'Must be a positive integer.'})
+        return min(limit, self.autocomplete_max_limit)
+
+    @action(methods=['get'], detail=False, pagination_class=None)
+    def autocomplete(self, request):
+        """Return the names of the user starting with the q param."""
+        limit = self.get_autocomplete_limit()
+        index = autocomplete_cache.get(self.queryset.model, request.user.pk)
+        return response.Response(
+            index.lookup(request.query_params.get('q', ''), limit))
@@ -0,0 +1,258 @@
+"""Cross-process cache invalidation bus module.
+
+Model changes are published once their transaction commits and every
+other process listening on the bus receives them as the
+invalidation_received signal, which the in-process caches handle like
+their local post_save and post_delete receivers.
+"""
+import json
+import logging
+import os
+import select
+import threading
+import time
+import uuid
+
+import psycopg2
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.models import Recipe, Tag, Ingredient
+from core.signals import rows_changed, invalidation_received
+
+
+logger = logging.getLogger(__name__)
+
+# Number of ids or keys per event, keeping NOTIFY payloads under 8000
+# bytes.
+CHUNK_SIZE = 200
+
+
+def new_origin():
+    """Return a new identifier of the events published by this process."""
+    return '{}-{}'.format(os.getpid(), uuid.uuid4().hex)
+
+
+# Origin and listener of this process. A forked child, such as a worker
+# of a preloaded application server, gets its own origin and starts its
+# own listener, as threads do not survive a fork.
+_process = {'origin': new_origin(), 'listener': None}
+_listener_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    """Give a forked child its own origin and no listener."""
+    global _listener_lock
+    _process.update(origin=new_origin(), listener=None)
+    _listener_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_origin():
+    """Return the identifier of the events published by this process."""
+    return _process['origin']
+
+
+class BaseBus:
+    """Base class of invalidation bus backends."""
+    def __init__(self, location, origin=None):
+        self.location = location
+        self.origin = origin or get_origin()
+
+    def encode(self, model, user_ids=(), keys=()):
+        """Return the payloads of an event split into chunks."""
+        user_ids, keys = list(user_ids), list(keys)
+        for start in range(0, max(len(user_ids), len(keys), 1), CHUNK_SIZE):
+            yield json.dumps({
+                'origin': self.origin,
+                'model': model._meta.label_lower,
+                'user_ids': user_ids[start:start + CHUNK_SIZE],
+                'keys': keys[start:start + CHUNK_SIZE],
+            })
+
+    def publish(self, model, user_ids=(), keys=()):
+        """Broadcast a change of model rows to the other processes."""
+        for payload in self.encode(model, user_ids, keys):
+            self.send(payload)
+
+    def receive(self, timeout):
+        """Wait up to timeout seconds and dispatch the received events.
+
+        Returns the number of events sent as invalidation_received.
+        """
+        count = 0
+        for payload in self.poll(timeout):
+            event = json.loads(payload)
+            if event['origin'] == self.origin:
+                continue
+            invalidation_received.send(
+                sender=apps.get_model(event['model']),
+                user_ids=event['user_ids'], keys=event['keys'])
+            count += 1
+        return count
+
+    def send(self, payload):
+        """Send one payload to the other processes."""
+        raise NotImplementedError
+
+    def listen(self):
+        """Start receiving the payloads sent from now on."""
+        raise NotImplementedError
+
+    def poll(self, timeout):
+        """Return the payloads received within timeout seconds."""
+        raise NotImplementedError
+
+
+class PostgresBus(BaseBus):
+    """Bus backed by PostgreSQL LISTEN/NOTIFY on the location channel."""
+    def send(self, payload):
+        """Notify the channel through the default connection."""
+        with connections['default'].cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)',
+                           [self.location, payload])
+
+    def listen(self):
+        """Open a dedicated connection listening on the channel."""
+        self.connection = psycopg2.connect(
+            **connections['default'].get_connection_params())
+        self.connection.set_session(autocommit=True)
+        with self.connection.cursor() as cursor:
+            cursor.execute('LISTEN {}'.format(
+                psycopg2.extensions.quote_ident(self.location,
+                                                self.connection)))
+
+    def poll(self, timeout):
+        """Return the notifications received on the channel."""
+        if not self.connection.notifies:
+            select.select([self.connection], [], [], timeout)
+        self.connection.poll()
+        payloads = [notify.payload for notify in self.connection.notifies]
+        self.connection.notifies.clear()
+        return payloads
+
+
+class FileBus(BaseBus):
+    """Bus backed by a file every process appends lines to.
+
+    Meant for tests and single host development, where each payload is
+    appended with one write and read back by every listener from the
+    offset it started listening at.
+    """
+    def send(self, payload):
+        """Append the payload as one line."""
+        with open(self.location, 'a') as bus_file:
+            bus_file.write(payload + '\n')
+
+    def listen(self):
+        """Start reading from the current end of the file."""
+        with open(self.location, 'a') as bus_file:
+            self.offset = bus_file.tell()
+
+    def poll(self, timeout):
+        """Return the complete lines appended since the last poll."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with open(self.location) as bus_file:
+                bus_file.seek(self.offset)
+                data = bus_file.read()
+            end = data.rfind('\n') + 1
+            if end or time.monotonic() >= deadline:
+                break
+            time.sleep(min(0.05, timeout))
+        self.offset += len(data[:end].encode())
+        return data[:end].splitlines()
+
+
+BACKENDS = {
+    'postgres': PostgresBus,
+    'file': FileBus,
+}
+
+
+def get_bus():
+    """Return the configured bus, or None when the bus is disabled."""
+    backend = settings.INVALIDATION_BUS_BACKEND
+    if backend == 'none':
+        return None
+    return BACKENDS[backend](settings.INVALIDATION_BUS_LOCATION)
+
+
+def publish(model, user_ids=(), keys=()):
+    """Publish a change of model rows once the transaction commits."""
+    bus = get_bus()
+    if bus is not None:
+        transaction.on_commit(
+            lambda: bus.publish(model, user_ids=user_ids, keys=keys))
+
+
+def run_listener(bus):
+    """Dispatch the events received on bus forever."""
+    while True:
+        try:
+            bus.listen()
+            while True:
+                bus.receive(timeout=5)
+        except Exception:
+            logger.exception('Invalidation bus listener failed')
+            time.sleep(1)
+
+
+def start_listener():
+    """Start a daemon thread listening on the configured bus."""
+    bus = get_bus()
+    if bus is None:
+        return None
+    thread = threading.Thread(target=run_listener, args=(bus,),
+                              name='invalidation-bus', daemon=True)
+    thread.start()
+    return thread
+
+
+def ensure_listener():
+    """Start the listener of this process unless it already runs.
+
+    Returns the listener thread, or None when the bus is disabled.
+    """
+    if _process['listener'] is None and get_bus() is not None:
+        with _listener_lock:
+            if _process['listener'] is None:
+                _process['listener'] = start_listener()
+    return _process['listener']
+
+
+class InvalidationBusMiddleware:
+    """Middleware starting the bus listener in serving processes.
+
+    Starting it on the first request, rather than when the apps are
+    ready, keeps it out of management commands and out of parents that
+    fork their workers after loading the application.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        ensure_listener()
+        return self.get_response(request)
+
+
+@receiver([post_save, post_delete], sender=Recipe)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver([post_save, post_delete], sender=Ingredient)
+def publish_saved_row(sender, instance, **kwargs):
+    """Publish a saved or deleted recipe, tag or ingredient."""
+    publish(sender, user_ids=[instance.user_id])
+
+
+@receiver(rows_changed, sender=Recipe)
+@receiver(rows_changed, sender=Tag)
+@receiver(rows_changed, sender=Ingredient)
+def publish_changed_rows(sender, user_ids, **kwargs):
+    """Publish bulk written recipes, tags or ingredients."""
+    publish(sender, user_ids=user_ids)
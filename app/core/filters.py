@@ -0,0 +1,101 @@
+"""Filter backends for core app."""
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connections
+from django.db.models import Case, FloatField, Q, Value, When
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import SearchFilter
+
+
+def params_to_ints(query_params, name):
+    """Return the comma separated ids of a query param as integers."""
+    value = query_params.get(name)
+    if not value:
+        return []
+    try:
+        return [int(id_i) for id_i in value.split(',')]
+    except ValueError:
+        raise ValidationError({name: ['Expected comma separated ids.']})
+
+
+def has_trigram_support(connection):
+    """Return True if pg_trgm is installed on the database of connection.
+
+    The answer is kept on the connection for the database name it was
+    read from, as the test runner renames the database of a connection.
+    """
+    if connection.vendor != 'postgresql':
+        return False
+    name = connection.settings_dict['NAME']
+    cached = getattr(connection, 'trigram_support', None)
+    if cached is None or cached[0] != name:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT EXISTS("
+                "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+            connection.trigram_support = (name, cursor.fetchone()[0])
+    return connection.trigram_support[1]
+
+
+class TrigramSearchFilter(SearchFilter):
+    """Fuzzy name search backed by pg_trgm indexes.
+
+    Matches names containing, or similar enough to tolerate typos, each
+    of the search terms, and ranks them by similarity to the whole
+    search text when the request asks for ``ordering=similarity``.
+    Databases without pg_trgm fall back to ``icontains`` ranked by
+    exact, prefix and substring matches. The searched field is
+    ``search_field``, so views do not set ``search_fields``.
+    """
+    search_field = 'name'
+    ordering_param = 'ordering'
+    ordering_value = 'similarity'
+
+    def get_search_text(self, request):
+        """Return the search terms joined into one string."""
+        return ' '.join(self.get_search_terms(request))
+
+    def is_ranked(self, request):
+        """Return True if the request asks for similarity ordering."""
+        return bool(self.get_search_text(request)) and \
+            request.query_params.get(self.ordering_param) == \
+            self.ordering_value
+
+    def get_cursor_ordering(self, request, default):
+        """Return the cursor ordering matching the filtered queryset."""
+        if self.is_ranked(request):
+            return ('-similarity',) + tuple(default)
+        return tuple(default)
+
+    def filter_queryset(self, request, queryset, view):
+        """Filter the queryset by every search term."""
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        field = self.search_field
+        text = self.get_search_text(request)
+        trigram = has_trigram_support(connections[queryset.db])
+        match = Q()
+        for term in terms:
+            term_match = Q(**{'{}__icontains'.format(field): term})
+            if trigram:
+                term_match |= Q(**{'{}__trigram_similar'.format(field): term})
+            match &= term_match
+        queryset = queryset.filter(match)
+        if trigram:
+            similarity = TrigramSimilarity(field, text)
+        else:
+            similarity = Case(
+                When(**{'{}__iexact'.format(field): text},
+                     then=Value(1.0)),
+                When(**{'{}__istartswith'.format(field): text},
+                     then=Value(0.5)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+
+        if not self.is_ranked(request):
+            return queryset
+        return queryset.annotate(similarity=similarity).order_by(
+            '-similarity', *queryset.query.order_by)
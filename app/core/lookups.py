@@ -0,0 +1,23 @@
+"""Custom lookups module."""
+from django.db.models import Lookup
+
+
+class Any(Lookup):
+    """Match any value of a list passed as one array parameter.
+
+    field__any=[1, 2, 3] compiles to field = ANY(%s) with the list
+    adapted to a single PostgreSQL array, instead of the IN (%s, %s, ...)
+    placeholder per value that field__in builds for large id sets.
+    """
+    lookup_name = 'any'
+
+    def get_prep_lookup(self):
+        """Prepare every value of the list for the field."""
+        return [self.lhs.output_field.get_prep_value(value)
+                for value in self.rhs]
+
+    def as_sql(self, compiler, connection):
+        """Return the ANY comparison with the list as one parameter."""
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return '{} = ANY({})'.format(lhs, rhs), lhs_params + rhs_params
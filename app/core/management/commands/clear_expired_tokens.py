@@ -0,0 +1,36 @@
+"""
+    Command deleting expired authentication tokens.
+"""
+from datetime import timedelta
+from typing import Any
+
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from rest_framework.authtoken.models import Token
+
+from core.models import RefreshToken
+
+
+class Command(BaseCommand):
+    """ Clear expired tokens command. """
+    help = 'Delete expired refresh tokens and, optionally, old auth tokens.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--legacy-days', type=int, default=None,
+            help='Also delete opaque auth tokens older than this many days.'
+        )
+
+    def handle(self, *args: Any, **options: Any):
+        """Delete expired tokens and report how many were removed."""
+        deleted, _ = RefreshToken.objects.expired().delete()
+        self.stdout.write('Deleted {} expired refresh tokens.'.format(deleted))
+
+        if options['legacy_days'] is not None:
+            created_before = timezone.now() - \
+                timedelta(days=options['legacy_days'])
+            deleted, _ = Token.objects.filter(
+                created__lt=created_before).delete()
+            self.stdout.write('Deleted {} auth tokens.'.format(deleted))
+        self.stdout.write(self.style.SUCCESS('Tokens cleared'))
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.25 on 2026-10-18 06:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Add (related id, recipe id) indexes to the recipe through tables.
+
+    Filtering recipes by tag or ingredient ids looks up through rows by
+    the related id and only needs the recipe id, which these indexes
+    answer with index-only scans. The auto-created through tables cannot
+    declare indexes in Meta, so they are created with SQL.
+    """
+    atomic = False
+
+    dependencies = [
+        ('core', '0006_refreshtoken'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                'core_recipe_tags_tag_recipe_idx '
+                'ON core_recipe_tags (tag_id, recipe_id);',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS '
+                        'core_recipe_tags_tag_recipe_idx;',
+        ),
+        migrations.RunSQL(
+            sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+                'core_recipe_ingredients_ingredient_recipe_idx '
+                'ON core_recipe_ingredients (ingredient_id, recipe_id);',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS '
+                        'core_recipe_ingredients_ingredient_recipe_idx;',
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 3.2.25 on 2026-10-18 07:02
+
+from django.db import migrations
+
+
+TRIGRAM_INDEXES_SQL = """
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'
+    ) THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS core_tag_name_trgm
+            ON core_tag USING gin (name gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS core_tag_name_upper_trgm
+            ON core_tag USING gin (UPPER(name::text) gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS core_ingredient_name_trgm
+            ON core_ingredient USING gin (name gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS core_ingredient_name_upper_trgm
+            ON core_ingredient USING gin (UPPER(name::text) gin_trgm_ops);
+    END IF;
+END
+$$;
+"""
+
+REVERSE_TRIGRAM_INDEXES_SQL = """
+DROP INDEX IF EXISTS core_tag_name_trgm;
+DROP INDEX IF EXISTS core_tag_name_upper_trgm;
+DROP INDEX IF EXISTS core_ingredient_name_trgm;
+DROP INDEX IF EXISTS core_ingredient_name_upper_trgm;
+"""
+
+
+class Migration(migrations.Migration):
+    """Enable pg_trgm and index tag and ingredient names with it.
+
+    The ``name gin_trgm_ops`` indexes answer the similarity operator and
+    the ``UPPER(name::text)`` ones answer the ``icontains`` lookup. Both
+    are skipped on servers that do not ship the extension, where name
+    search falls back to a plain ``icontains`` scan.
+    """
+
+    dependencies = [
+        ('core', '0008_recipe_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunSQL(TRIGRAM_INDEXES_SQL, REVERSE_TRIGRAM_INDEXES_SQL),
+    ]
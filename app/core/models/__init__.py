@@ -2,3 +2,5 @@ from .user import User # noqa
 from .recipe import Recipe # noqa
 from .tag import Tag # noqa
 from .ingredient import Ingredient # noqa
+from .refresh_token import RefreshToken # noqa
+from .recipe_document import RecipeDocument # noqa
@@ -2,6 +2,8 @@
 from django.db import models
 from django.conf import settings
 
+from .managers import UserNameManager
+
 
 class Ingredient(models.Model):
     """Ingredient class model."""
@@ -12,6 +14,8 @@ class Ingredient(models.Model):
 
     name = models.CharField(max_length=255)
 
+    objects = UserNameManager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(name='by_user_name',
@@ -0,0 +1,58 @@
+"""Model managers module."""
+from django.db import models
+
+from core.signals import rows_changed
+
+
+class UserOwnedQuerySet(models.QuerySet):
+    """Query set of models owned by a user.
+
+    Bulk writes skip the post_save signal, so they send rows_changed
+    with the owners of the written rows instead.
+    """
+    def bulk_create(self, objs, *args, **kwargs):
+        """Insert objs and send rows_changed for their owners."""
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if objs:
+            rows_changed.send(
+                sender=self.model,
+                user_ids=sorted({obj.user_id for obj in objs}),
+                ids=[obj.pk for obj in objs if obj.pk is not None])
+        return objs
+
+    def bulk_update(self, objs, *args, **kwargs):
+        """Update objs and send rows_changed for their owners."""
+        objs = list(objs)
+        rows = super().bulk_update(objs, *args, **kwargs)
+        if objs:
+            rows_changed.send(
+                sender=self.model,
+                user_ids=sorted({obj.user_id for obj in objs}),
+                ids=[obj.pk for obj in objs])
+        return rows
+
+
+class UserNameManager(models.Manager.from_queryset(UserOwnedQuerySet)):
+    """Manager of models unique by user and name."""
+    def get_or_create_by_names(self, user, names):
+        """Return the user's objects for names, creating missing ones.
+
+        Existing rows are fetched in one query and missing ones are
+        inserted with a single INSERT ... ON CONFLICT DO NOTHING, so
+        concurrent writers racing on the same new name never raise an
+        IntegrityError. Names are inserted in sorted order so that
+        transactions sharing several new names take their row locks in
+        the same order and cannot deadlock.
+        """
+        names = list(dict.fromkeys(names))
+        objs = {obj.name: obj
+                for obj in self.filter(user=user, name__in=names)}
+        missing = sorted(name for name in names if name not in objs)
+        if missing:
+            self.bulk_create(
+                [self.model(user=user, name=name) for name in missing],
+                ignore_conflicts=True
+            )
+            objs.update((obj.name, obj) for obj in
+                        self.filter(user=user, name__in=missing))
+        return [objs[name] for name in names]
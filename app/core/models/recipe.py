@@ -3,7 +3,18 @@ import uuid
 import os
 
 from django.db import models
+from django.db.models import Count, Prefetch
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+
+from .managers import UserOwnedQuerySet
+from .tag import Tag
+from .ingredient import Ingredient
+
+
+# Text search configuration used by the search_vector trigger.
+SEARCH_CONFIG = 'english'
 
 
 def recipe_image_file_path(instance, filename):
@@ -13,6 +24,36 @@ def recipe_image_file_path(instance, filename):
     return os.path.join('uploads', 'recipe', filename)
 
 
+class RecipeQuerySet(UserOwnedQuerySet):
+    """Query set of Recipe model."""
+    def filter_related(self, field, ids, match_all=False):
+        """Filter recipes by the ids of a many-to-many field.
+
+        Recipes related to any of the ids are selected with a semi-join on
+        the through table. With match_all, the through rows are grouped by
+        recipe and only recipes related to every id are kept, instead of
+        chaining one join per id.
+        """
+        ids = set(ids)
+        m2m = self.model._meta.get_field(field)
+        column = m2m.m2m_reverse_name()
+        related = m2m.remote_field.through.objects.filter(
+            **{column + '__in': ids})
+        if match_all:
+            related = related.values(m2m.m2m_column_name()).annotate(
+                matched=Count(column)).filter(matched=len(ids))
+        return self.filter(id__in=related.values(m2m.m2m_column_name()))
+
+    def with_related(self, fields=('tags', 'ingredients')):
+        """Prefetch the tags and ingredients in fields ordered by id."""
+        lookups = {
+            'tags': Prefetch('tags', queryset=Tag.objects.order_by('id')),
+            'ingredients': Prefetch(
+                'ingredients', queryset=Ingredient.objects.order_by('id')),
+        }
+        return self.prefetch_related(*(lookups[field] for field in fields))
+
+
 class Recipe(models.Model):
     """Recipe model class."""
     user = models.ForeignKey(
@@ -28,12 +69,22 @@ class Recipe(models.Model):
     tags = models.ManyToManyField('Tag')
     ingredients = models.ManyToManyField('Ingredient')
     image = models.ImageField(upload_to=recipe_image_file_path, null=True)
+    # Maintained by a database trigger from title and description.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = RecipeQuerySet.as_manager()
 
     class Meta:
         constraints = [
             models.UniqueConstraint(name='by_user_title', fields=['user',
                                                                   'title'])
         ]
+        indexes = [
+            models.Index(name='recipe_user_id_desc',
+                         fields=['user', '-id']),
+            GinIndex(name='recipe_search_vector',
+                     fields=['search_vector'])
+        ]
 
     def __str__(self):
         return "{}(title={}, link={})".format(
@@ -0,0 +1,60 @@
+"""Recipe document model module."""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, connection
+from django.contrib.auth import get_user_model
+
+
+class RecipeDocumentQuerySet(models.QuerySet):
+    """Query set of RecipeDocument model."""
+    def upsert(self, documents, batch_size=500):
+        """Insert or replace documents given as (recipe id, user id, data).
+
+        Each batch is written with one INSERT ... ON CONFLICT DO UPDATE,
+        so concurrent rebuilds of the same recipe never conflict.
+        """
+        documents = list(documents)
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with connection.cursor() as cursor:
+            for start in range(0, len(documents), batch_size):
+                batch = documents[start:start + batch_size]
+                cursor.execute(
+                    'INSERT INTO {} (recipe_id, user_id, data, updated) '
+                    'VALUES {} ON CONFLICT (recipe_id) DO UPDATE SET '
+                    'user_id = EXCLUDED.user_id, data = EXCLUDED.data, '
+                    'updated = EXCLUDED.updated'.format(
+                        table,
+                        ', '.join(['(%s, %s, %s::jsonb, now())'] *
+                                  len(batch))),
+                    [value for recipe_id, user_id, data in batch
+                     for value in (recipe_id, user_id,
+                                   json.dumps(data, cls=DjangoJSONEncoder))])
+
+
+class RecipeDocument(models.Model):
+    """Denormalized read model holding a serialized recipe."""
+    recipe = models.OneToOneField(
+        'Recipe',
+        primary_key=True,
+        related_name='document',
+        on_delete=models.CASCADE
+    )
+    user = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.CASCADE
+    )
+    data = models.JSONField()
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = RecipeDocumentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(name='recipedocument_user_recipe',
+                         fields=['user', '-recipe']),
+        ]
+
+    def __str__(self):
+        return "{}(recipe={})".format(self.__class__.__name__,
+                                      self.recipe_id)
@@ -0,0 +1,37 @@
+"""Refresh token model module."""
+import binascii
+import os
+
+from django.db import models
+from django.conf import settings
+from django.utils import timezone
+
+
+def generate_refresh_token_key():
+    """Return a new random refresh token key."""
+    return binascii.hexlify(os.urandom(32)).decode()
+
+
+class RefreshTokenQuerySet(models.QuerySet):
+    """Query set of RefreshToken model."""
+    def expired(self):
+        """Return refresh tokens past their expiry time."""
+        return self.filter(expires_at__lte=timezone.now())
+
+
+class RefreshToken(models.Model):
+    """Refresh token model class exchanged for signed access tokens."""
+    key = models.CharField(max_length=64, primary_key=True,
+                           default=generate_refresh_token_key)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='refresh_tokens',
+        on_delete=models.CASCADE
+    )
+    created = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    objects = RefreshTokenQuerySet.as_manager()
+
+    def __str__(self):
+        return "{}(user={})".format(self.__class__.__name__, self.user_id)
@@ -2,6 +2,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from .managers import UserNameManager
+
 
 class Tag(models.Model):
     user = models.ForeignKey(
@@ -11,6 +13,8 @@ class Tag(models.Model):
 
     name = models.CharField(max_length=256, default=None)
 
+    objects = UserNameManager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(name='unique_by_user_name',
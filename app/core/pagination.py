@@ -0,0 +1,41 @@
+"""Pagination module for core app."""
+from rest_framework.pagination import CursorPagination
+
+
+class OptionalCursorPagination(CursorPagination):
+    """Keyset pagination enabled only when a client asks for it.
+
+    Requests without the cursor or page size parameters keep receiving
+    the full unpaginated list.
+    """
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    def is_requested(self, request):
+        """Return True if the request asks for a page."""
+        params = request.query_params
+        return self.cursor_query_param in params or \
+            self.page_size_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return a page of results, or None for unpaginated requests."""
+        if not self.is_requested(request):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        """Return the view's cursor ordering if it provides one."""
+        if hasattr(view, 'get_cursor_ordering'):
+            return view.get_cursor_ordering()
+        return super().get_ordering(request, queryset, view)
+
+
+class RecipeCursorPagination(OptionalCursorPagination):
+    """Cursor pagination for recipes, newest first."""
+    ordering = '-id'
+
+
+class NameCursorPagination(OptionalCursorPagination):
+    """Cursor pagination for tags and ingredients ordered by name."""
+    ordering = ('name', 'id')
@@ -0,0 +1,42 @@
+"""Renderers of download formats streamed by views."""
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+class DownloadRenderer(BaseRenderer):
+    """Renderer letting clients ask for a format the view streams itself.
+
+    Successful responses are StreamingHttpResponses that never reach the
+    renderer, so it only renders error responses, as JSON.
+    """
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render error data as JSON."""
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            response['Content-Type'] = JSONRenderer.media_type
+        return JSONRenderer().render(data)
+
+
+class NDJSONRenderer(DownloadRenderer):
+    """Renderer of newline delimited JSON downloads."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+class CSVRenderer(DownloadRenderer):
+    """Renderer of CSV downloads."""
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class ZipRenderer(DownloadRenderer):
+    """Renderer of zip archive downloads."""
+    media_type = 'application/zip'
+    format = 'zip'
+
+
+class OctetStreamRenderer(DownloadRenderer):
+    """Renderer of binary downloads."""
+    media_type = 'application/octet-stream'
+    format = 'bin'
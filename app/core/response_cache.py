@@ -0,0 +1,44 @@
+"""Per-user response cache module for list actions."""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.versions import get_version
+
+from rest_framework.response import Response
+
+
+def get_cache():
+    """Return the cache holding list responses."""
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+class ListCacheMixin:
+    """View mixin caching the serialized data of list responses.
+
+    Keys hold the user's collection version, so every write that bumps
+    the version makes the user's cached lists unreachable and they
+    expire with the cache timeout.
+    """
+    def get_list_cache_key(self, request):
+        """Return the cache key of the current list request."""
+        serializer_class = self.get_serializer_class()
+        raw = '{}:{}.{}:{}:{}'.format(
+            self.basename, serializer_class.__module__,
+            serializer_class.__qualname__, request.build_absolute_uri(),
+            request.accepted_media_type)
+        return 'list-response:{}:{}:{}'.format(
+            request.user.pk, get_version(request.user.pk),
+            hashlib.md5(raw.encode()).hexdigest())
+
+    def list(self, request, *args, **kwargs):
+        """Return the cached list data, serializing it on a miss."""
+        cache = get_cache()
+        key = self.get_list_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data)
+        return response
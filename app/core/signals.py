@@ -0,0 +1,12 @@
+"""Custom signals module for core app."""
+from django.dispatch import Signal
+
+
+# Sent with ``user_ids`` and the written ``ids`` by bulk writes such as
+# bulk_create, bulk_update and queryset updates, which skip the post_save
+# and post_delete signals of the rows they touch.
+rows_changed = Signal()
+
+# Sent by the invalidation bus with ``user_ids`` and ``keys`` for a change
+# made by another process. The sender is the changed model.
+invalidation_received = Signal()
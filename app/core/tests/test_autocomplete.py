@@ -0,0 +1,108 @@
+"""Test for the tag and ingredient autocomplete prefix index."""
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.autocomplete import (
+    PrefixIndex, PrefixIndexCache, autocomplete_cache
+)
+from core.models import Tag, Ingredient
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+TAG_AUTOCOMPLETE_URL = reverse('tag:tag-autocomplete')
+INGREDIENT_AUTOCOMPLETE_URL = reverse('ingredient:ingredient-autocomplete')
+
+
+class PrefixIndexTest(TestCase):
+    """Test class of the sorted prefix index."""
+    def test_lookup(self):
+        """Test lookups are case-insensitive and limited."""
+        index = PrefixIndex([(1, 'Rock'), (2, 'pop'), (3, 'rockabilly'),
+                             (4, 'Ragtime'), (5, 'ROCK and roll')])
+
+        self.assertEqual([item['id'] for item in index.lookup('ROC', 10)],
+                         [1, 5, 3])
+        self.assertEqual([item['id'] for item in index.lookup('r', 2)],
+                         [4, 1])
+        self.assertEqual(index.lookup('jazz', 10), [])
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test the cache keeps only the most recently used users."""
+        users = [get_user_model().objects.create_user(
+            email='user{}@example.com'.format(i), password='testpass123')
+            for i in range(3)]
+        cache = PrefixIndexCache(max_size=2)
+
+        first = cache.get(Tag, users[0].pk)
+        cache.get(Tag, users[1].pk)
+        cache.get(Tag, users[0].pk)
+        cache.get(Tag, users[2].pk)
+
+        with self.assertNumQueries(0):
+            self.assertIs(cache.get(Tag, users[0].pk), first)
+        with self.assertNumQueries(1):
+            cache.get(Tag, users[1].pk)
+
+
+class AutocompleteApiTest(TestCase):
+    """Test class of the autocomplete actions."""
+    def setUp(self):
+        super().setUp()
+        autocomplete_cache.clear()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+        for name in ['Rock', 'Pop rock', 'rockabilly', 'Jazz']:
+            Tag.objects.create(user=self.__user, name=name)
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='test1234567890')
+        Tag.objects.create(user=other, name='Rock and roll')
+
+    def test_autocomplete_tags(self):
+        """Test only the user's names with the prefix are returned."""
+        res = self.__client.get(TAG_AUTOCOMPLETE_URL, {'q': 'ro'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([tag['name'] for tag in res.data],
+                         ['Rock', 'rockabilly'])
+
+        with self.assertNumQueries(0):
+            res = self.__client.get(TAG_AUTOCOMPLETE_URL,
+                                    {'q': 'ro', 'limit': 1})
+        self.assertEqual([tag['name'] for tag in res.data], ['Rock'])
+
+    def test_autocomplete_invalid_limit(self):
+        """Test a non numeric limit is rejected."""
+        res = self.__client.get(TAG_AUTOCOMPLETE_URL,
+                                {'q': 'ro', 'limit': 'abc'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_save_and_delete_invalidate(self):
+        """Test saved and deleted names show up in the next lookup."""
+        self.__client.get(TAG_AUTOCOMPLETE_URL, {'q': 'r'})
+        Tag.objects.create(user=self.__user, name='Reggae')
+        Tag.objects.filter(user=self.__user, name='Rock').delete()
+
+        res = self.__client.get(TAG_AUTOCOMPLETE_URL, {'q': 'r'})
+
+        self.assertEqual([tag['name'] for tag in res.data],
+                         ['Reggae', 'rockabilly'])
+
+    def test_bulk_create_invalidates(self):
+        """Test names created in bulk show up in the next lookup."""
+        self.__client.get(INGREDIENT_AUTOCOMPLETE_URL, {'q': 's'})
+        Ingredient.objects.get_or_create_by_names(self.__user,
+                                                  ['Sugar', 'Salt'])
+
+        res = self.__client.get(INGREDIENT_AUTOCOMPLETE_URL, {'q': 's'})
+
+        self.assertEqual([item['name'] for item in res.data],
+                         ['Salt', 'Sugar'])
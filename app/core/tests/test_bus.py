@@ -0,0 +1,157 @@
+"""Test for the cross-process cache invalidation bus."""
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.autocomplete import autocomplete_cache
+from core import bus
+from core.bus import FileBus, PostgresBus, get_origin
+from core.models import Tag
+from core.signals import invalidation_received
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+ME_USER_URL = reverse('user:me')
+
+
+class FileBusTest(TestCase):
+    """Test class of the file backed bus."""
+    def setUp(self):
+        super().setUp()
+        self.__dir = tempfile.TemporaryDirectory()
+        self.__path = os.path.join(self.__dir.name, 'bus')
+        self.__worker_a = FileBus(self.__path, origin='worker-a')
+        self.__worker_b = FileBus(self.__path, origin='worker-b')
+        self.__worker_a.listen()
+        self.__worker_b.listen()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+
+    def tearDown(self):
+        self.__dir.cleanup()
+        super().tearDown()
+
+    def test_events_reach_other_workers(self):
+        """Test an event is dispatched by other workers only."""
+        index = autocomplete_cache.get(Tag, self.__user.pk)
+        self.__worker_a.publish(Tag, user_ids=[self.__user.pk])
+
+        self.assertEqual(self.__worker_a.receive(0), 0)
+        self.assertIs(autocomplete_cache.get(Tag, self.__user.pk), index)
+        self.assertEqual(self.__worker_b.receive(0), 1)
+        self.assertIsNot(autocomplete_cache.get(Tag, self.__user.pk), index)
+        self.assertEqual(self.__worker_b.receive(0), 0)
+
+    def test_large_events_are_chunked(self):
+        """Test many keys are split into several events."""
+        received = []
+
+        def handler(sender, keys, **kwargs):
+            received.extend(keys)
+        invalidation_received.connect(handler, sender=Token)
+        self.addCleanup(invalidation_received.disconnect, handler,
+                        sender=Token)
+
+        keys = ['key{}'.format(i) for i in range(450)]
+        self.__worker_a.publish(Token, keys=keys)
+
+        self.assertEqual(self.__worker_b.receive(0), 3)
+        self.assertEqual(received, keys)
+
+    def test_committed_writes_are_published(self):
+        """Test saved rows are published once the transaction commits."""
+        with override_settings(INVALIDATION_BUS_BACKEND='file',
+                               INVALIDATION_BUS_LOCATION=self.__path):
+            with self.captureOnCommitCallbacks(execute=True):
+                Tag.objects.create(user=self.__user, name='Tag1')
+                self.assertEqual(self.__worker_b.poll(0), [])
+
+        events = [json.loads(payload)
+                  for payload in self.__worker_b.poll(0)]
+        self.assertEqual([(event['model'], event['user_ids'])
+                          for event in events],
+                         [('core.tag', [self.__user.pk])])
+
+    def test_remote_token_delete_invalidates(self):
+        """Test a token deleted by another worker stops authenticating."""
+        token = Token.objects.create(user=self.__user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token {}'.format(token.key))
+        client.get(ME_USER_URL)
+        Token.objects.filter(key=token.key).update(key='replaced')
+
+        self.__worker_a.publish(Token, keys=[token.key])
+        self.__worker_b.receive(0)
+        res = client.get(ME_USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PostgresBusTest(TransactionTestCase):
+    """Test class of the LISTEN/NOTIFY backed bus."""
+    def test_notify_reaches_listener(self):
+        """Test a notification is dispatched by the listening worker."""
+        received = []
+
+        def handler(sender, user_ids, **kwargs):
+            received.extend(user_ids)
+        invalidation_received.connect(handler, sender=Tag)
+        self.addCleanup(invalidation_received.disconnect, handler,
+                        sender=Tag)
+        listener = PostgresBus('test_invalidation', origin='worker-b')
+        listener.listen()
+        self.addCleanup(listener.connection.close)
+
+        PostgresBus('test_invalidation', origin='worker-a').publish(
+            Tag, user_ids=[1, 2])
+
+        self.assertEqual(listener.receive(5), 1)
+        self.assertEqual(received, [1, 2])
+
+
+class BusProcessTest(TestCase):
+    """Test class of the per-process origin and listener."""
+    def test_forked_child_has_own_origin(self):
+        """Test a forked worker does not share the parent's origin."""
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(write_fd, json.dumps([
+                get_origin(), FileBus('unused').origin,
+                bus._process['listener'] is None]).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            origin, bus_origin, no_listener = json.loads(pipe.read())
+        os.waitpid(pid, 0)
+
+        self.assertNotEqual(origin, get_origin())
+        self.assertEqual(bus_origin, origin)
+        self.assertTrue(origin.startswith('{}-'.format(pid)))
+        self.assertTrue(no_listener)
+
+    def test_listener_starts_on_first_request(self):
+        """Test requests start one listener only when the bus is on."""
+        self.addCleanup(bus._process.update, listener=None)
+        with patch('core.bus.start_listener',
+                   return_value='thread') as start_listener:
+            self.client.get(ME_USER_URL)
+            self.assertFalse(start_listener.called)
+            with override_settings(INVALIDATION_BUS_BACKEND='file'):
+                self.client.get(ME_USER_URL)
+                self.client.get(ME_USER_URL)
+
+        self.assertEqual(start_listener.call_count, 1)
+        self.assertEqual(bus._process['listener'], 'thread')
@@ -1,12 +1,20 @@
 """
     Simple tests.
 """
+from datetime import timedelta
+from io import StringIO
 from unittest.mock import patch
 from psycopg2 import OperationalError as Psycopg2Error
 
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
 from django.db.utils import OperationalError
 from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from rest_framework.authtoken.models import Token
+
+from core.models import RefreshToken
 
 
 @patch('core.management.commands.wait_for_db.Command.check')
@@ -31,3 +39,36 @@ class DatabaseTest(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=['default'])
+
+
+class ClearExpiredTokensTest(TestCase):
+    """ Clear expired tokens command test. """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com', password='testpass123')
+
+    def test_clear_expired_refresh_tokens(self):
+        """ Test only expired refresh tokens are deleted. """
+        now = timezone.now()
+        RefreshToken.objects.create(user=self.user,
+                                    expires_at=now - timedelta(minutes=1))
+        valid = RefreshToken.objects.create(
+            user=self.user, expires_at=now + timedelta(days=1))
+        Token.objects.create(user=self.user)
+
+        call_command('clear_expired_tokens', stdout=StringIO())
+
+        self.assertEqual(list(RefreshToken.objects.all()), [valid])
+        self.assertTrue(Token.objects.exists())
+
+    def test_clear_legacy_tokens(self):
+        """ Test old opaque tokens are deleted with --legacy-days. """
+        token = Token.objects.create(user=self.user)
+        Token.objects.filter(pk=token.pk).update(
+            created=timezone.now() - timedelta(days=31))
+
+        call_command('clear_expired_tokens', legacy_days=30,
+                     stdout=StringIO())
+
+        self.assertFalse(Token.objects.exists())
@@ -0,0 +1,113 @@
+"""Test for filter backends of core app."""
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.filters import TrigramSearchFilter, has_trigram_support
+from core.models import Tag, Ingredient
+
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework import status
+
+
+TAG_URL = reverse('tag:tag-list')
+INGREDIENT_URL = reverse('ingredient:ingredient-list')
+
+
+class TrigramSearchFilterTest(TestCase):
+    """Test class of the fuzzy name search backend."""
+    def setUp(self):
+        super().setUp()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+        for name in ['Pop rock', 'Rock', 'Rockabilly', 'Jazz']:
+            Tag.objects.create(user=self.__user, name=name)
+        for name in ['Brown sugar', 'Sugar', 'Salt']:
+            Ingredient.objects.create(user=self.__user, name=name)
+
+    def test_search_without_ranking_orders_by_name(self):
+        """Test matches keep the name ordering by default."""
+        res = self.__client.get(TAG_URL, {'search': 'rock'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([tag['name'] for tag in res.data],
+                         ['Pop rock', 'Rock', 'Rockabilly'])
+
+    def test_search_ranked_by_similarity(self):
+        """Test exact and prefix matches come first when ranked."""
+        res = self.__client.get(TAG_URL, {'search': 'rock',
+                                          'ordering': 'similarity'})
+
+        self.assertEqual([tag['name'] for tag in res.data],
+                         ['Rock', 'Rockabilly', 'Pop rock'])
+
+        res = self.__client.get(INGREDIENT_URL, {'search': 'sugar',
+                                                 'ordering': 'similarity'})
+
+        self.assertEqual([ingredient['name'] for ingredient in res.data],
+                         ['Sugar', 'Brown sugar'])
+
+    def test_ranked_search_paginates(self):
+        """Test ranked results page through with a cursor."""
+        res = self.__client.get(TAG_URL, {'search': 'rock', 'page_size': 2,
+                                          'ordering': 'similarity'})
+        names = [tag['name'] for tag in res.data['results']]
+
+        res = self.__client.get(res.data['next'])
+        names += [tag['name'] for tag in res.data['results']]
+
+        self.assertEqual(names, ['Rock', 'Rockabilly', 'Pop rock'])
+        self.assertIsNone(res.data['next'])
+
+    def test_search_matches_every_term(self):
+        """Test each search term matches on its own, in any order."""
+        res = self.__client.get(TAG_URL, {'search': 'rock pop'})
+
+        self.assertEqual([tag['name'] for tag in res.data], ['Pop rock'])
+
+    def test_trigram_query(self):
+        """Test pg_trgm matches each term and ranks by the whole text."""
+        request = Request(APIRequestFactory().get(
+            TAG_URL, {'search': 'rock pop', 'ordering': 'similarity'}))
+
+        with patch('core.filters.has_trigram_support', return_value=True):
+            queryset = TrigramSearchFilter().filter_queryset(
+                request, Tag.objects.order_by('name'), None)
+        sql, params = queryset.query.sql_with_params()
+
+        self.assertEqual(sql.count('"core_tag"."name" %% %s'), 2)
+        self.assertIn('SIMILARITY("core_tag"."name", %s) AS "similarity"',
+                      sql)
+        self.assertTrue(sql.endswith(
+            'ORDER BY "similarity" DESC, "core_tag"."name" ASC'))
+        self.assertEqual(params[0], 'rock pop')
+        self.assertIn('rock', params)
+        self.assertIn('pop', params)
+
+    def test_trigram_support_per_database(self):
+        """Test support is read again for a renamed database."""
+        self.assertEqual(has_trigram_support(connection),
+                         has_trigram_support(connection))
+        name, supported = connection.trigram_support
+        self.assertEqual(name, connection.settings_dict['NAME'])
+        connection.trigram_support = ('other', not supported)
+
+        self.assertEqual(has_trigram_support(connection), supported)
+
+    def test_search_tolerates_typos(self):
+        """Test a misspelled search still finds similar names."""
+        if not has_trigram_support(connection):
+            self.skipTest('pg_trgm is not installed')
+        res = self.__client.get(INGREDIENT_URL, {'search': 'suger',
+                                                 'ordering': 'similarity'})
+
+        self.assertEqual(res.data[0]['name'], 'Sugar')
@@ -0,0 +1,33 @@
+"""Test for the custom lookups."""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+
+from core.models import Tag
+
+
+class AnyLookupTest(TestCase):
+    """Test class of the any lookup."""
+    def setUp(self):
+        super().setUp()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__tags = [Tag.objects.create(user=self.__user, name=name)
+                       for name in ['Tag1', 'Tag2', 'Tag3']]
+
+    def test_any_matches_values(self):
+        """Test any filters with the list as a single array parameter."""
+        ids = [self.__tags[0].id, self.__tags[2].id] + list(range(-500, 0))
+
+        with CaptureQueriesContext(connection) as queries:
+            tags = list(Tag.objects.filter(id__any=ids))
+
+        self.assertEqual(tags, [self.__tags[0], self.__tags[2]])
+        self.assertIn('= ANY(ARRAY[', queries[0]['sql'])
+        self.assertEqual(list(Tag.objects.filter(id__any=[])), [])
+        self.assertEqual(
+            list(Tag.objects.filter(name__any={'Tag2'})), [self.__tags[1]])
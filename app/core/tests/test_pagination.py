@@ -0,0 +1,93 @@
+"""Test for cursor pagination of recipe, tag and ingredient lists."""
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag, Ingredient
+from core.response_cache import get_cache
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+RECIPE_URL = reverse('recipe:recipe-list')
+TAG_URL = reverse('tag:tag-list')
+INGREDIENT_URL = reverse('ingredient:ingredient-list')
+
+
+class CursorPaginationTest(TestCase):
+    """Test class of opt-in cursor pagination."""
+    def setUp(self):
+        super().setUp()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+        Recipe.objects.bulk_create([
+            Recipe(user=self.__user, title='Test title{}'.format(i),
+                   time_minutes=10, price=10.50)
+            for i in range(5)
+        ])
+        Tag.objects.bulk_create([
+            Tag(user=self.__user, name=name)
+            for name in ['Tag c', 'Tag a', 'Tag e', 'Tag b', 'Tag d']
+        ])
+        Ingredient.objects.bulk_create([
+            Ingredient(user=self.__user, name=name)
+            for name in ['Sugar', 'Salt', 'Pepper']
+        ])
+
+    def walk(self, url):
+        """Follow next links from the first page, returning all pages."""
+        pages = []
+        params = {'page_size': 2}
+        while url:
+            res = self.__client.get(url, params)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            pages.append(res.data)
+            url, params = res.data['next'], None
+        return pages
+
+    def test_unpaginated_by_default(self):
+        """Test lists stay plain arrays without pagination params."""
+        for url in [RECIPE_URL, TAG_URL, INGREDIENT_URL]:
+            res = self.__client.get(url)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertIsInstance(res.data, list)
+
+    def test_recipes_paginated_by_id_desc(self):
+        """Test walking recipe pages returns every recipe newest first."""
+        pages = self.walk(RECIPE_URL)
+        ids = [item['id'] for page in pages for item in page['results']]
+
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(ids, list(Recipe.objects.order_by('-id')
+                                   .values_list('id', flat=True)))
+        self.assertIsNone(pages[0]['previous'])
+
+    def test_tags_paginated_by_name(self):
+        """Test walking tag pages returns tags ordered by name."""
+        pages = self.walk(TAG_URL)
+        names = [item['name'] for page in pages for item in page['results']]
+
+        self.assertEqual(names, ['Tag a', 'Tag b', 'Tag c', 'Tag d', 'Tag e'])
+
+    def test_ingredients_paginated_by_name(self):
+        """Test walking ingredient pages returns ingredients by name."""
+        pages = self.walk(INGREDIENT_URL)
+        names = [item['name'] for page in pages for item in page['results']]
+
+        self.assertEqual(names, ['Pepper', 'Salt', 'Sugar'])
+
+    def test_page_query_count_is_constant(self):
+        """Test a deep page costs the same queries as the first one."""
+        first = self.__client.get(RECIPE_URL, {'page_size': 1})
+        with self.assertNumQueries(3):
+            self.__client.get(first.data['next'])
+        get_cache().clear()
+        with self.assertNumQueries(3):
+            self.__client.get(RECIPE_URL, {'page_size': 1})
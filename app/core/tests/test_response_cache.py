@@ -0,0 +1,97 @@
+"""Test for the per-user list response cache."""
+import tempfile
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag
+from core.response_cache import get_cache
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+RECIPE_URL = reverse('recipe:recipe-list')
+TAG_URL = reverse('tag:tag-list')
+
+
+class ListResponseCacheTest(TestCase):
+    """Test class of the list response cache."""
+    def setUp(self):
+        super().setUp()
+        get_cache().clear()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+        self.__tag = Tag.objects.create(user=self.__user, name='Tag1')
+        self.__recipe = Recipe.objects.create(
+            user=self.__user, title='Test title', time_minutes=10,
+            price=10.50)
+        self.__recipe.tags.add(self.__tag)
+
+    def test_repeated_list_is_cached(self):
+        """Test a repeated list is served without any query."""
+        first = self.__client.get(RECIPE_URL)
+
+        with self.assertNumQueries(0):
+            res = self.__client.get(RECIPE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, first.data)
+
+    def test_query_params_are_cached_apart(self):
+        """Test differently filtered lists do not share an entry."""
+        self.__client.get(RECIPE_URL)
+
+        res = self.__client.get(RECIPE_URL, {'tags': self.__tag.id + 1})
+
+        self.assertEqual(res.data, [])
+
+    def test_writes_invalidate(self):
+        """Test writes to recipes and tags show up in the next list."""
+        self.__client.get(RECIPE_URL)
+        self.__client.get(TAG_URL)
+
+        self.__tag.name = 'Tag2'
+        self.__tag.save()
+        Recipe.objects.bulk_create([Recipe(
+            user=self.__user, title='Bulk title', time_minutes=5, price=1)])
+
+        res = self.__client.get(RECIPE_URL)
+        self.assertEqual([recipe['title'] for recipe in res.data],
+                         ['Bulk title', 'Test title'])
+        self.assertEqual(res.data[1]['tags'][0]['name'], 'Tag2')
+        res = self.__client.get(TAG_URL)
+        self.assertEqual(res.data[0]['name'], 'Tag2')
+
+    def test_users_are_cached_apart(self):
+        """Test users never receive each other's cached lists."""
+        self.__client.get(RECIPE_URL)
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='test1234567890')
+        self.__client.force_authenticate(other)
+
+        res = self.__client.get(RECIPE_URL)
+
+        self.assertEqual(res.data, [])
+
+    def test_file_backend(self):
+        """Test the cache works with the file-based backend."""
+        with tempfile.TemporaryDirectory() as location:
+            caches = dict(settings.CACHES, responses={
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': location,
+            })
+            with override_settings(CACHES=caches):
+                first = self.__client.get(TAG_URL)
+                with self.assertNumQueries(0):
+                    res = self.__client.get(TAG_URL)
+
+        self.assertEqual(res.data, first.data)
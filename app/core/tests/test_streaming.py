@@ -0,0 +1,74 @@
+"""Test for streaming JSON list responses."""
+import json
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag
+from core.response_cache import get_cache
+from recipe.views import RecipeView
+from tag.views import TagView
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+RECIPE_URL = reverse('recipe:recipe-list')
+TAG_URL = reverse('tag:tag-list')
+
+
+class StreamingListTest(TestCase):
+    """Test class of lists streamed with ?stream=1."""
+    def setUp(self):
+        super().setUp()
+        get_cache().clear()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+        tags = [Tag.objects.create(user=self.__user,
+                                   name='Tag{}'.format(i))
+                for i in range(5)]
+        for i in range(5):
+            recipe = Recipe.objects.create(
+                user=self.__user, title='Test title{}'.format(i),
+                time_minutes=10, price='10.50')
+            recipe.tags.set(tags[:i])
+
+    def get_streamed(self, url, params):
+        """Return the decoded body of a streamed list response."""
+        res = self.__client.get(url, dict(params, stream='1'))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Type'], 'application/json')
+        return json.loads(b''.join(res.streaming_content))
+
+    def test_stream_matches_list(self):
+        """Test streamed lists match the plain lists across chunks."""
+        cases = [(RecipeView, RECIPE_URL, {}),
+                 (RecipeView, RECIPE_URL, {'fields': 'title,tags'}),
+                 (TagView, TAG_URL, {'search': 'tag'})]
+        for view, url, params in cases:
+            expected = self.__client.get(url, params).json()
+            self.assertEqual(len(expected), 5)
+            with mock.patch.object(view, 'stream_chunk_size', 2):
+                self.assertEqual(self.get_streamed(url, params), expected)
+
+    def test_stream_empty_list(self):
+        """Test an empty streamed list is valid JSON."""
+        Recipe.objects.all().delete()
+
+        self.assertEqual(self.get_streamed(RECIPE_URL, {}), [])
+
+    def test_paginated_requests_are_not_streamed(self):
+        """Test a requested page is returned as a regular response."""
+        res = self.__client.get(RECIPE_URL, {'stream': '1',
+                                             'page_size': 2})
+
+        self.assertFalse(res.streaming)
+        self.assertEqual(len(res.data['results']), 2)
@@ -0,0 +1,94 @@
+"""Test for conditional GET requests based on collection versions."""
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag, Ingredient
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+RECIPE_URL = reverse('recipe:recipe-list')
+RECIPE_BULK_URL = reverse('recipe:recipe-bulk')
+TAG_URL = reverse('tag:tag-list')
+INGREDIENT_URL = reverse('ingredient:ingredient-list')
+
+
+def get_detail_url(recipe_id):
+    """Return a recipe detail url."""
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+class ConditionalGetTest(TestCase):
+    """Test class of ETag and If-None-Match handling."""
+    def setUp(self):
+        super().setUp()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+        self.__tag = Tag.objects.create(user=self.__user, name='Tag1')
+        self.__recipe = Recipe.objects.create(
+            user=self.__user, title='Test title', time_minutes=10,
+            price=10.50)
+        self.__recipe.tags.add(self.__tag)
+
+    def assertNotModified(self, url, etag):
+        """Assert the url answers 304 to etag without any query."""
+        with self.assertNumQueries(0):
+            res = self.__client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+
+    def assertModified(self, url, etag):
+        """Assert the url answers 200 with a new ETag."""
+        res = self.__client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_unchanged_collections_are_not_modified(self):
+        """Test list and detail responses answer 304 to their ETag."""
+        for url in (RECIPE_URL, get_detail_url(self.__recipe.id), TAG_URL,
+                    INGREDIENT_URL):
+            res = self.__client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotModified(url, res['ETag'])
+
+    def test_etag_depends_on_query_params(self):
+        """Test filtered lists do not share the ETag of the full list."""
+        etag = self.__client.get(RECIPE_URL)['ETag']
+
+        self.assertModified(RECIPE_URL + '?tags={}'.format(self.__tag.id),
+                            etag)
+
+    def test_writes_change_etag(self):
+        """Test writes to recipes, tags and relations change the ETag."""
+        writes = [
+            lambda: Recipe.objects.filter(id=self.__recipe.id).first().save(),
+            lambda: Tag.objects.filter(id=self.__tag.id).first().save(),
+            lambda: Ingredient.objects.create(user=self.__user, name='Salt'),
+            lambda: self.__client.patch(
+                get_detail_url(self.__recipe.id) + '?m2m=replace',
+                {'tags': [{'name': 'Tag2'}]}, format='json'),
+            lambda: self.__client.post(RECIPE_BULK_URL, [{
+                'title': 'Bulk title', 'time_minutes': 5, 'price': 1,
+                'tags': [{'name': 'Tag2'}]}], format='json'),
+        ]
+        for write in writes:
+            etag = self.__client.get(RECIPE_URL)['ETag']
+            write()
+            self.assertModified(RECIPE_URL, etag)
+
+    def test_other_users_writes_keep_etag(self):
+        """Test another user's writes do not change the ETag."""
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='test1234567890')
+        etag = self.__client.get(TAG_URL)['ETag']
+
+        Tag.objects.create(user=other, name='Tag1')
+
+        self.assertNotModified(TAG_URL, etag)
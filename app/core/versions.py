@@ -0,0 +1,147 @@
+"""Per-user collection versions module for conditional GET requests."""
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils.http import parse_etags
+
+from core.models import Recipe, Tag, Ingredient
+from core.signals import rows_changed, invalidation_received
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+
+def get_cache():
+    """Return the cache holding the collection versions."""
+    return caches[settings.COLLECTION_VERSION_CACHE_ALIAS]
+
+
+def _version_key(user_id):
+    """Return the cache key of a user's collection version."""
+    return 'collection-version:{}'.format(user_id)
+
+
+def get_version(user_id):
+    """Return the version of the user's recipes, tags and ingredients.
+
+    A version missing from the cache, for example after an eviction, is
+    replaced by a new one, which only costs clients a full response.
+    """
+    cache = get_cache()
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(user_ids):
+    """Give the users new versions."""
+    get_cache().set_many({_version_key(user_id): uuid.uuid4().hex
+                          for user_id in user_ids}, None)
+
+
+def bump_versions(user_ids):
+    """Give the users new versions now and again once the write commits.
+
+    The second bump keeps a read that ran during the transaction from
+    tagging the old rows with the new version.
+    """
+    _bump(user_ids)
+    transaction.on_commit(lambda: _bump(user_ids))
+
+
+@receiver([post_save, post_delete], sender=Recipe)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver([post_save, post_delete], sender=Ingredient)
+def bump_saved_version(sender, instance, **kwargs):
+    """Bump the version of the owner of a saved or deleted row.
+
+    Recipe relations are only written along with a recipe save or a
+    rows_changed signal, which the recipe admin sends after saving them.
+    An m2m_changed receiver would also disable the single INSERT ... ON
+    CONFLICT fast path of the related managers.
+    """
+    bump_versions([instance.user_id])
+
+
+@receiver(rows_changed, sender=Recipe)
+@receiver(rows_changed, sender=Tag)
+@receiver(rows_changed, sender=Ingredient)
+def bump_changed_versions(sender, user_ids, **kwargs):
+    """Bump the versions of users whose rows were bulk written."""
+    bump_versions(user_ids)
+
+
+@receiver(invalidation_received, sender=Recipe)
+@receiver(invalidation_received, sender=Tag)
+@receiver(invalidation_received, sender=Ingredient)
+def bump_received_versions(sender, user_ids, **kwargs):
+    """Bump versions changed by another process in a process-local cache.
+
+    A shared cache already holds the version bumped by that process.
+    """
+    if isinstance(get_cache(), LocMemCache):
+        _bump(user_ids)
+
+
+class NotModified(APIException):
+    """Raised when the client already holds the current representation."""
+    status_code = status.HTTP_304_NOT_MODIFIED
+    default_detail = 'Not modified.'
+
+    def __init__(self, etag):
+        super().__init__()
+        self.etag = etag
+
+
+class ConditionalGetMixin:
+    """View mixin answering If-None-Match with the collection version.
+
+    The ETag of list and detail responses is derived from the user's
+    collection version and the full request path, so a matching request
+    returns 304 before the queryset or serializer run.
+    """
+    etag_actions = ('list', 'retrieve')
+
+    def get_etag(self, request):
+        """Return the ETag of the current request's representation."""
+        raw = '{}:{}:{}:{}'.format(
+            request.user.pk, get_version(request.user.pk),
+            request.get_full_path(), request.accepted_media_type)
+        return '"{}"'.format(hashlib.md5(raw.encode()).hexdigest())
+
+    def initial(self, request, *args, **kwargs):
+        """Raise NotModified when the client's ETag is current."""
+        super().initial(request, *args, **kwargs)
+        self.etag = None
+        if request.method in ('GET', 'HEAD') and \
+                self.action in self.etag_actions:
+            self.etag = self.get_etag(request)
+            etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+            if self.etag in etags or '*' in etags:
+                raise NotModified(self.etag)
+
+    def handle_exception(self, exc):
+        """Return an empty 304 response for NotModified."""
+        if isinstance(exc, NotModified):
+            return Response(status=exc.status_code,
+                            headers={'ETag': exc.etag})
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Add the ETag to successful conditional responses."""
+        response = super().finalize_response(request, response, *args,
+                                             **kwargs)
+        if getattr(self, 'etag', None) and \
+                response.status_code == status.HTTP_200_OK:
+            response['ETag'] = self.etag
+        return response
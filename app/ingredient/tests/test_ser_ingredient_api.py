@@ -179,6 +179,14 @@ class PrivateIngredientTest(TestCase):
         for i in range(len(res.data)):
             self.assertEqual(res.data[i], ingredients_serializers[i].data)
 
+    def test_get_ingredients_with_invalid_id(self):
+        """Test non numeric ingredient id params are rejected."""
+        for value in ('abc', '1,abc', '1,,2'):
+            res = self.__client_1.get(INGREDIENT_URL, {'id': value})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('id', res.data)
+
     def test_get_ingredients_with_name_success(self):
         """Test to get ingredients by prividing name parmas."""
         ingredient_data = [
@@ -0,0 +1,156 @@
+"""Synthetic dataset helpers module for recipe benchmarks."""
+import io
+import itertools
+import random
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+
+from core.models import Recipe, Tag, Ingredient
+
+from .documents import collect_documents
+from .imports import copy_text
+
+
+WORDS = (
+    'baked', 'beef', 'bread', 'butter', 'cheese', 'chicken', 'chili',
+    'chocolate', 'creamy', 'crispy', 'curry', 'easy', 'egg', 'fish',
+    'fresh', 'fried', 'garlic', 'grilled', 'healthy', 'honey', 'lemon',
+    'mushroom', 'noodle', 'onion', 'pancakes', 'pasta', 'pork', 'potato',
+    'quick', 'rice', 'roasted', 'salad', 'salmon', 'sauce', 'soup',
+    'spicy', 'stew', 'sweet', 'tomato', 'vegan',
+)
+
+
+class Rollback(Exception):
+    """Raised to discard a benchmark dataset."""
+
+
+def zipf_weights(count, skew):
+    """Return cumulative weights drawing rank r in proportion to r ** -skew.
+
+    A skew of 0 draws uniformly.
+    """
+    return list(itertools.accumulate(
+        rank ** -skew for rank in range(1, count + 1)))
+
+
+def create_users(count, prefix, password, batch_size):
+    """Bulk create count users and return their ids.
+
+    The password is hashed once and shared by every user.
+    """
+    model = get_user_model()
+    hashed = make_password(password)
+    ids = []
+    for start in range(0, count, batch_size):
+        users = model.objects.bulk_create(
+            model(email='{}-{}@example.com'.format(prefix, i),
+                  name='{} user {}'.format(prefix, i), password=hashed)
+            for i in range(start, min(start + batch_size, count)))
+        ids.extend(user.id for user in users)
+    return ids
+
+
+def create_names(model, user_ids, count, batch_size):
+    """Bulk create count names per user and return their ids per user.
+
+    The ids of each user are in rank order, most popular first.
+    """
+    label = model.__name__
+    rows = ((index, model(user_id=user_id, name='{} {}'.format(label, rank)))
+            for index, user_id in enumerate(user_ids)
+            for rank in range(1, count + 1))
+    ids = [[] for _ in user_ids]
+    with transaction.atomic():
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                return ids
+            model.objects.bulk_create([obj for _, obj in batch])
+            for index, obj in batch:
+                ids[index].append(obj.id)
+
+
+def analyze_tables():
+    """Refresh the planner statistics of the seeded tables."""
+    models = [get_user_model(), Recipe, Tag, Ingredient] + [
+        Recipe._meta.get_field(field).remote_field.through
+        for field in ('tags', 'ingredients')]
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE {}'.format(
+            ', '.join(model._meta.db_table for model in models)))
+
+
+def seed_dataset(users, recipes, tags, ingredients, tags_per_recipe,
+                 ingredients_per_recipe, skew=1.0, seed=0, batch_size=1000,
+                 prefix='bench', password=None, progress=None):
+    """Bulk create users with skewed recipes, tags and ingredients.
+
+    Recipes are spread over the users and tags and ingredients over the
+    recipes of their owner by Zipf weights, so a few heavy users own
+    most recipes and a few names of every user are on most of them.
+    Recipes draw up to twice the per recipe averages. The same seed
+    gives the same dataset. Every batch of recipes is written in its
+    own transaction and reported to progress. Relations are written
+    with COPY. Returns the new user ids and the row counts.
+    """
+    rng = random.Random(seed)
+    user_ids = create_users(users, prefix, password, batch_size)
+    related = []
+    for field, model, count, per_recipe in (
+            ('tags', Tag, tags, tags_per_recipe),
+            ('ingredients', Ingredient, ingredients,
+             ingredients_per_recipe)):
+        names = create_names(model, user_ids, count, batch_size)
+        if count and per_recipe:
+            m2m = Recipe._meta.get_field(field)
+            related.append((
+                m2m.remote_field.through, m2m.m2m_column_name(),
+                m2m.m2m_reverse_name(), names, zipf_weights(count, skew),
+                per_recipe))
+    # The foreign key checks of the relations are planned once per
+    # session, from statistics that may predate the new names.
+    analyze_tables()
+    owner_weights = zipf_weights(len(user_ids), skew)
+    counts = {'users': len(user_ids), 'recipes': 0,
+              'tags': len(user_ids) * tags,
+              'ingredients': len(user_ids) * ingredients, 'relations': 0}
+    while counts['recipes'] < recipes:
+        start = counts['recipes']
+        owners = rng.choices(range(len(user_ids)), cum_weights=owner_weights,
+                             k=min(batch_size, recipes - start))
+        objs = [
+            Recipe(user_id=user_ids[owner],
+                   title='{} recipe {}'.format(prefix, seq),
+                   description=' '.join(rng.choices(
+                       WORDS, k=rng.randint(5, 30))),
+                   time_minutes=rng.randint(5, 180),
+                   price=Decimal(rng.randint(100, 5000)).scaleb(-2))
+            for seq, owner in enumerate(owners, start + 1)]
+        with transaction.atomic(), collect_documents():
+            Recipe.objects.bulk_create(objs)
+            for through, column, related_column, names, weights, \
+                    per_recipe in related:
+                rows = [
+                    (recipe.id, name_id)
+                    for recipe, owner in zip(objs, owners)
+                    for name_id in dict.fromkeys(rng.choices(
+                        names[owner], cum_weights=weights,
+                        k=rng.randint(0, per_recipe * 2)))]
+                # Relations outnumber recipes several times over and
+                # building a model instance for each would dominate.
+                with connection.cursor() as cursor:
+                    cursor.copy_expert(
+                        'COPY {} ({}, {}) FROM STDIN'.format(
+                            through._meta.db_table, column,
+                            related_column),
+                        io.StringIO(copy_text(rows)))
+                counts['relations'] += len(rows)
+        counts['recipes'] += len(objs)
+        if progress is not None:
+            progress(counts)
+    analyze_tables()
+    return user_ids, counts
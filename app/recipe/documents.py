@@ -0,0 +1,156 @@
+"""Recipe document read model module.
+
+When RECIPE_DOCUMENTS_ENABLED is set, every recipe write also stores the
+RecipeDetailSerializer output of the recipe in a RecipeDocument row, and
+plain list and detail reads are served from those rows alone.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db.models.signals import post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from core.models import Recipe, RecipeDocument, Tag, Ingredient
+from core.signals import rows_changed
+from core.versions import bump_versions
+
+from rest_framework import serializers
+
+from .serializer import RecipeSerializer, RecipeDetailSerializer
+
+
+_collectors = threading.local()
+
+
+def documents_enabled():
+    """Return True if recipe documents are maintained and served."""
+    return settings.RECIPE_DOCUMENTS_ENABLED
+
+
+def build_documents(recipes):
+    """Return (recipe id, user id, data) of recipes with prefetched data.
+
+    Image urls are kept relative and made absolute when served.
+    """
+    return [
+        (recipe.id, recipe.user_id, data) for recipe, data in zip(
+            recipes, RecipeDetailSerializer(recipes, many=True).data)
+    ]
+
+
+def rebuild_documents(recipe_ids):
+    """Write the documents of recipe ids from the current rows.
+
+    The owners' collection versions are bumped again afterwards, so a
+    list read between the write and the rebuild cannot stay cached.
+    Returns the number of rebuilt documents.
+    """
+    recipes = list(Recipe.objects.filter(id__any=recipe_ids)
+                   .defer('search_vector').with_related())
+    RecipeDocument.objects.upsert(build_documents(recipes))
+    bump_versions(sorted({recipe.user_id for recipe in recipes}))
+    return len(recipes)
+
+
+def iter_recipe_ids(batch_size, user_id=None):
+    """Yield lists of recipe ids in id order, batch_size at a time."""
+    queryset = Recipe.objects.order_by('id')
+    if user_id is not None:
+        queryset = queryset.filter(user_id=user_id)
+    last_id = 0
+    while True:
+        ids = list(queryset.filter(id__gt=last_id)
+                   .values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def refresh_documents(recipe_ids):
+    """Rebuild documents now, or when the current collector exits."""
+    recipe_ids = set(recipe_ids)
+    if not recipe_ids or not documents_enabled():
+        return
+    stack = getattr(_collectors, 'stack', None)
+    if stack:
+        stack[-1].update(recipe_ids)
+    else:
+        rebuild_documents(recipe_ids)
+
+
+@contextmanager
+def collect_documents():
+    """Rebuild the documents of recipes written in the block once.
+
+    Writes made by a serializer save the recipe before its tags and
+    ingredients, so their documents are rebuilt when the block exits
+    instead of on every signal. Nothing is rebuilt if the block raises.
+    """
+    stack = _collectors.__dict__.setdefault('stack', [])
+    stack.append(set())
+    try:
+        yield
+    except BaseException:
+        stack.pop()
+        raise
+    refresh_documents(stack.pop())
+
+
+@receiver(post_save, sender=Recipe)
+def refresh_saved_recipe(sender, instance, raw=False, **kwargs):
+    """Rebuild the document of a saved recipe."""
+    if not raw:
+        refresh_documents([instance.id])
+
+
+@receiver(rows_changed, sender=Recipe)
+def refresh_changed_recipes(sender, ids=(), **kwargs):
+    """Rebuild the documents of bulk written recipes."""
+    refresh_documents(ids)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+def refresh_renamed_related(sender, instance, created, raw=False,
+                            **kwargs):
+    """Rebuild the documents of recipes using a changed name."""
+    if not created and not raw and documents_enabled():
+        refresh_documents(instance.recipe_set.values_list('id', flat=True))
+
+
+@receiver(pre_delete, sender=Tag)
+@receiver(pre_delete, sender=Ingredient)
+def collect_deleted_related(sender, instance, **kwargs):
+    """Remember the recipes of a name before its relations are deleted."""
+    if documents_enabled():
+        instance.document_recipe_ids = list(
+            instance.recipe_set.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Ingredient)
+def refresh_deleted_related(sender, instance, **kwargs):
+    """Rebuild the documents of recipes that used a deleted name."""
+    refresh_documents(getattr(instance, 'document_recipe_ids', ()))
+
+
+class RecipeDocumentSerializer(serializers.BaseSerializer):
+    """Read only serializer of stored recipe documents."""
+    document_fields = RecipeDetailSerializer.Meta.fields
+
+    def to_representation(self, instance):
+        """Return the stored data in the serializer's field order."""
+        names = self.context.get('fields')
+        data = {name: instance.data[name] for name in self.document_fields
+                if names is None or name in names}
+        request = self.context.get('request')
+        if data.get('image') and request is not None:
+            data['image'] = request.build_absolute_uri(data['image'])
+        return data
+
+
+class RecipeListDocumentSerializer(RecipeDocumentSerializer):
+    """Read only serializer of stored recipe documents in lists."""
+    document_fields = RecipeSerializer.Meta.fields
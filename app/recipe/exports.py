@@ -0,0 +1,71 @@
+"""Recipe export module.
+
+Exports stream recipes with their tags and ingredients as NDJSON or
+CSV. Recipes are read from a server-side cursor a batch at a time and
+the relations of each batch are fetched with one query per relation,
+so memory stays constant however many recipes are exported.
+"""
+import csv
+import io
+import json
+
+from core.streaming import iter_chunks
+
+from .serializer import RecipeValuesSerializer, group_related
+
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+EXPORT_FIELDS = ['id', 'user', 'title', 'description', 'time_minutes',
+                 'price', 'link', 'tags', 'ingredients']
+
+
+def iter_export_rows(queryset, batch_size=500):
+    """Yield lists of recipe export dicts, batch_size at a time."""
+    price = RecipeValuesSerializer.price_field.to_representation
+    rows = queryset.values('id', 'user_id', 'title', 'description',
+                           'time_minutes', 'price', 'link')
+    for batch in iter_chunks(rows, batch_size):
+        recipe_ids = [row['id'] for row in batch]
+        tags = group_related('tags', recipe_ids)
+        ingredients = group_related('ingredients', recipe_ids)
+        yield [{
+            'id': row['id'],
+            'user': row['user_id'],
+            'title': row['title'],
+            'description': row['description'],
+            'time_minutes': row['time_minutes'],
+            'price': price(row['price']),
+            'link': row['link'],
+            'tags': tags.get(row['id'], []),
+            'ingredients': ingredients.get(row['id'], []),
+        } for row in batch]
+
+
+def encode_csv(lines):
+    """Return lines of values as CSV text."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(lines)
+    return buffer.getvalue()
+
+
+def iter_export(queryset, output, batch_size=500):
+    """Yield the export of queryset in an EXPORT_FORMATS output.
+
+    NDJSON has one recipe object per line. CSV has a header line and
+    the names of tags and ingredients joined with "|".
+    """
+    if output == 'csv':
+        yield encode_csv([EXPORT_FIELDS])
+    for rows in iter_export_rows(queryset, batch_size):
+        if output == 'csv':
+            yield encode_csv([
+                [row[field] for field in EXPORT_FIELDS[:-2]] +
+                ['|'.join(item['name'] for item in row[field])
+                 for field in ('tags', 'ingredients')]
+                for row in rows
+            ])
+        else:
+            yield ''.join(json.dumps(row) + '\n' for row in rows)
@@ -0,0 +1,261 @@
+"""Recipe import module.
+
+Imports load NDJSON or CSV recipe dumps in the export format. Rows are
+parsed and validated in worker processes, staged with COPY into
+temporary tables and then written with set-based statements that skip
+rows hitting the unique constraints of recipes, tags and ingredients.
+Both steps must run inside one transaction.
+"""
+import csv
+import io
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from core.models import Recipe, Tag, Ingredient
+from core.signals import rows_changed
+
+from rest_framework import serializers
+
+from .serializer import RecipeImportSerializer
+
+
+RELATED = (('tags', Tag), ('ingredients', Ingredient))
+STAGING_TABLES = {
+    'import_recipe': 'seq bigint, user_id bigint, title text, '
+                     'description text, time_minutes integer, '
+                     'price numeric(6, 2), link text',
+    'import_tags': 'seq bigint, name text',
+    'import_ingredients': 'seq bigint, name text',
+    'import_created': 'seq bigint, recipe_id bigint, user_id bigint',
+}
+
+
+def copy_value(value):
+    """Return a value escaped for the COPY text format."""
+    if value is None:
+        return '\\N'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t') \
+        .replace('\n', '\\n').replace('\r', '\\r')
+
+
+def copy_text(lines):
+    """Return lines of values in the COPY text format."""
+    return ''.join('\t'.join(copy_value(value) for value in line) + '\n'
+                   for line in lines)
+
+
+def iter_records(stream, input_format, batch_size):
+    """Yield (first row number, records) of stream, batch_size at a time.
+
+    NDJSON records are raw lines. CSV records are parsed here, as quoted
+    values may span lines, and passed on as dicts.
+    """
+    records = stream if input_format == 'ndjson' else csv.DictReader(stream)
+    batch = []
+    start = 1
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield start, batch
+            start += len(batch)
+            batch = []
+    if batch:
+        yield start, batch
+
+
+def decode_record(record, input_format):
+    """Return the serializer data of a record, or None for blank lines."""
+    if input_format == 'ndjson':
+        if not record.strip():
+            return None
+        row = json.loads(record)
+        if not isinstance(row, dict):
+            raise ValueError('Expected a JSON object.')
+        for field, _ in RELATED:
+            if isinstance(row.get(field), list):
+                row[field] = [item.get('name')
+                              if isinstance(item, dict) else item
+                              for item in row[field]]
+        return row
+    if None in record or None in record.values():
+        raise ValueError('Expected {} columns.'.format(len(record)))
+    row = {key: value for key, value in record.items() if value != ''}
+    for field, _ in RELATED:
+        if field in row:
+            row[field] = row[field].split('|')
+    return row
+
+
+def parse_records(start, records, input_format, user_id=None):
+    """Validate records into COPY text of the staging tables.
+
+    Returns the number of valid recipes, the COPY text of each staging
+    table and a list of (row number, message) of invalid records.
+    Recipes without a user column belong to user_id.
+    """
+    serializer = RecipeImportSerializer()
+    recipes = []
+    names = {field: [] for field, _ in RELATED}
+    errors = []
+    for seq, record in enumerate(records, start):
+        try:
+            row = decode_record(record, input_format)
+            if row is None:
+                continue
+            data = serializer.run_validation(row)
+        except serializers.ValidationError as exc:
+            errors.append((seq, json.dumps(exc.detail)))
+            continue
+        except ValueError as exc:
+            errors.append((seq, str(exc)))
+            continue
+        owner = user_id if user_id is not None else data.get('user')
+        if owner is None:
+            errors.append((seq, json.dumps({'user': ['This field is '
+                                                     'required.']})))
+            continue
+        recipes.append((seq, owner, data['title'],
+                        data.get('description', ''), data['time_minutes'],
+                        data['price'], data.get('link', '')))
+        for field in names:
+            names[field].extend((seq, name)
+                                for name in data.get(field, []))
+    tables = {'import_recipe': copy_text(recipes)}
+    tables.update(('import_{}'.format(field), copy_text(rows))
+                  for field, rows in names.items())
+    return len(recipes), tables, errors
+
+
+def iter_parsed(chunks, input_format, user_id=None, workers=1):
+    """Yield parse_records results of chunks in order.
+
+    With several workers chunks are parsed in a process pool, keeping
+    at most two chunks per worker in flight so memory stays bounded.
+    """
+    if workers <= 1:
+        for start, records in chunks:
+            yield parse_records(start, records, input_format, user_id)
+        return
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for start, records in chunks:
+            pending.append(executor.submit(parse_records, start, records,
+                                           input_format, user_id))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def stage_recipes(stream, input_format, user_id=None, workers=1,
+                  batch_size=1000):
+    """COPY the valid recipes of stream into the staging tables.
+
+    Returns the number of staged recipes and the (row number, message)
+    list of invalid ones, including recipes of unknown users, which are
+    left out of the staging tables.
+    """
+    staged = 0
+    errors = []
+    with connection.cursor() as cursor:
+        for table, columns in STAGING_TABLES.items():
+            cursor.execute('DROP TABLE IF EXISTS {}'.format(table))
+            cursor.execute('CREATE TEMPORARY TABLE {} ({}) ON COMMIT DROP'
+                           .format(table, columns))
+        for count, tables, chunk_errors in iter_parsed(
+                iter_records(stream, input_format, batch_size),
+                input_format, user_id, workers):
+            staged += count
+            errors.extend(chunk_errors)
+            for table, text in tables.items():
+                if text:
+                    cursor.copy_expert('COPY {} FROM STDIN'.format(table),
+                                       io.StringIO(text))
+        cursor.execute(
+            'DELETE FROM import_recipe s WHERE NOT EXISTS (SELECT 1 FROM '
+            '{} u WHERE u.id = s.user_id) RETURNING seq, user_id'
+            .format(get_user_model()._meta.db_table))
+        unknown = cursor.fetchall()
+        # Autovacuum never analyzes temporary tables, and without
+        # statistics the joins of apply_import degrade to nested loops.
+        cursor.execute('ANALYZE import_recipe, import_tags, '
+                       'import_ingredients')
+    errors.extend((seq, json.dumps({'user': ['Unknown user {}.'.format(
+        owner)]})) for seq, owner in unknown)
+    return staged - len(unknown), sorted(errors)
+
+
+def apply_import(batch_size=1000):
+    """Write the staged recipes, tags, ingredients and their relations.
+
+    Recipes whose title the user already has are skipped, as are later
+    rows repeating a title. Missing tags and ingredients are created in
+    sorted order like get_or_create_by_names. rows_changed is sent for
+    the new rows, for recipes batch_size at a time. Returns the number
+    of created recipes.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'WITH created AS ('
+            'INSERT INTO {recipe} (user_id, title, description, '
+            'time_minutes, price, link, image) '
+            "SELECT user_id, title, description, time_minutes, price, link, "
+            "'' FROM (SELECT DISTINCT ON (user_id, title) * "
+            'FROM import_recipe ORDER BY user_id, title, seq) s '
+            'ORDER BY seq '
+            'ON CONFLICT (user_id, title) DO NOTHING '
+            'RETURNING id, user_id, title) '
+            'INSERT INTO import_created (seq, recipe_id, user_id) '
+            'SELECT DISTINCT ON (c.id) s.seq, c.id, c.user_id '
+            'FROM created c JOIN import_recipe s '
+            'ON s.user_id = c.user_id AND s.title = c.title '
+            'ORDER BY c.id, s.seq'.format(recipe=Recipe._meta.db_table))
+        created = cursor.rowcount
+        new_rows = {}
+        for field, model in RELATED:
+            cursor.execute(
+                'INSERT INTO {table} (user_id, name) '
+                'SELECT DISTINCT c.user_id, n.name FROM import_{field} n '
+                'JOIN import_created c USING (seq) ORDER BY 1, 2 '
+                'ON CONFLICT (user_id, name) DO NOTHING '
+                'RETURNING id, user_id'.format(
+                    table=model._meta.db_table, field=field))
+            new_rows[model] = cursor.fetchall()
+        # The foreign key checks of the through rows are planned from the
+        # statistics of the referenced tables, which may still describe
+        # them as nearly empty and make every check a sequential scan.
+        cursor.execute('ANALYZE import_created, {}, {}, {}'.format(
+            Recipe._meta.db_table, Tag._meta.db_table,
+            Ingredient._meta.db_table))
+        for field, model in RELATED:
+            m2m = Recipe._meta.get_field(field)
+            cursor.execute(
+                'INSERT INTO {through} ({recipe_column}, {related_column}) '
+                'SELECT DISTINCT c.recipe_id, r.id FROM import_{field} n '
+                'JOIN import_created c USING (seq) '
+                'JOIN {table} r ON r.user_id = c.user_id AND r.name = n.name '
+                'ON CONFLICT DO NOTHING'.format(
+                    through=m2m.remote_field.through._meta.db_table,
+                    recipe_column=m2m.m2m_column_name(),
+                    related_column=m2m.m2m_reverse_name(),
+                    table=model._meta.db_table, field=field))
+
+    for model, rows in new_rows.items():
+        if rows:
+            rows_changed.send(
+                sender=model,
+                user_ids=sorted({user_id for _, user_id in rows}),
+                ids=[related_id for related_id, _ in rows])
+    with connection.chunked_cursor() as cursor:
+        cursor.execute('SELECT recipe_id, user_id FROM import_created '
+                       'ORDER BY recipe_id')
+        for rows in iter(lambda: cursor.fetchmany(batch_size), []):
+            rows_changed.send(
+                sender=Recipe,
+                user_ids=sorted({user_id for _, user_id in rows}),
+                ids=[recipe_id for recipe_id, _ in rows])
+    return created
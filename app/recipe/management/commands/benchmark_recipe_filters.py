@@ -0,0 +1,131 @@
+"""
+    Command benchmarking filtered recipe list latency.
+"""
+import statistics
+import time
+import uuid
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from recipe.benchmarks import Rollback, seed_dataset
+from recipe.views import RecipeView
+
+
+REVERSE_INDEXES = [
+    'core_recipe_tags_tag_recipe_idx',
+    'core_recipe_ingredients_ingredient_recipe_idx',
+]
+
+
+class Command(BaseCommand):
+    """ Benchmark recipe filters command. """
+    help = ('Seed a synthetic dataset for one user inside a transaction and '
+            'report the latency of filtered recipe list requests. The data '
+            'is rolled back unless --keep is given.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=1000000)
+        parser.add_argument('--tags', type=int, default=200)
+        parser.add_argument('--ingredients', type=int, default=500)
+        parser.add_argument('--per-recipe', type=int, default=4,
+                            help='Average tags and ingredients drawn per '
+                                 'recipe.')
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--without-indexes', action='store_true',
+            help='Drop the through-table filter indexes for the run. This '
+                 'locks the through tables until the run ends.')
+        parser.add_argument('--keep', action='store_true',
+                            help='Commit the dataset instead of rolling back.')
+
+    def handle(self, *args: Any, **options: Any):
+        """Seed, benchmark and roll back."""
+        if options['without_indexes'] and options['keep']:
+            raise CommandError('--without-indexes cannot be combined with '
+                               '--keep, which would commit the dropped '
+                               'indexes.')
+        try:
+            with transaction.atomic():
+                user = self.seed(options)
+                if options['without_indexes']:
+                    with connection.cursor() as cursor:
+                        for index in REVERSE_INDEXES:
+                            cursor.execute(
+                                'DROP INDEX IF EXISTS {}'.format(index))
+                self.run_cases(user, options)
+                if not options['keep']:
+                    raise Rollback
+        except Rollback:
+            self.stdout.write('Benchmark data rolled back.')
+
+    def seed(self, options):
+        """Insert the synthetic dataset for a new user."""
+        started = time.perf_counter()
+        (user_id,), _ = seed_dataset(
+            1, options['recipes'], options['tags'], options['ingredients'],
+            options['per_recipe'], options['per_recipe'],
+            seed=options['seed'], batch_size=5000,
+            prefix='benchmark-{}'.format(uuid.uuid4().hex))
+        self.stdout.write('Seeded {} recipes in {:.1f}s'.format(
+            options['recipes'], time.perf_counter() - started))
+        return get_user_model().objects.get(pk=user_id)
+
+    def run_cases(self, user, options):
+        """Time each filter case through the recipe list view."""
+        tag_ids = list(user.tag_set.order_by('id')
+                       .values_list('id', flat=True)[:3])
+        ingredient_ids = list(user.ingredient_set.order_by('id')
+                              .values_list('id', flat=True)[:3])
+        cases = [
+            ('unfiltered', {}),
+            ('tags any x1', {'tags': tag_ids[:1]}),
+            ('tags any x3', {'tags': tag_ids}),
+            ('tags all x2', {'tags': tag_ids[:2], 'match': 'all'}),
+            ('tags all x3', {'tags': tag_ids, 'match': 'all'}),
+            ('ingredients all x2',
+             {'ingredients': ingredient_ids[:2], 'match': 'all'}),
+            ('tags + ingredients all',
+             {'tags': tag_ids[:1], 'ingredients': ingredient_ids[:1],
+              'match': 'all'}),
+        ]
+        factory = APIRequestFactory()
+        # Every request must run the filter queries, not read a cached
+        # response.
+        caches = dict(settings.CACHES)
+        caches[settings.RESPONSE_CACHE_ALIAS] = {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+        view = override_settings(ALLOWED_HOSTS=['testserver'],
+                                 CACHES=caches)(
+            RecipeView.as_view({'get': 'list'}))
+        self.stdout.write('{:<26}{:>10}{:>10}{:>8}'.format(
+            'case', 'p50 ms', 'p95 ms', 'rows'))
+        for name, params in cases:
+            params = {k: ','.join(map(str, v)) if isinstance(v, list) else v
+                      for k, v in params.items()}
+            params['page_size'] = options['page_size']
+            timings = []
+            for _ in range(options['repeat']):
+                request = factory.get('/api/recipe/recipes/', params)
+                force_authenticate(request, user)
+                started = time.perf_counter()
+                response = view(request)
+                response.render()
+                timings.append((time.perf_counter() - started) * 1000)
+                if response.status_code != status.HTTP_200_OK:
+                    raise CommandError('Case {!r} returned {}.'.format(
+                        name, response.status_code))
+            timings.sort()
+            self.stdout.write('{:<26}{:>10.2f}{:>10.2f}{:>8}'.format(
+                name, statistics.median(timings),
+                timings[int(len(timings) * 0.95) - 1],
+                len(response.data['results'])))
@@ -0,0 +1,79 @@
+"""
+    Command benchmarking recipe list serialization.
+"""
+import statistics
+import time
+import uuid
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import Recipe
+
+from recipe.benchmarks import Rollback, seed_dataset
+from recipe.serializer import RecipeSerializer, RecipeValuesSerializer
+
+
+class Command(BaseCommand):
+    """ Benchmark recipe list command. """
+    help = ('Seed a synthetic dataset for one user inside a transaction and '
+            'compare listing it with RecipeSerializer and with the values() '
+            'path. The data is always rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=10000)
+        parser.add_argument('--tags', type=int, default=50)
+        parser.add_argument('--ingredients', type=int, default=200)
+        parser.add_argument('--per-recipe', type=int, default=4,
+                            help='Average tags and ingredients drawn per '
+                                 'recipe.')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args: Any, **options: Any):
+        """Seed, benchmark both paths and roll back."""
+        try:
+            with transaction.atomic():
+                (user_id,), _ = seed_dataset(
+                    1, options['recipes'], options['tags'],
+                    options['ingredients'], options['per_recipe'],
+                    options['per_recipe'], seed=options['seed'],
+                    batch_size=5000,
+                    prefix='benchmark-{}'.format(uuid.uuid4().hex))
+                self.run_cases(get_user_model().objects.get(pk=user_id),
+                               options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write('Benchmark data rolled back.')
+
+    def run_cases(self, user, options):
+        """Time fetching and serializing the user's recipes both ways."""
+        queryset = Recipe.objects.filter(user=user).order_by('-id')
+        cases = [
+            ('model serializer', lambda: RecipeSerializer(
+                queryset.defer('search_vector').with_related(),
+                many=True).data),
+            ('values', lambda: RecipeValuesSerializer(
+                queryset.values(*RecipeValuesSerializer.value_fields),
+                many=True).data),
+        ]
+        self.stdout.write('{:<20}{:>10}{:>10}{:>8}'.format(
+            'case', 'p50 ms', 'max ms', 'rows'))
+        medians = {}
+        results = {}
+        for name, serialize in cases:
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                results[name] = serialize()
+                timings.append((time.perf_counter() - started) * 1000)
+            medians[name] = statistics.median(timings)
+            self.stdout.write('{:<20}{:>10.1f}{:>10.1f}{:>8}'.format(
+                name, medians[name], max(timings), len(results[name])))
+
+        if results['values'] != results['model serializer']:
+            raise CommandError('The values() path output differs.')
+        self.stdout.write(self.style.SUCCESS('Speedup {:.1f}x'.format(
+            medians['model serializer'] / medians['values'])))
@@ -0,0 +1,66 @@
+"""
+    Command checking the recipe documents read model against the recipes.
+"""
+import json
+from typing import Any
+
+from django.core.management import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from core.models import Recipe, RecipeDocument
+
+from recipe.documents import (
+    build_documents, iter_recipe_ids, rebuild_documents
+)
+
+
+class Command(BaseCommand):
+    """ Check recipe documents command. """
+    help = ('Compare every stored recipe document with a fresh '
+            'serialization of its recipe and report missing or stale ones.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, default=None,
+                            help='Only check the recipes of this user id.')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--fix', action='store_true',
+                            help='Rebuild the inconsistent documents.')
+
+    def handle(self, *args: Any, **options: Any):
+        """Check documents batch by batch."""
+        checked = 0
+        missing = []
+        stale = []
+        for ids in iter_recipe_ids(options['batch_size'], options['user']):
+            recipes = Recipe.objects.filter(id__in=ids).order_by('id') \
+                .defer('search_vector').with_related()
+            stored = RecipeDocument.objects.in_bulk(ids)
+            for recipe_id, user_id, data in build_documents(recipes):
+                document = stored.get(recipe_id)
+                if document is None:
+                    missing.append(recipe_id)
+                elif document.user_id != user_id or document.data != \
+                        json.loads(json.dumps(data, cls=DjangoJSONEncoder)):
+                    stale.append(recipe_id)
+            checked += len(ids)
+
+        self.stdout.write('Checked {} recipe documents: {} missing, {} stale.'
+                          .format(checked, len(missing), len(stale)))
+        for label, ids in (('Missing', missing), ('Stale', stale)):
+            if ids:
+                self.stdout.write('{}: {}'.format(
+                    label, ', '.join(str(i) for i in ids[:100])))
+
+        inconsistent = missing + stale
+        if not inconsistent:
+            self.stdout.write(self.style.SUCCESS('Recipe documents are '
+                                                 'consistent'))
+        elif options['fix']:
+            with transaction.atomic():
+                rebuild_documents(inconsistent)
+            self.stdout.write(self.style.SUCCESS(
+                'Rebuilt {} recipe documents'.format(len(inconsistent))))
+        else:
+            raise CommandError('{} inconsistent recipe documents'.format(
+                len(inconsistent)))
@@ -0,0 +1,41 @@
+"""
+    Command exporting recipes as NDJSON or CSV.
+"""
+from typing import Any
+
+from django.core.management import BaseCommand
+
+from core.models import Recipe
+
+from recipe.exports import EXPORT_FORMATS, iter_export
+
+
+class Command(BaseCommand):
+    """ Export recipes command. """
+    help = ('Stream recipes with their tags and ingredients as NDJSON or '
+            'CSV, reading them from a server-side cursor in batches.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, default=None,
+                            help='Only export the recipes of this user id.')
+        parser.add_argument('--output', choices=sorted(EXPORT_FORMATS),
+                            default='ndjson')
+        parser.add_argument('--file', default=None,
+                            help='Write to this path instead of stdout.')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args: Any, **options: Any):
+        """Write the export batch by batch."""
+        queryset = Recipe.objects.order_by('id')
+        if options['user'] is not None:
+            queryset = queryset.filter(user_id=options['user'])
+        chunks = iter_export(queryset, options['output'],
+                             options['batch_size'])
+        if options['file'] is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(options['file'], 'w', newline='',
+                  encoding='utf-8') as export_file:
+            for chunk in chunks:
+                export_file.write(chunk)
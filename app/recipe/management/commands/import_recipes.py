@@ -0,0 +1,70 @@
+"""
+    Command importing recipes from NDJSON or CSV dumps.
+"""
+import os
+import sys
+import time
+from typing import Any
+
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+
+from recipe.exports import EXPORT_FORMATS
+from recipe.imports import apply_import, stage_recipes
+
+
+class Command(BaseCommand):
+    """ Import recipes command. """
+    help = ('Load recipes with nested tag and ingredient names from an '
+            'NDJSON or CSV dump in the export format. Rows are parsed in '
+            'a process pool, staged with COPY and written with set-based '
+            'SQL in one transaction.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Dump to import, or - for stdin.')
+        parser.add_argument('--format', choices=sorted(EXPORT_FORMATS),
+                            default=None,
+                            help='Defaults to csv for .csv paths, else '
+                                 'ndjson.')
+        parser.add_argument('--user', type=int, default=None,
+                            help='Import every recipe for this user id '
+                                 'instead of the user column.')
+        parser.add_argument('--workers', type=int,
+                            default=os.cpu_count() or 1)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--skip-invalid', action='store_true',
+                            help='Import the valid rows when some are '
+                                 'invalid.')
+
+    def handle(self, *args: Any, **options: Any):
+        """Stage and write the dump in one transaction."""
+        path = options['path']
+        input_format = options['format'] or \
+            ('csv' if path.endswith('.csv') else 'ndjson')
+        started = time.perf_counter()
+        if path == '-':
+            created, staged, errors = self.run_import(sys.stdin,
+                                                      input_format, options)
+        else:
+            with open(path, newline='', encoding='utf-8') as stream:
+                created, staged, errors = self.run_import(
+                    stream, input_format, options)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            'Imported {} recipes in {:.1f}s ({:.0f}/s): {} skipped as '
+            'existing titles, {} invalid.'.format(
+                created, elapsed, created / elapsed if elapsed else 0,
+                staged - created, len(errors))))
+
+    def run_import(self, stream, input_format, options):
+        """Return created, staged and invalid rows of an import."""
+        with transaction.atomic():
+            staged, errors = stage_recipes(
+                stream, input_format, options['user'], options['workers'],
+                options['batch_size'])
+            for seq, message in errors[:20]:
+                self.stderr.write('Row {}: {}'.format(seq, message))
+            if errors and not options['skip_invalid']:
+                raise CommandError('{} invalid rows, nothing was imported.'
+                                   .format(len(errors)))
+            return apply_import(options['batch_size']), staged, errors
@@ -0,0 +1,28 @@
+"""
+    Command rebuilding the recipe documents read model.
+"""
+from typing import Any
+
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from recipe.documents import iter_recipe_ids, rebuild_documents
+
+
+class Command(BaseCommand):
+    """ Rebuild recipe documents command. """
+    help = 'Rebuild the stored documents of all recipes, or of one user.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, default=None,
+                            help='Only rebuild the recipes of this user id.')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args: Any, **options: Any):
+        """Rebuild documents batch by batch."""
+        rebuilt = 0
+        for ids in iter_recipe_ids(options['batch_size'], options['user']):
+            with transaction.atomic():
+                rebuilt += rebuild_documents(ids)
+        self.stdout.write(self.style.SUCCESS(
+            'Rebuilt {} recipe documents'.format(rebuilt)))
@@ -0,0 +1,76 @@
+"""
+    Command seeding a large benchmark dataset.
+"""
+import time
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand, CommandError
+
+from recipe.benchmarks import seed_dataset
+
+
+class Command(BaseCommand):
+    """ Seed benchmark data command. """
+    help = ('Bulk create users with recipes, tags and ingredients for '
+            'benchmarks. Recipes, tags and ingredients are skewed by Zipf '
+            'weights towards heavy users and popular names, and the same '
+            'seed gives the same dataset. Data is committed batch by batch.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--recipes', type=int, default=100000,
+                            help='Recipes in total over all users.')
+        parser.add_argument('--tags', type=int, default=30,
+                            help='Tags per user.')
+        parser.add_argument('--ingredients', type=int, default=150,
+                            help='Ingredients per user.')
+        parser.add_argument('--tags-per-recipe', type=int, default=3,
+                            help='Average tags drawn per recipe.')
+        parser.add_argument('--ingredients-per-recipe', type=int, default=8,
+                            help='Average ingredients drawn per recipe.')
+        parser.add_argument('--skew', type=float, default=1.0,
+                            help='Zipf exponent of users and names, 0 for '
+                                 'uniform draws.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--prefix', default='bench',
+                            help='Prefix of the user emails, which must not '
+                                 'be in use yet.')
+        parser.add_argument('--password', default=None,
+                            help='Password of every user, unusable by '
+                                 'default.')
+
+    def handle(self, *args: Any, **options: Any):
+        """Seed the dataset and report its size."""
+        for name in ('users', 'batch_size'):
+            if options[name] < 1:
+                raise CommandError('--{} must be at least 1.'.format(
+                    name.replace('_', '-')))
+        for name in ('recipes', 'tags', 'ingredients', 'tags_per_recipe',
+                     'ingredients_per_recipe', 'skew'):
+            if options[name] < 0:
+                raise CommandError('--{} must not be negative.'.format(
+                    name.replace('_', '-')))
+        if get_user_model().objects.filter(
+                email__startswith='{}-'.format(options['prefix'])).exists():
+            raise CommandError('Users with the prefix {!r} already exist.'
+                               .format(options['prefix']))
+        started = time.perf_counter()
+        _, counts = seed_dataset(
+            options['users'], options['recipes'], options['tags'],
+            options['ingredients'], options['tags_per_recipe'],
+            options['ingredients_per_recipe'], options['skew'],
+            options['seed'], options['batch_size'], options['prefix'],
+            options['password'], self.report)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            'Seeded {users} users, {recipes} recipes, {tags} tags, '
+            '{ingredients} ingredients and {relations} recipe relations'
+            .format(**counts) + ' in {:.1f}s ({:.0f} recipes/s).'.format(
+                elapsed, counts['recipes'] / elapsed if elapsed else 0)))
+
+    def report(self, counts):
+        """Write the progress of the recipes."""
+        self.stdout.write('{recipes} recipes, {relations} relations'
+                          .format(**counts))
@@ -1,17 +1,176 @@
 """Recipe serializer module."""
+from operator import attrgetter
+
+from django.db import models, transaction
 from django.db.utils import IntegrityError
 
 from rest_framework import serializers
 
 from core.models import Recipe, Tag, Ingredient
+from core.signals import rows_changed
 from tag.serializer import TagSerializer
 from ingredient.serializer import IngredientSerializer
 
 
+def add_related_in_bulk(user, recipe_ids, tag_lists, ingredient_lists):
+    """Attach tags and ingredients by name to many recipes at once.
+
+    tag_lists and ingredient_lists hold the names for each recipe id.
+    Names across all recipes are resolved together and through rows are
+    inserted with one statement per relation, skipping existing pairs.
+    """
+    for model, field, name_lists in ((Tag, 'tags', tag_lists),
+                                     (Ingredient, 'ingredients',
+                                      ingredient_lists)):
+        objs = {obj.name: obj for obj in
+                model.objects.get_or_create_by_names(
+                    user, [name for names in name_lists for name in names])}
+        through = getattr(Recipe, field).through
+        column = '{}_id'.format(model._meta.model_name)
+        through.objects.bulk_create([
+            through(**{'recipe_id': recipe_id, column: objs[name].id})
+            for recipe_id, names in zip(recipe_ids, name_lists)
+            for name in dict.fromkeys(names)
+        ], ignore_conflicts=True)
+
+
+def pop_related_names(items):
+    """Pop nested tags and ingredients from items, returning their names."""
+    tag_lists = [[tag['name'] for tag in item.pop('tags', [])]
+                 for item in items]
+    ingredient_lists = [
+        [ingredient['name'] for ingredient in item.pop('ingredients', [])]
+        for item in items
+    ]
+    return tag_lists, ingredient_lists
+
+
+class RecipeListSerializer(serializers.ListSerializer):
+    """List serializer writing many recipes with set-based statements."""
+    def create(self, validated_data):
+        """Create all recipes with a fixed number of statements.
+
+        Tags and ingredients named anywhere in the batch are resolved
+        together, recipes are inserted with one bulk insert and the
+        through-table rows with one bulk insert per relation. Recipes
+        are returned in the order of validated_data. Raises
+        IntegrityError, after rolling back, when a title is taken.
+        """
+        user = self.context['request'].user
+        tag_lists, ingredient_lists = pop_related_names(
+            [dict(item) for item in validated_data])
+        with transaction.atomic():
+            recipes = Recipe.objects.bulk_create([
+                Recipe(user=user, **{
+                    field: value for field, value in item.items()
+                    if field not in ('tags', 'ingredients')})
+                for item in validated_data
+            ])
+            add_related_in_bulk(user, [recipe.id for recipe in recipes],
+                                tag_lists, ingredient_lists)
+        return recipes
+
+    def update(self, instance, validated_data):
+        """Apply per-recipe changes to the recipes in instance.
+
+        Scalar fields are written with one bulk_update per set of
+        changed fields, so a recipe's other columns are never written
+        back, and nested tags and ingredients are added like a single
+        recipe update.
+        """
+        user = self.context['request'].user
+        tag_lists, ingredient_lists = pop_related_names(validated_data)
+        groups = {}
+        for recipe, item in zip(instance, validated_data):
+            for field, value in item.items():
+                setattr(recipe, field, value)
+            if item:
+                groups.setdefault(tuple(sorted(item)), []).append(recipe)
+        try:
+            with transaction.atomic():
+                for fields, recipes in groups.items():
+                    Recipe.objects.bulk_update(recipes, fields)
+                add_related_in_bulk(user, [recipe.id for recipe in instance],
+                                    tag_lists, ingredient_lists)
+                rows_changed.send(sender=Recipe, user_ids=[user.pk],
+                                  ids=[recipe.id for recipe in instance])
+            return instance
+        except IntegrityError:
+            raise serializers.ValidationError({'error': 'Bad Request -\
+                Integrity constraint violation'})
+
+    def update_queryset(self, queryset, validated_data):
+        """Apply the same changes to every recipe in queryset.
+
+        Scalar fields are written with a single UPDATE statement.
+        Returns the number of matched recipes.
+        """
+        user = self.context['request'].user
+        (tags,), (ingredients,) = pop_related_names([validated_data])
+        try:
+            with transaction.atomic():
+                recipe_ids = list(queryset.values_list('id', flat=True))
+                if validated_data:
+                    Recipe.objects.filter(id__any=recipe_ids).update(
+                        **validated_data)
+                add_related_in_bulk(user, recipe_ids,
+                                    [tags] * len(recipe_ids),
+                                    [ingredients] * len(recipe_ids))
+                rows_changed.send(sender=Recipe, user_ids=[user.pk],
+                                  ids=recipe_ids)
+            return len(recipe_ids)
+        except IntegrityError:
+            raise serializers.ValidationError({'error': 'Bad Request -\
+                Integrity constraint violation'})
+
+
+class RecipeBulkUpdateItemSerializer(serializers.Serializer):
+    """Serializer of one item of a bulk recipe update."""
+    id = serializers.IntegerField()
+    changes = serializers.DictField()
+
+
+class RecipeIdsSerializer(serializers.Serializer):
+    """Serializer of the recipe ids of a batched retrieve."""
+    ids = serializers.ListField(child=serializers.IntegerField(),
+                                allow_empty=False)
+
+
+class RecipeBulkFilterSerializer(serializers.Serializer):
+    """Serializer of the filter selecting recipes for a bulk update."""
+    ids = serializers.ListField(child=serializers.IntegerField(),
+                                required=False)
+    tags = serializers.ListField(child=serializers.IntegerField(),
+                                 required=False)
+    ingredients = serializers.ListField(child=serializers.IntegerField(),
+                                        required=False)
+
+    def validate(self, attrs):
+        """Reject filters without any key, which would match every recipe."""
+        if not attrs:
+            raise serializers.ValidationError(
+                'Expected at least one of: {}.'.format(', '.join(self.fields)))
+        return attrs
+
+
+class RelatedListSerializer(serializers.ListSerializer):
+    """List serializer of nested tags or ingredients in id order.
+
+    RecipeQuerySet.with_related prefetches them in that order already,
+    while write responses read the relations of a saved recipe.
+    """
+    def to_representation(self, data):
+        """Return the related objects sorted by id."""
+        if isinstance(data, models.Manager):
+            data = sorted(data.all(), key=attrgetter('pk'))
+        return super().to_representation(data)
+
+
 class RecipeSerializer(serializers.ModelSerializer):
     """Serializer of Recipe Model without a decription field."""
-    tags = TagSerializer(many=True, required=False)
-    ingredients = IngredientSerializer(many=True, required=False)
+    tags = RelatedListSerializer(child=TagSerializer(), required=False)
+    ingredients = RelatedListSerializer(child=IngredientSerializer(),
+                                        required=False)
 
     class Meta:
         """Meta class for RecipeSerializer."""
@@ -20,12 +179,22 @@ class RecipeSerializer(serializers.ModelSerializer):
                   'tags', 'ingredients']
         read_only_fields = ['id']
 
+    def get_fields(self):
+        """Return the fields, narrowed to the fields context if given."""
+        fields = super().get_fields()
+        names = self.context.get('fields')
+        if names is None:
+            return fields
+        return {name: field for name, field in fields.items()
+                if name in names}
+
 
 class RecipeDetailSerializer(RecipeSerializer):
     """Serializer of Recipe Model."""
     class Meta(RecipeSerializer.Meta):
         """Meta class for RecipeDetailSerializer."""
         fields = RecipeSerializer.Meta.fields + ['description', 'image']
+        list_serializer_class = RecipeListSerializer
 
     def create(self, validated_data):
         """Override a create method."""
@@ -33,46 +202,142 @@ class RecipeDetailSerializer(RecipeSerializer):
             user = self.context['request'].user
             tag_list = validated_data.pop('tags', [])
             ingredient_list = validated_data.pop('ingredients', [])
-            recipe = Recipe.objects.create(user=user, **validated_data)
-            if tag_list:
-                for tag in tag_list:
-                    tag_obj, _ = Tag.objects.get_or_create(
-                        user=user, **tag)
-                    recipe.tags.add(tag_obj)
-                recipe.save()
-
-            if ingredient_list:
-                for ingredient in ingredient_list:
-                    ingredient_obj, _ = Ingredient.objects.get_or_create(
-                        user=user,
-                        **ingredient
-                        )
-                    recipe.ingredients.add(ingredient_obj)
-                recipe.save()
+            with transaction.atomic():
+                recipe = Recipe.objects.create(user=user, **validated_data)
+                self._add_related(recipe, user, tag_list, ingredient_list)
             return recipe
         except IntegrityError:
             raise serializers.ValidationError({'error': 'Bad Request -\
                 Integrity constraint violation'})
 
     def update(self, instance, validated_data):
+        """Override an update method.
+
+        Nested tags and ingredients are added to the recipe, or replace
+        its current ones when the replace_related context flag is set.
+        """
         user = self.context['request'].user
-        tags = validated_data.pop('tags', [])
-        ingredeints = validated_data.pop('ingredients', [])
-        recipe = super().update(instance, validated_data)
-        if tags:
-            for tag in tags:
-                tag_obj, _ = Tag.objects.get_or_create(user=user,
-                                                       **tag)
-                recipe.tags.add(tag_obj)
-            recipe.save()
-        if ingredeints:
-            for ingredient in ingredeints:
-                ingredient_obj, _ = Ingredient.\
-                    objects.get_or_create(user=user, **ingredient)
-                recipe.ingredients.add(ingredient_obj)
-            recipe.save()
+        tags = validated_data.pop('tags', None)
+        ingredeints = validated_data.pop('ingredients', None)
+        with transaction.atomic():
+            recipe = super().update(instance, validated_data)
+            if self.context.get('replace_related'):
+                self._set_related(recipe, user, tags, ingredeints)
+            else:
+                self._add_related(recipe, user, tags, ingredeints)
         return recipe
 
+    def _add_related(self, recipe, user, tags, ingredients):
+        """Attach tags and ingredients by name, creating missing ones."""
+        if tags:
+            recipe.tags.add(*Tag.objects.get_or_create_by_names(
+                user, [tag['name'] for tag in tags]))
+        if ingredients:
+            recipe.ingredients.add(*Ingredient.objects.get_or_create_by_names(
+                user, [ingredient['name'] for ingredient in ingredients]))
+
+    def _set_related(self, recipe, user, tags, ingredients):
+        """Replace the given relations with the named tags and ingredients.
+
+        The related manager's set() diffs against the current through rows
+        and only inserts added and deletes removed pairs, so a one-tag edit
+        costs a constant number of statements. Relations left out of the
+        payload are kept as they are.
+        """
+        if tags is not None:
+            recipe.tags.set(Tag.objects.get_or_create_by_names(
+                user, [tag['name'] for tag in tags]))
+        if ingredients is not None:
+            recipe.ingredients.set(Ingredient.objects.get_or_create_by_names(
+                user, [ingredient['name'] for ingredient in ingredients]))
+
+
+def group_related(field, recipe_ids):
+    """Return the id and name dicts of a relation by recipe id.
+
+    The through rows of all recipes are read with one joined query
+    ordered by related id, like the prefetch of RecipeQuerySet.
+    """
+    m2m = Recipe._meta.get_field(field)
+    recipe_column = '{}_id'.format(m2m.m2m_field_name())
+    related = m2m.m2m_reverse_field_name()
+    grouped = {}
+    for recipe_id, related_id, name in m2m.remote_field.through.objects \
+            .filter(**{recipe_column + '__in': recipe_ids}) \
+            .order_by(related + '_id') \
+            .values_list(recipe_column, related + '_id', related + '__name'):
+        grouped.setdefault(recipe_id, []).append(
+            {'id': related_id, 'name': name})
+    return grouped
+
+
+class RecipeValuesListSerializer(serializers.ListSerializer):
+    """Read only list serializer of recipe rows fetched with values().
+
+    Produces the RecipeSerializer output without model instances or
+    nested serializers, reading tags and ingredients of the whole list
+    with one query per relation.
+    """
+    def to_representation(self, data):
+        """Return the list of recipe dicts with nested relations."""
+        rows = list(data)
+        if not rows:
+            return []
+        names = self.child.get_field_names()
+        recipe_ids = [row['id'] for row in rows]
+        related = {field: group_related(field, recipe_ids)
+                   for field in self.child.related_fields if field in names}
+        price = self.child.price_field.to_representation
+        return [{
+            name: related[name].get(row['id'], []) if name in related else
+            price(row[name]) if name == 'price' else row[name]
+            for name in names
+        } for row in rows]
+
+
+class RecipeValuesSerializer(serializers.BaseSerializer):
+    """Read only serializer of a recipe row fetched with values()."""
+    value_fields = ['id', 'title', 'time_minutes', 'price', 'link']
+    related_fields = ['tags', 'ingredients']
+    price_field = serializers.DecimalField(max_digits=6, decimal_places=2)
+
+    class Meta:
+        """Meta class for RecipeValuesSerializer."""
+        list_serializer_class = RecipeValuesListSerializer
+
+    def get_field_names(self):
+        """Return the output fields, narrowed to the fields context."""
+        names = self.context.get('fields')
+        return RecipeSerializer.Meta.fields if names is None else names
+
+    def to_representation(self, instance):
+        """Return the recipe dict of a single row."""
+        return RecipeValuesListSerializer(child=self).to_representation(
+            [instance])[0]
+
+
+class RecipeImportSerializer(serializers.ModelSerializer):
+    """Serializer validating one row of a recipe import.
+
+    Tags and ingredients are lists of names. It runs in import worker
+    processes and must not query the database.
+    """
+    user = serializers.IntegerField(required=False)
+    tags = serializers.ListField(
+        child=serializers.CharField(
+            max_length=Tag._meta.get_field('name').max_length),
+        required=False)
+    ingredients = serializers.ListField(
+        child=serializers.CharField(
+            max_length=Ingredient._meta.get_field('name').max_length),
+        required=False)
+
+    class Meta:
+        """Meta class for RecipeImportSerializer."""
+        model = Recipe
+        fields = ['user', 'title', 'description', 'time_minutes', 'price',
+                  'link', 'tags', 'ingredients']
+
 
 class ImageSerializer(serializers.ModelSerializer):
     """Image serializer class."""
@@ -0,0 +1,99 @@
+"""Test for the batched recipe retrieve."""
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag
+from core.response_cache import get_cache
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+BATCH_URL = reverse('recipe:recipe-batch')
+
+
+def get_detail_url(recipe_id):
+    """Return a recipe detail url."""
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+class BatchRetrieveRecipeTest(TestCase):
+    """Test class of retrieving many recipes by id."""
+    def setUp(self):
+        super().setUp()
+        get_cache().clear()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+        tag = Tag.objects.create(user=self.__user, name='Vegan')
+        self.__recipes = []
+        for i in range(3):
+            recipe = Recipe.objects.create(
+                user=self.__user, title='Test title{}'.format(i),
+                description='Test description', time_minutes=10,
+                price='10.50')
+            recipe.tags.add(tag)
+            self.__recipes.append(recipe)
+        other = get_user_model().objects.create_user(
+            name='Other name',
+            email='other@example.com',
+            password='test1234567890'
+        )
+        self.__other = Recipe.objects.create(
+            user=other, title='Other title', time_minutes=10, price='1.00')
+
+    def get_details(self, recipes):
+        """Return the detail responses of recipes."""
+        return [self.__client.get(get_detail_url(recipe.id)).json()
+                for recipe in recipes]
+
+    def test_batch_get(self):
+        """Test recipes are returned in the order of the ids."""
+        recipes = [self.__recipes[2], self.__recipes[0]]
+        ids = ','.join(str(recipe.id) for recipe in recipes + recipes)
+
+        with self.assertNumQueries(3):
+            res = self.__client.get(BATCH_URL, {'ids': ids})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), self.get_details(recipes))
+
+    def test_batch_post(self):
+        """Test a POST body retrieves the user's recipes only."""
+        ids = [recipe.id for recipe in self.__recipes] + \
+            [self.__other.id, 0]
+
+        res = self.__client.post(BATCH_URL, {'ids': ids}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), self.get_details(self.__recipes))
+
+    def test_batch_invalid_ids(self):
+        """Test missing, malformed and too many ids are rejected."""
+        self.assertEqual(self.__client.get(BATCH_URL).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        res = self.__client.get(BATCH_URL, {'ids': '1,a'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        res = self.__client.post(BATCH_URL, {'ids': list(range(1, 1002))},
+                                 format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(RECIPE_DOCUMENTS_ENABLED=True)
+    def test_batch_documents(self):
+        """Test a batch is read from recipe documents in one query."""
+        for recipe in self.__recipes:
+            recipe.save()
+        ids = ','.join(str(recipe.id) for recipe in self.__recipes)
+
+        with self.assertNumQueries(1):
+            res = self.__client.get(BATCH_URL, {'ids': ids,
+                                                'fields': 'id,title'})
+
+        self.assertEqual(res.json(), [
+            {'id': recipe.id, 'title': recipe.title}
+            for recipe in self.__recipes])
@@ -0,0 +1,281 @@
+"""Test for bulk Recipe API actions."""
+from unittest.mock import patch
+
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag, Ingredient
+from core.models.recipe import RecipeQuerySet
+from recipe.views import RecipeView
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+BULK_URL = reverse('recipe:recipe-bulk')
+
+
+def recipe_payload(i, tags=(), ingredients=()):
+    """Return a recipe payload with nested tag and ingredient names."""
+    return {
+        'title': 'Test title{}'.format(i),
+        'time_minutes': 10,
+        'price': 10.50,
+        'tags': [{'name': name} for name in tags],
+        'ingredients': [{'name': name} for name in ingredients],
+    }
+
+
+class BulkCreateRecipeTest(TestCase):
+    """Test class of the batch recipe creation action."""
+    def setUp(self):
+        super().setUp()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+
+    def test_bulk_create_success(self):
+        """Test creating a batch of recipes sharing tags."""
+        Tag.objects.create(user=self.__user, name='Tag1')
+        payload = [
+            recipe_payload(1, ['Tag1', 'Tag2'], ['Salt']),
+            recipe_payload(2, ['Tag2', 'Tag3'], ['Salt', 'Sugar']),
+            recipe_payload(3),
+        ]
+
+        res = self.__client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([item['status'] for item in res.data],
+                         [status.HTTP_201_CREATED] * 3)
+        for item, data in zip(res.data, payload):
+            self.assertEqual(item['data']['title'], data['title'])
+            self.assertEqual(
+                sorted(tag['name'] for tag in item['data']['tags']),
+                sorted(tag['name'] for tag in data['tags']))
+        recipe = Recipe.objects.get(title='Test title2')
+        self.assertEqual(
+            sorted(recipe.ingredients.values_list('name', flat=True)),
+            ['Salt', 'Sugar'])
+        self.assertEqual(Tag.objects.filter(user=self.__user).count(), 3)
+        self.assertEqual(
+            Ingredient.objects.filter(user=self.__user).count(), 2)
+
+    def test_bulk_create_partial_failure(self):
+        """Test invalid and duplicate items are reported per item."""
+        Recipe.objects.create(user=self.__user, title='Test title1',
+                              time_minutes=10, price=10.50)
+        invalid = recipe_payload(2)
+        del invalid['time_minutes']
+        payload = [
+            recipe_payload(1),
+            invalid,
+            recipe_payload(3, ['Tag1']),
+            recipe_payload(3),
+        ]
+
+        res = self.__client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([item['status'] for item in res.data], [
+            status.HTTP_400_BAD_REQUEST,
+            status.HTTP_400_BAD_REQUEST,
+            status.HTTP_201_CREATED,
+            status.HTTP_400_BAD_REQUEST,
+        ])
+        self.assertIn('title', res.data[0]['errors'])
+        self.assertIn('time_minutes', res.data[1]['errors'])
+        self.assertIn('title', res.data[3]['errors'])
+        self.assertEqual(res.data[2]['data']['tags'][0]['name'], 'Tag1')
+        self.assertEqual(Recipe.objects.filter(user=self.__user).count(), 2)
+
+    def test_bulk_create_concurrent_title(self):
+        """Test a title taken after the check is reported for its item."""
+        checks = []
+        reject_taken_titles = RecipeView._reject_taken_titles
+
+        def check_then_insert(view, items, indexes, errors):
+            rejected = reject_taken_titles(view, items, indexes, errors)
+            if not checks:
+                Recipe.objects.create(user=self.__user, title='Test title2',
+                                      time_minutes=10, price=10.50)
+            checks.append(rejected)
+            return rejected
+        payload = [recipe_payload(i, ['Tag{}'.format(i)]) for i in range(4)]
+
+        with patch.object(RecipeView, '_reject_taken_titles', autospec=True,
+                          side_effect=check_then_insert):
+            res = self.__client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(checks, [[], [2]])
+        self.assertEqual([item['status'] for item in res.data], [
+            status.HTTP_201_CREATED,
+            status.HTTP_201_CREATED,
+            status.HTTP_400_BAD_REQUEST,
+            status.HTTP_201_CREATED,
+        ])
+        self.assertIn('title', res.data[2]['errors'])
+        for i in (0, 1, 3):
+            self.assertEqual(res.data[i]['data']['title'],
+                             'Test title{}'.format(i))
+            self.assertEqual(res.data[i]['data']['tags'][0]['name'],
+                             'Tag{}'.format(i))
+        self.assertEqual(Recipe.objects.filter(user=self.__user).count(), 4)
+
+    def test_bulk_create_all_failed(self):
+        """Test a batch without any valid item returns 400."""
+        res = self.__client.post(BULK_URL, [{'title': 'No price'}],
+                                 format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_bulk_create_requires_list(self):
+        """Test a non-list body is rejected."""
+        res = self.__client.post(BULK_URL, recipe_payload(1), format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_query_count_is_constant(self):
+        """Test the batch cost does not depend on the number of items."""
+        payload = [
+            recipe_payload(i, ['Tag{}'.format(i), 'Common'], ['Salt'])
+            for i in range(50)
+        ]
+
+        with self.assertNumQueries(15):
+            res = self.__client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Recipe.objects.filter(user=self.__user).count(), 50)
+
+
+class BulkUpdateRecipeTest(TestCase):
+    """Test class of the batch recipe update action."""
+    def setUp(self):
+        super().setUp()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+        self.__recipes = Recipe.objects.bulk_create([
+            Recipe(user=self.__user, title='Test title{}'.format(i),
+                   time_minutes=10, price=10.50)
+            for i in range(5)
+        ])
+        self.__tag = Tag.objects.create(user=self.__user, name='Tag1')
+        for recipe in self.__recipes[:2]:
+            recipe.tags.add(self.__tag)
+
+    def test_bulk_update_items(self):
+        """Test applying different changes to each recipe."""
+        payload = [
+            {'id': self.__recipes[0].id, 'changes': {'price': 5}},
+            {'id': self.__recipes[1].id,
+             'changes': {'time_minutes': 20, 'tags': [{'name': 'Tag2'}]}},
+        ]
+
+        res = self.__client.patch(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'updated': 2})
+        first, second = (Recipe.objects.get(id=recipe.id)
+                         for recipe in self.__recipes[:2])
+        self.assertEqual(str(first.price), '5.00')
+        self.assertEqual(first.time_minutes, 10)
+        self.assertEqual(second.time_minutes, 20)
+        self.assertEqual(str(second.price), '10.50')
+        self.assertEqual(
+            sorted(second.tags.values_list('name', flat=True)),
+            ['Tag1', 'Tag2'])
+
+    def test_bulk_update_items_keeps_untouched_columns(self):
+        """Test columns an item does not change are not written back."""
+        first, second = self.__recipes[:2]
+        payload = [
+            {'id': first.id, 'changes': {'price': 5}},
+            {'id': second.id, 'changes': {'time_minutes': 20}},
+        ]
+
+        def load_then_write(queryset, *args, **kwargs):
+            recipes = QuerySet.in_bulk(queryset, *args, **kwargs)
+            Recipe.objects.filter(id=second.id).update(price=7)
+            return recipes
+
+        with patch.object(RecipeQuerySet, 'in_bulk', autospec=True,
+                          side_effect=load_then_write):
+            res = self.__client.patch(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        second.refresh_from_db()
+        self.assertEqual(second.time_minutes, 20)
+        self.assertEqual(str(second.price), '7.00')
+
+    def test_bulk_update_items_invalid(self):
+        """Test one invalid item rejects the whole batch."""
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='test1234567890')
+        foreign = Recipe.objects.create(user=other, title='Foreign',
+                                        time_minutes=10, price=10.50)
+        payload = [
+            {'id': self.__recipes[0].id, 'changes': {'price': 5}},
+            {'id': self.__recipes[1].id, 'changes': {'price': 'abc'}},
+            {'id': foreign.id, 'changes': {'price': 5}},
+        ]
+
+        res = self.__client.patch(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('price', res.data[1])
+        self.assertIn('id', res.data[2])
+        self.__recipes[0].refresh_from_db()
+        self.assertEqual(str(self.__recipes[0].price), '10.50')
+
+    def test_bulk_update_filter(self):
+        """Test applying one change set to recipes matching a filter."""
+        payload = {
+            'filter': {'tags': [self.__tag.id]},
+            'changes': {'time_minutes': 30, 'tags': [{'name': 'Tag2'}]},
+        }
+
+        res = self.__client.patch(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'updated': 2})
+        self.assertEqual(
+            list(Recipe.objects.filter(time_minutes=30).order_by('id')),
+            self.__recipes[:2])
+        self.assertEqual(
+            Recipe.objects.filter(tags__name='Tag2').count(), 2)
+
+    def test_bulk_update_filter_all(self):
+        """Test a filter of all ids adds a tag to every recipe of the user."""
+        payload = {'filter': {'ids': [recipe.id for recipe in self.__recipes]},
+                   'changes': {'tags': [{'name': 'Tag1'}]}}
+
+        with self.assertNumQueries(5):
+            res = self.__client.patch(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.data, {'updated': 5})
+        self.assertEqual(self.__tag.recipe_set.count(), 5)
+
+    def test_bulk_update_empty_filter(self):
+        """Test a filter without any known key is rejected."""
+        for recipe_filter in ({}, {'title': 'Test title0'}):
+            payload = {'filter': recipe_filter, 'changes': {'price': 1}}
+
+            res = self.__client.patch(BULK_URL, payload, format='json')
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Recipe.objects.filter(price=1).exists())
@@ -0,0 +1,76 @@
+"""Concurrency tests for nested Recipe writes."""
+import random
+import threading
+
+from django.db import connection
+from django.test import TransactionTestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag, Ingredient
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+RECIPE_URL = reverse('recipe:recipe-list')
+
+WORKERS = 16
+RECIPES_PER_WORKER = 5
+
+
+class RecipeConcurrencyTest(TransactionTestCase):
+    """Stress test of parallel recipe creates sharing new names."""
+    def setUp(self):
+        super().setUp()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+
+    def create_recipes(self, worker, barrier, results):
+        """Post recipes sharing the same new tags in a shuffled order."""
+        client = APIClient()
+        client.force_authenticate(self.__user)
+        rand = random.Random(worker)
+        try:
+            barrier.wait()
+            for i in range(RECIPES_PER_WORKER):
+                tags = ['Tag{}'.format(n) for n in range(8)]
+                ingredients = ['Ingredient{}'.format(n) for n in range(8)]
+                rand.shuffle(tags)
+                rand.shuffle(ingredients)
+                res = client.post(RECIPE_URL, {
+                    'title': 'Title {}-{}'.format(worker, i),
+                    'time_minutes': 10,
+                    'price': 10.50,
+                    'tags': [{'name': name} for name in tags],
+                    'ingredients': [{'name': name} for name in ingredients],
+                }, format='json')
+                results.append(res.status_code)
+        finally:
+            connection.close()
+
+    def test_parallel_creates_with_shared_new_tags(self):
+        """Test parallel creates never fail on the unique constraints."""
+        barrier = threading.Barrier(WORKERS)
+        results = []
+        threads = [
+            threading.Thread(target=self.create_recipes,
+                             args=(worker, barrier, results))
+            for worker in range(WORKERS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [status.HTTP_201_CREATED] *
+                         (WORKERS * RECIPES_PER_WORKER))
+        self.assertEqual(Tag.objects.filter(user=self.__user).count(), 8)
+        self.assertEqual(
+            Ingredient.objects.filter(user=self.__user).count(), 8)
+        for recipe in Recipe.objects.filter(user=self.__user):
+            self.assertEqual(recipe.tags.count(), 8)
+            self.assertEqual(recipe.ingredients.count(), 8)
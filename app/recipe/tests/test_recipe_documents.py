@@ -0,0 +1,171 @@
+"""Test for the recipe documents read model."""
+import tempfile
+from io import BytesIO, StringIO
+
+from django.core.management import call_command, CommandError
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, RecipeDocument, Tag, Ingredient
+from core.response_cache import get_cache
+
+from PIL import Image
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+RECIPE_URL = reverse('recipe:recipe-list')
+BULK_URL = reverse('recipe:recipe-bulk')
+
+
+def get_detail_url(recipe_id):
+    """Return a recipe detail url."""
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+def recipe_payload(i, tags=(), ingredients=()):
+    """Return a recipe payload with nested tag and ingredient names."""
+    return {
+        'title': 'Test title{}'.format(i),
+        'description': 'Test description{}'.format(i),
+        'time_minutes': 10,
+        'price': 10.50,
+        'tags': [{'name': name} for name in tags],
+        'ingredients': [{'name': name} for name in ingredients],
+    }
+
+
+@override_settings(RECIPE_DOCUMENTS_ENABLED=True)
+class RecipeDocumentTest(TestCase):
+    """Test class of maintaining and serving recipe documents."""
+    def setUp(self):
+        super().setUp()
+        get_cache().clear()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+
+    def assertServedLikeRecipes(self, url):
+        """Assert url returns the same data with and without documents."""
+        res = self.__client.get(url)
+        with override_settings(RECIPE_DOCUMENTS_ENABLED=False):
+            get_cache().clear()
+            expected = self.__client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), expected.json())
+        return res
+
+    def test_create_and_serve(self):
+        """Test created recipes are served from their documents."""
+        for i in range(3):
+            self.__client.post(RECIPE_URL,
+                               recipe_payload(i, ['Tag1'], ['Salt']),
+                               format='json')
+        recipe = Recipe.objects.get(title='Test title1')
+
+        self.assertEqual(RecipeDocument.objects.count(), 3)
+        self.assertEqual(
+            RecipeDocument.objects.get(recipe=recipe).data['tags'],
+            [{'id': Tag.objects.get().id, 'name': 'Tag1'}])
+        with self.assertNumQueries(1):
+            self.__client.get(RECIPE_URL)
+        self.assertServedLikeRecipes(RECIPE_URL)
+        self.assertServedLikeRecipes(get_detail_url(recipe.id))
+        self.assertServedLikeRecipes(RECIPE_URL + '?page_size=2')
+
+    def test_writes_rebuild_documents(self):
+        """Test updates, renames and deletes of names rebuild documents."""
+        res = self.__client.post(RECIPE_URL,
+                                 recipe_payload(1, ['Tag1', 'Tag2']),
+                                 format='json')
+        recipe_id = res.data['id']
+        url = get_detail_url(recipe_id)
+
+        self.__client.patch(url, {'title': 'New title',
+                                  'ingredients': [{'name': 'Salt'}]},
+                            format='json')
+        tag = Tag.objects.get(name='Tag1')
+        tag.name = 'Renamed'
+        tag.save()
+        Tag.objects.filter(name='Tag2').delete()
+
+        res = self.assertServedLikeRecipes(url)
+        self.assertEqual(res.data['title'], 'New title')
+        self.assertEqual([tag['name'] for tag in res.data['tags']],
+                         ['Renamed'])
+        self.assertEqual(res.data['ingredients'][0]['name'], 'Salt')
+
+    def test_admin_writes_rebuild_documents(self):
+        """Test relations saved by the admin after the recipe rebuild it."""
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        recipe = Recipe.objects.create(user=self.__user, title='Test title',
+                                       time_minutes=10, price='10.50')
+        tags = [Tag.objects.create(user=self.__user, name=name)
+                for name in ('Tag1', 'Tag2')]
+        salt = Ingredient.objects.create(user=self.__user, name='Salt')
+        client = Client()
+        client.force_login(get_user_model().objects.create_superuser(
+            email='admin@example.com', password='test1234567890'))
+
+        image = BytesIO()
+        Image.new('RGB', (10, 10)).save(image, format='JPEG')
+        image.name = 'image.jpg'
+        image.seek(0)
+        with override_settings(MEDIA_ROOT=media.name):
+            res = client.post(
+                reverse('admin:core_recipe_change', args=[recipe.id]), {
+                    'user': self.__user.id, 'title': 'New title',
+                    'time_minutes': 10, 'price': '10.50',
+                    'tags': [tag.id for tag in tags],
+                    'ingredients': [salt.id], 'image': image})
+
+        self.assertEqual(res.status_code, status.HTTP_302_FOUND)
+        data = RecipeDocument.objects.get(recipe=recipe).data
+        self.assertEqual(data['title'], 'New title')
+        self.assertEqual([tag['name'] for tag in data['tags']],
+                         ['Tag1', 'Tag2'])
+        self.assertEqual([ingredient['name']
+                          for ingredient in data['ingredients']], ['Salt'])
+
+    def test_bulk_writes_rebuild_documents(self):
+        """Test bulk creates and updates rebuild their documents."""
+        res = self.__client.post(BULK_URL, [recipe_payload(i, ['Tag1'])
+                                            for i in range(3)], format='json')
+        self.__client.patch(BULK_URL, {
+            'filter': {'ids': [item['data']['id'] for item in res.data]},
+            'changes': {'tags': [{'name': 'Tag2'}]}}, format='json')
+
+        res = self.assertServedLikeRecipes(RECIPE_URL)
+        self.assertEqual(len(res.data), 3)
+        for recipe in res.data:
+            self.assertEqual([tag['name'] for tag in recipe['tags']],
+                             ['Tag1', 'Tag2'])
+
+    def test_rebuild_and_check_commands(self):
+        """Test the checker finds stale documents and rebuild fixes them."""
+        with override_settings(RECIPE_DOCUMENTS_ENABLED=False):
+            for i in range(2):
+                self.__client.post(RECIPE_URL, recipe_payload(i, ['Tag1']),
+                                   format='json')
+        with self.assertRaises(CommandError):
+            call_command('check_recipe_documents', stdout=StringIO())
+
+        out = StringIO()
+        call_command('rebuild_recipe_documents', stdout=out)
+        self.assertIn('Rebuilt 2', out.getvalue())
+        call_command('check_recipe_documents', stdout=StringIO())
+
+        document = RecipeDocument.objects.first()
+        document.data['title'] = 'Stale title'
+        document.save()
+        out = StringIO()
+        call_command('check_recipe_documents', '--fix', stdout=out)
+        self.assertIn('0 missing, 1 stale', out.getvalue())
+        call_command('check_recipe_documents', stdout=StringIO())
@@ -0,0 +1,134 @@
+"""Test for the recipe exports."""
+import csv
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag, Ingredient
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+EXPORT_URL = reverse('recipe:recipe-export')
+
+
+class RecipeExportTest(TestCase):
+    """Test class of the export action and command."""
+    def setUp(self):
+        super().setUp()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+        self.__tag = Tag.objects.create(user=self.__user, name='Vegan')
+        salt = Ingredient.objects.create(user=self.__user, name='Salt')
+        pepper = Ingredient.objects.create(user=self.__user, name='Pepper')
+        for i in range(3):
+            recipe = Recipe.objects.create(
+                user=self.__user, title='Test title{}'.format(i),
+                description='Line one\nline "two"', time_minutes=10 + i,
+                price='10.50')
+            if i:
+                recipe.tags.add(self.__tag)
+            recipe.ingredients.set([salt, pepper][:i])
+        other = get_user_model().objects.create_user(
+            name='Other name',
+            email='other@example.com',
+            password='test1234567890'
+        )
+        Recipe.objects.create(user=other, title='Other title',
+                              time_minutes=10, price='1.00')
+
+    def test_export_ndjson(self):
+        """Test the user's recipes are exported one per line."""
+        res = self.__client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        self.assertIn('recipes.ndjson', res['Content-Disposition'])
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        recipe = Recipe.objects.get(title='Test title2')
+        self.assertEqual([row['title'] for row in rows],
+                         ['Test title2', 'Test title1', 'Test title0'])
+        self.assertEqual(rows[0], {
+            'id': recipe.id, 'user': self.__user.id, 'title': 'Test title2',
+            'description': 'Line one\nline "two"', 'time_minutes': 12,
+            'price': '10.50', 'link': '',
+            'tags': [{'id': self.__tag.id, 'name': 'Vegan'}],
+            'ingredients': [
+                {'id': ingredient.id, 'name': ingredient.name}
+                for ingredient in recipe.ingredients.order_by('id')],
+        })
+
+    def test_export_csv_filtered(self):
+        """Test a filtered CSV export."""
+        res = self.__client.get(EXPORT_URL, {'output': 'csv',
+                                             'tags': self.__tag.id})
+
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        body = b''.join(res.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual([row['title'] for row in rows],
+                         ['Test title2', 'Test title1'])
+        self.assertEqual(rows[0]['description'], 'Line one\nline "two"')
+        self.assertEqual(rows[0]['ingredients'], 'Salt|Pepper')
+        self.assertEqual(rows[1]['tags'], 'Vegan')
+
+    def test_export_invalid_output(self):
+        """Test an unknown output format is rejected."""
+        res = self.__client.get(EXPORT_URL, {'output': 'xml'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_accept_header(self):
+        """Test the export media types are accepted and pick the output."""
+        res = self.__client.get(EXPORT_URL, {'output': 'ndjson'},
+                                HTTP_ACCEPT='application/x-ndjson')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(len(b''.join(res.streaming_content).splitlines()), 3)
+
+        res = self.__client.get(EXPORT_URL, HTTP_ACCEPT='text/csv')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        self.assertIn('recipes.csv', res['Content-Disposition'])
+        body = b''.join(res.streaming_content).decode()
+        self.assertEqual(len(list(csv.DictReader(io.StringIO(body)))), 3)
+
+        res = self.__client.get(EXPORT_URL, {'output': 'xml'},
+                                HTTP_ACCEPT='text/csv')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res['Content-Type'], 'application/json')
+        self.assertIn('output', res.json())
+
+    def test_export_command(self):
+        """Test the command exports all users or one user in batches."""
+        out = io.StringIO()
+        call_command('export_recipes', batch_size=2, stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(rows), 4)
+        self.assertEqual([row['id'] for row in rows],
+                         sorted(row['id'] for row in rows))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'recipes.csv')
+            call_command('export_recipes', user=self.__user.id,
+                         output='csv', file=path)
+            with open(path, newline='') as export_file:
+                rows = list(csv.DictReader(export_file))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['tags'], '')
@@ -0,0 +1,106 @@
+"""Test for sparse fieldsets and expansion on recipe endpoints."""
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag, Ingredient
+from core.response_cache import get_cache
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+RECIPE_URL = reverse('recipe:recipe-list')
+
+
+def get_detail_url(recipe_id):
+    """Return a recipe detail url."""
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+class RecipeFieldsTest(TestCase):
+    """Test class of the fields and expand query params."""
+    def setUp(self):
+        super().setUp()
+        get_cache().clear()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+        tag = Tag.objects.create(user=self.__user, name='Vegan')
+        ingredient = Ingredient.objects.create(user=self.__user, name='Salt')
+        for i in range(3):
+            self.__recipe = Recipe.objects.create(
+                user=self.__user, title='Pancakes {}'.format(i),
+                description='Fluffy', time_minutes=5 + i, price='1.50')
+            self.__recipe.tags.add(tag)
+            self.__recipe.ingredients.add(ingredient)
+
+    def test_sparse_list(self):
+        """Test a sparse list reads only the requested columns."""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.__client.get(RECIPE_URL,
+                                    {'fields': 'title,time_minutes'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"price"', queries[0]['sql'])
+        self.assertEqual(res.json()[0], {'title': 'Pancakes 2',
+                                         'time_minutes': 7})
+
+    def test_expand_list(self):
+        """Test expand adds only the requested relations."""
+        with self.assertNumQueries(2):
+            res = self.__client.get(RECIPE_URL, {'fields': 'id,price',
+                                                 'expand': 'tags'})
+
+        self.assertEqual(res.json()[0], {
+            'id': self.__recipe.id, 'price': '1.50',
+            'tags': [{'id': Tag.objects.get().id, 'name': 'Vegan'}]})
+
+    def test_sparse_paginated_search(self):
+        """Test sparse fields keep working with search and pagination."""
+        res = self.__client.get(RECIPE_URL, {'fields': 'title',
+                                             'q': 'pancakes',
+                                             'page_size': 2})
+        res = self.__client.get(res.data['next'])
+
+        self.assertEqual(res.json()['results'], [{'title': 'Pancakes 0'}])
+
+    def test_sparse_detail(self):
+        """Test a sparse detail read skips unrequested prefetches."""
+        with self.assertNumQueries(2):
+            res = self.__client.get(get_detail_url(self.__recipe.id),
+                                    {'fields': 'title,description',
+                                     'expand': 'ingredients'})
+
+        self.assertEqual(res.json(), {
+            'title': 'Pancakes 2', 'description': 'Fluffy',
+            'ingredients': [{'id': Ingredient.objects.get().id,
+                             'name': 'Salt'}]})
+
+    def test_unknown_fields(self):
+        """Test unknown field names are rejected."""
+        res = self.__client.get(RECIPE_URL, {'fields': 'title,secret'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', res.data)
+
+        res = self.__client.get(RECIPE_URL, {'expand': 'title'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(RECIPE_DOCUMENTS_ENABLED=True)
+    def test_sparse_documents(self):
+        """Test sparse reads served from recipe documents."""
+        self.__recipe.save()
+
+        res = self.__client.get(get_detail_url(self.__recipe.id),
+                                {'fields': 'title', 'expand': 'tags'})
+
+        self.assertEqual(res.json(), {
+            'title': 'Pancakes 2',
+            'tags': [{'id': Tag.objects.get().id, 'name': 'Vegan'}]})
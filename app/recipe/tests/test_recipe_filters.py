@@ -0,0 +1,138 @@
+"""Test for filtering recipes by tags and ingredients."""
+from io import StringIO
+
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag, Ingredient
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+RECIPE_URL = reverse('recipe:recipe-list')
+
+
+class RecipeFilterTest(TestCase):
+    """Test class of the tags and ingredients list filters."""
+    def setUp(self):
+        super().setUp()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+        self.__tags = Tag.objects.bulk_create([
+            Tag(user=self.__user, name='Tag{}'.format(i)) for i in range(3)
+        ])
+        self.__salt = Ingredient.objects.create(user=self.__user,
+                                                name='Salt')
+        self.__recipes = Recipe.objects.bulk_create([
+            Recipe(user=self.__user, title='Test title{}'.format(i),
+                   time_minutes=10, price=10.50)
+            for i in range(4)
+        ])
+        self.__recipes[0].tags.set(self.__tags[:2])
+        self.__recipes[1].tags.set(self.__tags[1:])
+        self.__recipes[2].tags.set(self.__tags)
+        self.__recipes[2].ingredients.add(self.__salt)
+
+    def get_titles(self, params):
+        """Return the titles of the recipes listed with params."""
+        res = self.__client.get(RECIPE_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return sorted(recipe['title'] for recipe in res.data)
+
+    def test_filter_tags_any(self):
+        """Test listing recipes having any of the tags."""
+        params = {'tags': '{},{}'.format(self.__tags[0].id,
+                                         self.__tags[2].id)}
+
+        self.assertEqual(self.get_titles(params),
+                         ['Test title0', 'Test title1', 'Test title2'])
+
+    def test_filter_tags_all(self):
+        """Test listing recipes having all of the tags."""
+        params = {
+            'tags': '{},{}'.format(self.__tags[1].id, self.__tags[2].id),
+            'match': 'all',
+        }
+
+        self.assertEqual(self.get_titles(params),
+                         ['Test title1', 'Test title2'])
+
+    def test_filter_tags_and_ingredients(self):
+        """Test tags and ingredients filters are combined."""
+        params = {
+            'tags': str(self.__tags[0].id),
+            'ingredients': str(self.__salt.id),
+        }
+
+        self.assertEqual(self.get_titles(params), ['Test title2'])
+
+    def test_filter_other_user_tags(self):
+        """Test tags of another user do not match any recipe."""
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='test1234567890')
+        recipe = Recipe.objects.create(user=other, title='Other',
+                                       time_minutes=10, price=10.50)
+        recipe.tags.add(self.__tags[0])
+
+        self.assertEqual(self.get_titles({'tags': self.__tags[0].id}),
+                         ['Test title0', 'Test title2'])
+
+    def test_filter_invalid_ids(self):
+        """Test non integer ids are rejected."""
+        res = self.__client.get(RECIPE_URL, {'tags': '1,a'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filter_is_one_query(self):
+        """Test the all filter runs as a single grouped semi-join."""
+        params = {
+            'tags': ','.join(str(tag.id) for tag in self.__tags),
+            'match': 'all',
+        }
+        with self.assertNumQueries(3):
+            self.__client.get(RECIPE_URL, params)
+
+
+class BenchmarkRecipeFiltersTest(TestCase):
+    """Test the recipe filters benchmark command."""
+    def test_benchmark_rolls_back(self):
+        """Test a small benchmark run leaves no data behind."""
+        out = StringIO()
+
+        call_command('benchmark_recipe_filters', recipes=50, tags=5,
+                     ingredients=5, repeat=1, stdout=out)
+
+        self.assertIn('tags all x2', out.getvalue())
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_benchmark_queries_every_repeat(self):
+        """Test every timed request runs the list query uncached."""
+        with CaptureQueriesContext(connection) as queries:
+            call_command('benchmark_recipe_filters', recipes=20, tags=5,
+                         ingredients=5, repeat=3, stdout=StringIO())
+
+        lists = [query for query in queries.captured_queries
+                 if query['sql'].startswith('SELECT "core_recipe"."id"')]
+        self.assertEqual(len(lists), 7 * 3)
+
+    def test_benchmark_without_indexes_cannot_keep(self):
+        """Test dropped indexes are never committed."""
+        with self.assertRaisesMessage(CommandError, '--without-indexes'):
+            call_command('benchmark_recipe_filters', recipes=1,
+                         without_indexes=True, keep=True, stdout=StringIO())
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT count(*) FROM pg_indexes WHERE indexname '
+                           "IN ('core_recipe_tags_tag_recipe_idx', "
+                           "'core_recipe_ingredients_ingredient_recipe_idx')")
+            self.assertEqual(cursor.fetchone()[0], 2)
@@ -0,0 +1,147 @@
+"""Test for the recipe import command."""
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag, Ingredient
+from core.response_cache import get_cache
+
+from rest_framework.test import APIClient
+
+
+RECIPE_URL = reverse('recipe:recipe-list')
+
+
+class ImportRecipesCommandTest(TestCase):
+    """Test class of importing recipe dumps."""
+    def setUp(self):
+        super().setUp()
+        get_cache().clear()
+        self.__dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.__dir.cleanup)
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+
+    def write_dump(self, name, text):
+        """Write a dump file and return its path."""
+        path = os.path.join(self.__dir.name, name)
+        with open(path, 'w', newline='') as dump:
+            dump.write(text)
+        return path
+
+    def import_recipes(self, *args, **options):
+        """Run the import command and return its output."""
+        out = StringIO()
+        call_command('import_recipes', *args, stdout=out, stderr=StringIO(),
+                     **options)
+        return out.getvalue()
+
+    def test_round_trip_from_export(self):
+        """Test an export of one user imports as the same recipes."""
+        other = get_user_model().objects.create_user(
+            name='Other name',
+            email='other@example.com',
+            password='test1234567890'
+        )
+        client = APIClient()
+        client.force_authenticate(other)
+        for i in range(3):
+            client.post(RECIPE_URL, {
+                'title': 'Soup\t{}'.format(i),
+                'description': 'Hot\nsoup \\ {}'.format(i),
+                'time_minutes': 10 + i, 'price': '1.25',
+                'link': 'https://example.com/{}'.format(i) if i else '',
+                'tags': [{'name': 'Tag{}'.format(j)} for j in range(i)],
+                'ingredients': [{'name': 'Salt'}],
+            }, format='json')
+        for output in ('ndjson', 'csv'):
+            export = os.path.join(self.__dir.name, 'recipes.' + output)
+            call_command('export_recipes', user=other.id, output=output,
+                         file=export)
+            before = self.__client.get(RECIPE_URL).json()
+
+            self.import_recipes(export, user=self.__user.id, workers=2,
+                                batch_size=2)
+
+            def strip_ids(recipes):
+                return sorted(
+                    [{**recipe, 'id': None,
+                      'tags': [tag['name'] for tag in recipe['tags']],
+                      'ingredients': [ingredient['name'] for ingredient
+                                      in recipe['ingredients']]}
+                     for recipe in recipes], key=lambda r: r['title'])
+
+            res = self.__client.get(RECIPE_URL)
+            self.assertEqual(strip_ids(res.json()),
+                             strip_ids(client.get(RECIPE_URL).json()))
+            self.assertEqual(len(before), 0 if output == 'ndjson' else 3)
+        self.assertEqual(Recipe.objects.filter(user=self.__user).count(), 3)
+        res = self.__client.get(RECIPE_URL, {'q': 'soup'})
+        self.assertEqual(len(res.json()), 3)
+
+    def test_constraints_and_names(self):
+        """Test existing titles are skipped and names are reused."""
+        Recipe.objects.create(user=self.__user, title='Existing',
+                              time_minutes=1, price='1.00')
+        tag = Tag.objects.create(user=self.__user, name='Vegan')
+        rows = [
+            {'title': 'Existing', 'time_minutes': 5, 'price': '2.00'},
+            {'title': 'Salad', 'time_minutes': 5, 'price': '2.00',
+             'tags': ['Vegan', 'Quick', 'Quick'],
+             'ingredients': [{'id': 99, 'name': 'Oil'}]},
+            {'title': 'Salad', 'time_minutes': 9, 'price': '3.00',
+             'tags': ['Other']},
+            {'user': self.__user.id, 'title': 'Bread',
+             'time_minutes': 60, 'price': '0.75', 'tags': ['Quick']},
+        ]
+        path = self.write_dump('recipes.ndjson', '\n'.join(
+            json.dumps(row) for row in rows) + '\n\n')
+
+        out = self.import_recipes(path, user=self.__user.id, workers=1)
+
+        self.assertIn('Imported 2 recipes', out)
+        self.assertIn('2 skipped', out)
+        salad = Recipe.objects.get(title='Salad')
+        self.assertEqual(salad.time_minutes, 5)
+        self.assertEqual(sorted(salad.tags.values_list('name', flat=True)),
+                         ['Quick', 'Vegan'])
+        self.assertIn(tag, salad.tags.all())
+        self.assertEqual(list(Ingredient.objects.values_list(
+            'name', flat=True)), ['Oil'])
+        self.assertEqual(Tag.objects.filter(name='Quick').count(), 1)
+        self.assertFalse(Tag.objects.filter(name='Other').exists())
+        self.assertGreater(Recipe.objects.get(title='Bread').id, salad.id)
+
+    def test_invalid_rows(self):
+        """Test invalid rows abort the import unless they are skipped."""
+        path = self.write_dump('recipes.csv', (
+            'title,time_minutes,price,user,tags\n'
+            'Good,5,1.00,{0},A|B\n'
+            ',5,1.00,{0},\n'
+            'Bad price,5,abc,{0},\n'
+            'No user,5,1.00,,\n'
+            'Unknown user,5,1.00,0,\n'
+            'Short row\n').format(self.__user.id))
+
+        with self.assertRaisesMessage(CommandError, '5 invalid rows'):
+            self.import_recipes(path)
+        self.assertFalse(Recipe.objects.exists())
+
+        out = self.import_recipes(path, skip_invalid=True, workers=1)
+
+        self.assertIn('Imported 1 recipes', out)
+        self.assertIn('5 invalid', out)
+        self.assertEqual(
+            list(Recipe.objects.get().tags.values_list('name', flat=True)),
+            ['A', 'B'])
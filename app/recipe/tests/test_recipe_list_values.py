@@ -0,0 +1,87 @@
+"""Test for the values() based recipe list serialization."""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag, Ingredient
+from core.response_cache import get_cache
+from recipe.serializer import RecipeSerializer, RecipeValuesSerializer
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+RECIPE_URL = reverse('recipe:recipe-list')
+
+
+class RecipeValuesSerializerTest(TestCase):
+    """Test class of the fast read only list path."""
+    def setUp(self):
+        super().setUp()
+        get_cache().clear()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+        tags = [Tag.objects.create(user=self.__user, name=name)
+                for name in ['Vegan', 'Dessert', 'Quick']]
+        ingredients = [Ingredient.objects.create(user=self.__user, name=name)
+                       for name in ['Salt', 'Sugar']]
+        prices = ['0.50', '10', '1234.56', '99.9']
+        for i, price in enumerate(prices):
+            recipe = Recipe.objects.create(
+                user=self.__user, title='Pancakes {}'.format(i),
+                description='Fluffy', time_minutes=5 + i, price=price,
+                link='https://example.com/{}'.format(i) if i % 2 else '')
+            recipe.tags.set(tags[i % 3:])
+            recipe.ingredients.set(ingredients[:i % 3])
+
+    def test_parity_with_model_serializer(self):
+        """Test the values() path returns the RecipeSerializer output."""
+        queryset = Recipe.objects.filter(user=self.__user).order_by('-id')
+
+        expected = RecipeSerializer(queryset.with_related(), many=True).data
+        data = RecipeValuesSerializer(
+            queryset.values(*RecipeValuesSerializer.value_fields),
+            many=True).data
+
+        self.assertEqual(data, expected)
+        self.assertEqual(
+            RecipeValuesSerializer(queryset.values(
+                *RecipeValuesSerializer.value_fields).first()).data,
+            expected[0])
+
+    def test_list_views_use_values(self):
+        """Test plain, searched and paginated lists keep their shape."""
+        expected = RecipeSerializer(
+            Recipe.objects.order_by('-id').with_related(), many=True).data
+
+        with self.assertNumQueries(3):
+            res = self.__client.get(RECIPE_URL)
+        self.assertEqual(res.json(), expected)
+
+        res = self.__client.get(RECIPE_URL, {'q': 'pancakes',
+                                             'page_size': 2})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()['results'], expected[:2])
+        res = self.__client.get(res.data['next'])
+        self.assertEqual(res.json()['results'], expected[2:])
+
+
+class BenchmarkRecipeListCommandTest(TestCase):
+    """Test the recipe list benchmark command."""
+    def test_benchmark_rolls_back(self):
+        """Test a small benchmark run compares both paths."""
+        out = StringIO()
+
+        call_command('benchmark_recipe_list', recipes=50, tags=5,
+                     ingredients=5, repeat=1, stdout=out)
+
+        self.assertIn('Speedup', out.getvalue())
+        self.assertFalse(Recipe.objects.exists())
@@ -0,0 +1,186 @@
+"""Query count regression tests for Recipe API."""
+import tempfile
+
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag, Ingredient
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from PIL import Image
+
+
+RECIPE_URL = reverse('recipe:recipe-list')
+
+
+def get_detail_url(recipe_id):
+    """Return a recipe detail url."""
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+def get_image_upload_url(recipe_id):
+    """Return a recipe upload image url."""
+    return reverse('recipe:recipe-upload-image', args=[recipe_id])
+
+
+def create_recipes(user, count, tag_count=3, ingredient_count=3):
+    """Create recipes with tags and ingredients, returning the recipes."""
+    tags = Tag.objects.bulk_create([
+        Tag(user=user, name='Tag{}'.format(i)) for i in range(tag_count)
+    ])
+    ingredients = Ingredient.objects.bulk_create([
+        Ingredient(user=user, name='Ingredient{}'.format(i))
+        for i in range(ingredient_count)
+    ])
+    recipes = Recipe.objects.bulk_create([
+        Recipe(
+            user=user,
+            title='Test title{}'.format(i),
+            description='Test description{}'.format(i),
+            time_minutes=10,
+            price=10.50,
+        ) for i in range(count)
+    ])
+    for recipe in recipes:
+        recipe.tags.set(tags)
+        recipe.ingredients.set(ingredients)
+    return recipes
+
+
+class RecipeQueryCountTest(TestCase):
+    """Pin the number of queries issued by every recipe action."""
+    def setUp(self):
+        super().setUp()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+
+    def test_list_is_constant(self):
+        """Test listing recipes does not depend on the number of rows."""
+        create_recipes(self.__user, 1)
+        with self.assertNumQueries(3):
+            res = self.__client.get(RECIPE_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        Recipe.objects.bulk_create([
+            Recipe(user=self.__user, title='Bulk title{}'.format(i),
+                   time_minutes=5, price=1)
+            for i in range(20)
+        ])
+        with self.assertNumQueries(3):
+            res = self.__client.get(RECIPE_URL)
+        self.assertEqual(len(res.data), 21)
+
+    def test_list_empty(self):
+        """Test listing no recipes skips the prefetch queries."""
+        with self.assertNumQueries(1):
+            res = self.__client.get(RECIPE_URL)
+        self.assertEqual(res.data, [])
+
+    def test_retrieve(self):
+        """Test retrieving a recipe with nested data."""
+        recipe = create_recipes(self.__user, 1)[0]
+        with self.assertNumQueries(3):
+            res = self.__client.get(get_detail_url(recipe.id))
+        self.assertEqual(len(res.data['tags']), 3)
+        self.assertEqual(len(res.data['ingredients']), 3)
+
+    def test_create(self):
+        """Test creating a recipe with nested tags and ingredients."""
+        payload = {
+            'title': 'Test title',
+            'time_minutes': 10,
+            'price': 10.50,
+            'tags': [{'name': 'Tag{}'.format(i)} for i in range(3)],
+            'ingredients': [{'name': 'Salt'}, {'name': 'Sugar'}],
+        }
+        with self.assertNumQueries(13):
+            res = self.__client.post(RECIPE_URL, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_create_is_constant(self):
+        """Test nested writes do not depend on the number of items."""
+        create_recipes(self.__user, 0, tag_count=10)
+        payload = {
+            'title': 'Test title',
+            'time_minutes': 10,
+            'price': 10.50,
+            'tags': [{'name': 'Tag{}'.format(i)} for i in range(20)],
+            'ingredients': [{'name': 'Ingredient{}'.format(i)}
+                            for i in range(30)],
+        }
+        with self.assertNumQueries(13):
+            res = self.__client.post(RECIPE_URL, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data['tags']), 20)
+        self.assertEqual(len(res.data['ingredients']), 30)
+        self.assertEqual(Tag.objects.filter(user=self.__user).count(), 20)
+
+    def test_partial_update(self):
+        """Test patching a recipe with nested tags."""
+        recipe = create_recipes(self.__user, 1)[0]
+        payload = {
+            'price': 11.50,
+            'tags': [{'name': 'Tag0'}, {'name': 'New tag'}],
+        }
+        with self.assertNumQueries(10):
+            res = self.__client.patch(get_detail_url(recipe.id), payload,
+                                      format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_partial_update_replace_is_constant(self):
+        """Test replacing one of many tags costs a constant number."""
+        recipe = create_recipes(self.__user, 1, tag_count=30)[0]
+        payload = {
+            'tags': [{'name': 'Tag{}'.format(i)} for i in range(1, 30)] +
+            [{'name': 'New tag'}],
+        }
+        with self.assertNumQueries(12):
+            res = self.__client.patch(
+                get_detail_url(recipe.id) + '?m2m=replace', payload,
+                format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['tags']), 30)
+        self.assertFalse(recipe.tags.filter(name='Tag0').exists())
+
+    def test_update(self):
+        """Test updating a recipe with full data."""
+        recipe = create_recipes(self.__user, 1)[0]
+        payload = {
+            'title': 'Test new title',
+            'time_minutes': 11,
+            'price': 11.50,
+            'ingredients': [{'name': 'Ingredient0'}, {'name': 'Pepper'}],
+        }
+        with self.assertNumQueries(10):
+            res = self.__client.put(get_detail_url(recipe.id), payload,
+                                    format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_destroy(self):
+        """Test deleting a recipe and its document."""
+        recipe = create_recipes(self.__user, 1)[0]
+        with self.assertNumQueries(5):
+            res = self.__client.delete(get_detail_url(recipe.id))
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_upload_image(self):
+        """Test uploading an image does not touch the m2m tables."""
+        recipe = create_recipes(self.__user, 1)[0]
+        with tempfile.NamedTemporaryFile(suffix='.jpg') as image_file:
+            Image.new('RGB', (10, 10)).save(image_file, format='JPEG')
+            image_file.seek(0)
+            with self.assertNumQueries(2):
+                res = self.__client.post(get_image_upload_url(recipe.id),
+                                         {'image': image_file},
+                                         format='multipart')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        recipe.refresh_from_db()
+        recipe.image.delete()
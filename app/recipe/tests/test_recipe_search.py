@@ -0,0 +1,91 @@
+"""Test for full-text search of recipes."""
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+RECIPE_URL = reverse('recipe:recipe-list')
+
+
+def get_detail_url(recipe_id):
+    """Return a recipe detail url."""
+    return reverse('recipe:recipe-detail', args=[recipe_id])
+
+
+class RecipeSearchTest(TestCase):
+    """Test class of the q search on recipe list."""
+    def setUp(self):
+        super().setUp()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+        recipes = [
+            ('Tomato soup', 'A warm soup of roasted tomatoes.'),
+            ('Garlic bread', 'Bread with butter, garlic and tomatoes.'),
+            ('Pancakes', 'Fluffy breakfast pancakes.'),
+            ('Tomato salad', 'Sliced tomato with basil and tomato juice.'),
+        ]
+        Recipe.objects.bulk_create([
+            Recipe(user=self.__user, title=title, description=description,
+                   time_minutes=10, price=10.50)
+            for title, description in recipes
+        ])
+
+    def search(self, params):
+        """Return the titles found by a search request."""
+        res = self.__client.get(RECIPE_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [recipe['title'] for recipe in res.data]
+
+    def test_search_ranked(self):
+        """Test title matches rank above description matches."""
+        titles = self.search({'q': 'tomatoes'})
+
+        self.assertEqual(len(titles), 3)
+        self.assertEqual(titles[-1], 'Garlic bread')
+        self.assertNotIn('Pancakes', titles)
+
+    def test_search_websearch_syntax(self):
+        """Test the query accepts web search operators."""
+        titles = self.search({'q': 'tomato -salad'})
+
+        self.assertEqual(sorted(titles), ['Garlic bread', 'Tomato soup'])
+
+    def test_search_scoped_to_user(self):
+        """Test recipes of other users are not found."""
+        other = get_user_model().objects.create_user(
+            email='other@example.com', password='test1234567890')
+        Recipe.objects.create(user=other, title='Pancakes deluxe',
+                              time_minutes=10, price=10.50)
+
+        self.assertEqual(self.search({'q': 'pancakes'}), ['Pancakes'])
+
+    def test_search_vector_follows_updates(self):
+        """Test the search vector is maintained on update."""
+        recipe = Recipe.objects.get(title='Pancakes')
+        self.__client.patch(get_detail_url(recipe.id),
+                            {'description': 'Served with tomato jam.'})
+
+        self.assertIn('Pancakes', self.search({'q': 'jam'}))
+
+    def test_search_paginated_by_rank(self):
+        """Test walking search pages keeps the relevance order."""
+        expected = self.search({'q': 'tomato'})
+        titles = []
+        res = self.__client.get(RECIPE_URL, {'q': 'tomato', 'page_size': 1})
+        while True:
+            titles += [recipe['title'] for recipe in res.data['results']]
+            if not res.data['next']:
+                break
+            res = self.__client.get(res.data['next'])
+
+        self.assertEqual(titles, expected)
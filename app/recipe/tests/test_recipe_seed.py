@@ -0,0 +1,72 @@
+"""Test for the benchmark data seed command."""
+from io import StringIO
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag, Ingredient
+
+
+class SeedBenchmarkDataCommandTest(TestCase):
+    """Test class of seeding benchmark data."""
+    def seed(self, prefix, **options):
+        """Run the seed command and return the seeded users."""
+        options = {'users': 5, 'recipes': 60, 'tags': 4, 'ingredients': 6,
+                   'tags_per_recipe': 2, 'ingredients_per_recipe': 3,
+                   'batch_size': 25, 'seed': 7, **options}
+        call_command('seed_benchmark_data', prefix=prefix, stdout=StringIO(),
+                     **options)
+        return list(get_user_model().objects.filter(
+            email__startswith=prefix + '-').order_by('id'))
+
+    def describe(self, users):
+        """Return the recipes of users with their names, by user rank."""
+        return [
+            [(recipe.title.split(' ', 1)[1], recipe.description,
+              recipe.time_minutes, recipe.price,
+              sorted(tag.name for tag in recipe.tags.all()),
+              sorted(ingredient.name
+                     for ingredient in recipe.ingredients.all()))
+             for recipe in Recipe.objects.filter(user=user).order_by('id')
+             .prefetch_related('tags', 'ingredients')]
+            for user in users]
+
+    def test_seed_dataset(self):
+        """Test the volumes, skew and determinism of the dataset."""
+        first = self.seed('one', password='test1234567890')
+        second = self.seed('two')
+
+        self.assertEqual(len(first), 5)
+        self.assertTrue(first[0].check_password('test1234567890'))
+        self.assertFalse(second[0].has_usable_password())
+        self.assertEqual(Recipe.objects.filter(user__in=first).count(), 60)
+        self.assertEqual(Tag.objects.filter(user=first[0]).count(), 4)
+        self.assertEqual(Ingredient.objects.filter(user=first[4]).count(), 6)
+        counts = [Recipe.objects.filter(user=user).count() for user in first]
+        self.assertEqual(counts[0], max(counts))
+        self.assertGreater(counts[0], counts[4])
+        self.assertFalse(Recipe.objects.filter(
+            user=first[1], tags__user=first[0]).exists())
+        self.assertEqual(self.describe(first), self.describe(second))
+        self.assertNotEqual(self.describe(first),
+                            self.describe(self.seed('three', seed=8)))
+
+    def test_uniform_without_relations(self):
+        """Test zero names or fan-out leave recipes without relations."""
+        users = self.seed('flat', skew=0, tags=0, ingredients_per_recipe=0)
+
+        self.assertEqual(Recipe.objects.filter(user__in=users).count(), 60)
+        self.assertFalse(Recipe.tags.through.objects.exists())
+        self.assertFalse(Recipe.ingredients.through.objects.exists())
+        self.assertFalse(Tag.objects.exists())
+        self.assertEqual(Ingredient.objects.count(), 30)
+
+    def test_prefix_in_use(self):
+        """Test seeding again with the same prefix is refused."""
+        self.seed('one', recipes=1)
+
+        with self.assertRaisesMessage(CommandError, 'already exist'):
+            self.seed('one')
+        with self.assertRaisesMessage(CommandError, 'at least 1'):
+            self.seed('empty', users=0)
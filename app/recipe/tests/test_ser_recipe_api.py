@@ -247,6 +247,20 @@ class PrivateSerializerTest(TestCase):
                 self.assertEqual(serializer.data[k_orig],
                                  serializer_check.data[k_check])
 
+    def test_update_response_orders_tags_by_id(self):
+        """Test nested tags of a write response come in id order."""
+        Tag.objects.create(user=self.__user, name='Zed')
+        res = self.__client.post(RECIPE_URL, {
+            'title': 'Test title', 'time_minutes': 10, 'price': 10.50,
+            'tags': [{'name': 'Alpha'}]}, format='json')
+
+        res = self.__client.patch(get_detail_url(res.data['id']),
+                                  {'tags': [{'name': 'Zed'}]}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([tag['name'] for tag in res.data['tags']],
+                         ['Zed', 'Alpha'])
+
     def test_update_full_recipe_with_new_tags_fail(self):
         """Test to update a recipe with full data to be fail."""
         recipe_data = {
@@ -440,6 +454,59 @@ class PrivateSerializerTest(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
 
+    def test_update_recipe_replace_tags_success(self):
+        """Test to replace recipe tags and ingredients on update."""
+        recipe_data = {
+            'title': 'Test title',
+            'time_minutes': 10,
+            'price': 10.50,
+            'tags': [{'name': 'Tag1'}, {'name': 'Tag2'}],
+            'ingredients': [{'name': 'Salt'}, {'name': 'Sugar'}]
+        }
+        new_recipe_data = {
+            'tags': [{'name': 'Tag2'}, {'name': 'Tag3'}],
+            'ingredients': []
+        }
+
+        res_create = self.__client.post(RECIPE_URL, recipe_data,
+                                        format='json')
+        res = self.__client.patch(
+            get_detail_url(res_create.data['id']) + '?m2m=replace',
+            new_recipe_data, format='json')
+
+        recipe = Recipe.objects.get(id=res_create.data['id'])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(tag['name'] for tag in res.data['tags']),
+                         ['Tag2', 'Tag3'])
+        self.assertEqual(res.data['ingredients'], [])
+        self.assertEqual(
+            sorted(recipe.tags.values_list('name', flat=True)),
+            ['Tag2', 'Tag3'])
+        self.assertFalse(recipe.ingredients.exists())
+        self.assertTrue(Tag.objects.filter(name='Tag1').exists())
+
+    def test_update_recipe_replace_keeps_omitted_relations(self):
+        """Test replacing tags leaves ingredients out of the payload."""
+        recipe_data = {
+            'title': 'Test title',
+            'time_minutes': 10,
+            'price': 10.50,
+            'tags': [{'name': 'Tag1'}],
+            'ingredients': [{'name': 'Salt'}]
+        }
+
+        res_create = self.__client.post(RECIPE_URL, recipe_data,
+                                        format='json')
+        res = self.__client.patch(
+            get_detail_url(res_create.data['id']) + '?m2m=replace',
+            {'tags': [{'name': 'Tag2'}]}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([tag['name'] for tag in res.data['tags']], ['Tag2'])
+        self.assertEqual([ingredient['name']
+                          for ingredient in res.data['ingredients']],
+                         ['Salt'])
+
 
 class ImageUploadTest(TestCase):
     """Test class for recipe image upload."""
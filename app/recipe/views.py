@@ -1,37 +1,194 @@
 """View module for Recipe."""
 from .serializer import (
-    RecipeDetailSerializer, RecipeSerializer, ImageSerializer
+    RecipeSerializer, RecipeDetailSerializer, ImageSerializer,
+    RecipeBulkUpdateItemSerializer, RecipeBulkFilterSerializer,
+    RecipeIdsSerializer, RecipeValuesSerializer
+)
+from .documents import (
+    RecipeDocumentSerializer, RecipeListDocumentSerializer,
+    collect_documents, documents_enabled
+)
+from .exports import EXPORT_FORMATS, iter_export
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import IntegrityError
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from django.http import StreamingHttpResponse
+
+from core.models import Recipe, RecipeDocument
+from core.filters import params_to_ints
+from core.models.recipe import SEARCH_CONFIG
+from core.response_cache import ListCacheMixin
+from core.streaming import StreamingListMixin
+from core.versions import ConditionalGetMixin
+from core.pagination import RecipeCursorPagination
+from core.renderers import CSVRenderer, DownloadRenderer, NDJSONRenderer
+from user.authentication import (
+    CachedTokenAuthentication, SignedTokenAuthentication
 )
-from core.models import Recipe
 
 from rest_framework import (
-    viewsets, authentication, permissions,
+    viewsets, permissions,
     status, response
 )
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+
+def _params_to_names(query_params, name, choices):
+    """Return the comma separated names of a query param among choices."""
+    value = query_params.get(name)
+    if not value:
+        return []
+    names = value.split(',')
+    unknown = [field for field in names if field not in choices]
+    if unknown:
+        raise ValidationError({name: ['Unknown fields: {}.'.format(
+            ', '.join(unknown))]})
+    return names
 
 
-class RecipeView(viewsets.ModelViewSet):
+class RecipeView(ConditionalGetMixin, StreamingListMixin, ListCacheMixin,
+                 viewsets.ModelViewSet):
     """Recipe view."""
     serializer_class = RecipeDetailSerializer
     queryset = Recipe.objects.all()
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication,
+                              SignedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = RecipeCursorPagination
+    bulk_max_items = 1000
+
+    def use_documents(self):
+        """Return True if the request is served from recipe documents.
+
+        Plain list and detail reads come from the documents table alone,
+        while filtered and searched lists still need the recipe rows.
+        """
+        return documents_enabled() and \
+            self.action in ('list', 'retrieve', 'batch_retrieve') and \
+            not any(param in self.request.query_params
+                    for param in ('q', 'tags', 'ingredients'))
+
+    def get_requested_fields(self):
+        """Return the output fields of a sparse list or detail read.
+
+        fields takes comma separated field names and expand adds the
+        nested tags and ingredients to them. Returns None, meaning every
+        field, when fields is not given or for other actions.
+        """
+        if self.action == 'list':
+            choices = RecipeSerializer.Meta.fields
+        elif self.action in ('retrieve', 'batch_retrieve'):
+            choices = RecipeDetailSerializer.Meta.fields
+        else:
+            return None
+        params = self.request.query_params
+        names = _params_to_names(params, 'fields', choices)
+        names += _params_to_names(params, 'expand',
+                                  RecipeValuesSerializer.related_fields)
+        if 'fields' not in params:
+            return None
+        return [name for name in choices if name in names]
 
     def get_queryset(self):
-        """Get recipes object data."""
+        """Get recipes object data.
+
+        Sparse reads load only the requested columns and prefetch only
+        the requested relations.
+        """
+        if self.use_documents():
+            return RecipeDocument.objects.filter(
+                user=self.request.user).order_by('-recipe_id')
         data = self.queryset.filter(user=self.request.user).order_by('-id')
+        fields = self.get_requested_fields()
+        if fields is None:
+            data = data.defer('search_vector')
+            columns = RecipeValuesSerializer.value_fields
+            related = RecipeValuesSerializer.related_fields
+        else:
+            related = [name for name in fields
+                       if name in RecipeValuesSerializer.related_fields]
+            columns = ['id'] + [name for name in fields
+                                if name not in related and name != 'id']
+            data = data.only(*columns)
+        if self.action in ('list', 'export'):
+            data = self._search(self._filter_related(data))
+        if self.action == 'list':
+            return data.values(*columns, *data.query.annotations)
+        if self.action in ('retrieve', 'batch_retrieve', 'bulk_create'):
+            data = data.with_related(related)
         return data
 
+    def _filter_related(self, queryset):
+        """Filter recipes by the tags and ingredients query params.
+
+        Both params take comma separated ids. Recipes having any of them
+        are returned, or only recipes having all of them with match=all.
+        """
+        match_all = self.request.query_params.get('match') == 'all'
+        for field in ('tags', 'ingredients'):
+            ids = params_to_ints(self.request.query_params, field)
+            if ids:
+                queryset = queryset.filter_related(field, ids, match_all)
+        return queryset
+
+    def _search(self, queryset):
+        """Full-text search recipes with the q query param.
+
+        Matches use the GIN indexed search_vector column, and results are
+        ranked by relevance. The rank is cast to double precision so that
+        it round-trips exactly through pagination cursors.
+        """
+        search = self.request.query_params.get('q')
+        if not search:
+            return queryset
+        query = SearchQuery(search, config=SEARCH_CONFIG,
+                            search_type='websearch')
+        return queryset.filter(search_vector=query).annotate(
+            rank=Cast(SearchRank(F('search_vector'), query), FloatField())
+        ).order_by('-rank', '-id')
+
+    def get_cursor_ordering(self):
+        """Return the pagination ordering, by rank for searches."""
+        if self.use_documents():
+            return ('-recipe_id',)
+        if self.request.query_params.get('q'):
+            return ('-rank', '-id')
+        return ('-id',)
+
+    def get_serializer_context(self):
+        """Return the serializer context with m2m mode and output fields."""
+        context = super().get_serializer_context()
+        context['replace_related'] = \
+            self.request.query_params.get('m2m') == 'replace'
+        context['fields'] = self.get_requested_fields()
+        return context
+
     def get_serializer_class(self):
         "Return the serializer class for request."
+        if self.use_documents():
+            if self.action == 'list':
+                return RecipeListDocumentSerializer
+            return RecipeDocumentSerializer
         if self.action == 'list':
-            return RecipeSerializer
+            return RecipeValuesSerializer
         elif self.action == 'upload_image':
             return ImageSerializer
 
         return self.serializer_class
 
+    def perform_create(self, serializer):
+        """Create a recipe, rebuilding its document once."""
+        with collect_documents():
+            serializer.save()
+
+    def perform_update(self, serializer):
+        """Update a recipe, rebuilding its document once."""
+        with collect_documents():
+            serializer.save()
+
     @action(methods=['post'], url_path='upload-image', detail=True)
     def upload_image(self, request, pk=None):
         recipe = self.get_object()
@@ -43,3 +200,182 @@ class RecipeView(viewsets.ModelViewSet):
                                      status.HTTP_200_OK)
         return response.Response(serializer.errors,
                                  status.HTTP_400_BAD_REQUEST)
+
+    @action(methods=['get', 'post'], url_path='batch', url_name='batch',
+            detail=False)
+    def batch_retrieve(self, request):
+        """Retrieve many recipes by id with one query plus prefetches.
+
+        Ids are given as ?ids=1,2,3 or as {"ids": [...]} in a POST body
+        for large sets. Recipes are returned in the order of the ids and
+        ids of missing or other users' recipes are left out.
+        """
+        if request.method == 'GET':
+            data = {'ids': params_to_ints(request.query_params, 'ids')}
+        else:
+            data = request.data
+        serializer = RecipeIdsSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data['ids']))
+        if len(ids) > self.bulk_max_items:
+            raise ValidationError({'ids': ['Expected at most {} ids.'
+                                           .format(self.bulk_max_items)]})
+
+        recipes = list(self.get_queryset().filter(pk__any=ids))
+        data = dict(zip([recipe.pk for recipe in recipes],
+                        self.get_serializer(recipes, many=True).data))
+        return response.Response([data[id_i] for id_i in ids
+                                  if id_i in data], status.HTTP_200_OK)
+
+    @action(methods=['get'], detail=False,
+            renderer_classes=[*api_settings.DEFAULT_RENDERER_CLASSES,
+                              NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """Stream the user's recipes as NDJSON or CSV.
+
+        The format is chosen with ?output=ndjson, the default, or
+        ?output=csv, else by the Accept header, and the tags, ingredients
+        and q filters of the list apply.
+        """
+        output = request.query_params.get('output')
+        if output is None:
+            output = request.accepted_renderer.format if isinstance(
+                request.accepted_renderer, DownloadRenderer) else 'ndjson'
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({'output': ['Expected one of: {}.'.format(
+                ', '.join(EXPORT_FORMATS))]})
+        res = StreamingHttpResponse(iter_export(self.get_queryset(), output),
+                                    content_type=EXPORT_FORMATS[output])
+        res['Content-Disposition'] = \
+            'attachment; filename="recipes.{}"'.format(output)
+        return res
+
+    @action(methods=['post'], url_path='bulk', url_name='bulk',
+            detail=False)
+    def bulk_create(self, request):
+        """Create many recipes, reporting failures per item."""
+        if not isinstance(request.data, list):
+            raise ValidationError({'error': 'Expected a list of recipes.'})
+        if len(request.data) > self.bulk_max_items:
+            raise ValidationError({'error': 'Expected at most {} recipes.'
+                                   .format(self.bulk_max_items)})
+
+        items = [self.get_serializer(data=data) for data in request.data]
+        errors = {i: item.errors for i, item in enumerate(items)
+                  if not item.is_valid()}
+        created = [i for i in range(len(items)) if i not in errors]
+        self._reject_taken_titles(items, created, errors)
+        created = [i for i in created if i not in errors]
+        data = {}
+        while created:
+            try:
+                with collect_documents():
+                    recipes = self.get_serializer(many=True).create(
+                        [items[i].validated_data for i in created])
+                break
+            except IntegrityError:
+                # A concurrent request took one of the titles since they
+                # were checked.
+                if not self._reject_taken_titles(items, created, errors):
+                    raise
+                created = [i for i in created if i not in errors]
+        if created:
+            indexes = {recipe.id: i for i, recipe in zip(created, recipes)}
+            recipes = list(self.get_queryset().filter(id__any=list(indexes)))
+            data = {indexes[recipe.id]: item for recipe, item in zip(
+                recipes, self.get_serializer(recipes, many=True).data)}
+
+        results = [
+            {'status': status.HTTP_201_CREATED, 'data': data[i]}
+            if i in data else
+            {'status': status.HTTP_400_BAD_REQUEST, 'errors': errors[i]}
+            for i in range(len(items))
+        ]
+        if not errors:
+            code = status.HTTP_201_CREATED
+        elif data:
+            code = status.HTTP_207_MULTI_STATUS
+        else:
+            code = status.HTTP_400_BAD_REQUEST
+        return response.Response(results, code)
+
+    def _reject_taken_titles(self, items, indexes, errors):
+        """Add errors for items whose title exists or repeats an earlier one.
+
+        Returns the indexes of the rejected items.
+        """
+        taken = set(self.get_queryset().filter(
+            title__in=[items[i].validated_data['title'] for i in indexes]
+        ).values_list('title', flat=True))
+        rejected = []
+        for i in indexes:
+            title = items[i].validated_data['title']
+            if title in taken:
+                errors[i] = {'title': ['Recipe with this title already '
+                                       'exists.']}
+                rejected.append(i)
+            taken.add(title)
+        return rejected
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        """Update many recipes in one transaction.
+
+        The body is either a list of {id, changes} items or a single
+        {filter, changes} object applying one change set to every
+        matching recipe.
+        """
+        if isinstance(request.data, dict):
+            return self._bulk_update_filtered(request.data)
+        if not isinstance(request.data, list):
+            raise ValidationError({'error': 'Expected a list of changes or '
+                                   'a filter with changes.'})
+        if len(request.data) > self.bulk_max_items:
+            raise ValidationError({'error': 'Expected at most {} recipes.'
+                                   .format(self.bulk_max_items)})
+
+        items = RecipeBulkUpdateItemSerializer(data=request.data, many=True)
+        items.is_valid(raise_exception=True)
+        recipes = self.get_queryset().in_bulk(
+            [item['id'] for item in items.validated_data])
+        changes = []
+        errors = []
+        for item in items.validated_data:
+            serializer = self.get_serializer(data=item['changes'],
+                                             partial=True)
+            if item['id'] not in recipes:
+                errors.append({'id': ['Recipe not found.']})
+            elif not serializer.is_valid():
+                errors.append(serializer.errors)
+            else:
+                errors.append({})
+                changes.append(serializer.validated_data)
+        if any(errors):
+            raise ValidationError(errors)
+
+        with collect_documents():
+            self.get_serializer(many=True).update(
+                [recipes[item['id']] for item in items.validated_data],
+                changes)
+        return response.Response({'updated': len(changes)},
+                                 status.HTTP_200_OK)
+
+    def _bulk_update_filtered(self, data):
+        """Apply one change set to all recipes matching a filter."""
+        recipe_filter = RecipeBulkFilterSerializer(data=data.get('filter'))
+        recipe_filter.is_valid(raise_exception=True)
+        changes = self.get_serializer(data=data.get('changes'), partial=True)
+        changes.is_valid(raise_exception=True)
+
+        queryset = self.get_queryset()
+        params = recipe_filter.validated_data
+        if 'ids' in params:
+            queryset = queryset.filter(id__any=params['ids'])
+        for field in ('tags', 'ingredients'):
+            if field in params:
+                queryset = queryset.filter_related(field, params[field])
+
+        with collect_documents():
+            updated = self.get_serializer(many=True).update_queryset(
+                queryset, changes.validated_data)
+        return response.Response({'updated': updated}, status.HTTP_200_OK)
@@ -197,6 +197,14 @@ class PrivateTagSerializerTest(TestCase):
         for i in range(len(res.data)):
             self.assertEqual(res.data[i], tag_serializers[i].data)
 
+    def test_get_tag_with_invalid_id(self):
+        """Test non numeric tag id params are rejected."""
+        for value in ('abc', '1,abc', '1,,2'):
+            res = self.__client_1.get(TAG_URL, {'id': value})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('id', res.data)
+
     def test_get_tag_with_names_success(self):
         """Test to get tags by prividing tag name parmas."""
         tag_data = [
@@ -1,16 +1,28 @@
 """View module for tag app."""
+from core.autocomplete import AutocompleteMixin
 from core.models import Tag
+from core.filters import TrigramSearchFilter, params_to_ints
+from core.response_cache import ListCacheMixin
+from core.streaming import StreamingListMixin
+from core.versions import ConditionalGetMixin
+from core.pagination import NameCursorPagination
+from user.authentication import (
+    CachedTokenAuthentication, SignedTokenAuthentication
+)
 
 
-from rest_framework import authentication, permissions
+from rest_framework import permissions
 from rest_framework import viewsets, mixins
-from rest_framework.filters import SearchFilter
 from django_filters import rest_framework as filters
 
 from .serializer import TagSerializer
 
 
 class TagView(
+    ConditionalGetMixin,
+    StreamingListMixin,
+    ListCacheMixin,
+    AutocompleteMixin,
     mixins.DestroyModelMixin,
     mixins.UpdateModelMixin,
     mixins.CreateModelMixin,
@@ -20,18 +32,23 @@ class TagView(
     """Generic API view of tag app."""
     serializer_class = TagSerializer
     queryset = Tag.objects.all()
-    filter_backends = [filters.DjangoFilterBackend, SearchFilter]
+    filter_backends = [filters.DjangoFilterBackend, TrigramSearchFilter]
     filterset_fields = ['name']
-    search_fields = ['name']
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication,
+                              SignedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NameCursorPagination
 
     def get_queryset(self):
         """Get custom query set."""
         queryset = self.queryset.filter(user=self.request.user)
-        id_params = self.request.query_params.get('id')
+        ids = params_to_ints(self.request.query_params, 'id')
 
-        if id_params:
-            ids = [int(id_i) for id_i in id_params.split(',')]
-            queryset = queryset.filter(id__in=ids)
-        return queryset.order_by('name')
+        if ids:
+            queryset = queryset.filter(id__any=ids)
+        return queryset.order_by('name', 'id')
+
+    def get_cursor_ordering(self):
+        """Return similarity first when the search is ranked."""
+        return TrigramSearchFilter().get_cursor_ordering(
+            self.request, NameCursorPagination.ordering)
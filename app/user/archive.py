@@ -0,0 +1,113 @@
+"""Account archive module.
+
+An archive is a zip of the user's account, recipes, tags and
+ingredients as JSON plus the recipe images. It is built while it is
+sent: zip entries are written to an unseekable buffer that is drained
+after every chunk, so nothing is stored in temporary files and memory
+stays bounded by the chunk sizes.
+"""
+import io
+import json
+import os
+import time
+import zipfile
+
+from django.core.files.storage import default_storage
+
+from core.models import Recipe, Tag, Ingredient
+from core.streaming import iter_chunks, iter_json
+from ingredient.serializer import IngredientSerializer
+from recipe.exports import iter_export_rows
+from tag.serializer import TagSerializer
+
+from .serializer import UserSerializer
+
+
+ARCHIVE_CHUNK_SIZE = 500
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+class ArchiveBuffer(io.RawIOBase):
+    """Unseekable file collecting the bytes written by zipfile."""
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def pop(self):
+        """Return and forget the bytes written so far."""
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_serialized(queryset, serializer_class):
+    """Yield lists of serialized objects of queryset."""
+    for chunk in iter_chunks(queryset, ARCHIVE_CHUNK_SIZE):
+        yield serializer_class(many=True).to_representation(chunk)
+
+
+def iter_file(name):
+    """Yield the content of a stored file in chunks."""
+    with default_storage.open(name, 'rb') as stored:
+        for chunk in iter(lambda: stored.read(FILE_CHUNK_SIZE), b''):
+            yield chunk
+
+
+def iter_entries(user, missing):
+    """Yield (name, compress type, chunks) of the archive entries.
+
+    Images are stored as images/<recipe id><extension>. Recipes whose
+    image file cannot be found are appended to missing.
+    """
+    yield 'account.json', zipfile.ZIP_DEFLATED, \
+        [json.dumps(UserSerializer(user).data).encode()]
+    for name, queryset, serializer_class in (
+            ('tags.json', Tag.objects.filter(user=user).order_by('id'),
+             TagSerializer),
+            ('ingredients.json',
+             Ingredient.objects.filter(user=user).order_by('id'),
+             IngredientSerializer)):
+        yield name, zipfile.ZIP_DEFLATED, iter_json(
+            iter_serialized(queryset, serializer_class))
+    recipes = Recipe.objects.filter(user=user).order_by('id')
+    yield 'recipes.json', zipfile.ZIP_DEFLATED, iter_json(
+        iter_export_rows(recipes, ARCHIVE_CHUNK_SIZE))
+    for recipe_id, image in recipes.exclude(image='').exclude(
+            image__isnull=True).values_list('id', 'image').iterator():
+        if not default_storage.exists(image):
+            missing.append(recipe_id)
+            continue
+        yield 'images/{}{}'.format(recipe_id, os.path.splitext(image)[1]), \
+            zipfile.ZIP_STORED, iter_file(image)
+
+
+def iter_archive(user):
+    """Yield the bytes of the zip archive of user's account."""
+    return (data for data in _iter_zip(user) if data)
+
+
+def _iter_zip(user):
+    """Yield the bytes written to the archive after every chunk."""
+    buffer = ArchiveBuffer()
+    missing = []
+    date_time = time.localtime()[:6]
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, compress_type, chunks in iter_entries(user, missing):
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.compress_type = compress_type
+            info.external_attr = 0o644 << 16
+            with archive.open(info, 'w', force_zip64=True) as entry:
+                for chunk in chunks:
+                    entry.write(chunk)
+                    yield buffer.pop()
+            yield buffer.pop()
+        archive.writestr('missing_images.json', json.dumps(missing),
+                         zipfile.ZIP_DEFLATED)
+    yield buffer.pop()
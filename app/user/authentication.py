@@ -0,0 +1,131 @@
+"""Authentication module for user app."""
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    BaseAuthentication, TokenAuthentication, get_authorization_header
+)
+
+from .tokens import check_credentials_hash, read_access_token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication caching the token-to-user lookup.
+
+    Tokens and their users are kept in the cache named by the
+    TOKEN_CACHE_ALIAS setting, which bounds the number of entries and
+    their lifetime. Entries are invalidated by the signal receivers in
+    user.signals.
+    """
+    _stats = {'hits': 0, 'misses': 0}
+    _stats_lock = threading.Lock()
+
+    @staticmethod
+    def get_cache():
+        """Return the cache backend holding authenticated tokens."""
+        return caches[settings.TOKEN_CACHE_ALIAS]
+
+    @staticmethod
+    def get_cache_key(key):
+        """Return the cache key of a token key."""
+        return 'auth-token:{}'.format(key)
+
+    @classmethod
+    def invalidate(cls, *keys):
+        """Drop the given token keys from the cache."""
+        cls.get_cache().delete_many([cls.get_cache_key(key) for key in keys])
+
+    @classmethod
+    def stats(cls):
+        """Return the hit and miss counters of this process."""
+        with cls._stats_lock:
+            return dict(cls._stats)
+
+    @classmethod
+    def _count(cls, name):
+        """Increment a hit or miss counter."""
+        with cls._stats_lock:
+            cls._stats[name] += 1
+
+    def authenticate_credentials(self, key):
+        """Return the user and token, reading the cache first."""
+        cache = self.get_cache()
+        cache_key = self.get_cache_key(key)
+        token = cache.get(cache_key)
+        if token is not None:
+            self._count('hits')
+            return (token.user, token)
+
+        self._count('misses')
+        user, token = super().authenticate_credentials(key)
+        cache.set(cache_key, token)
+        return (user, token)
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """Authentication of short-lived signed access tokens.
+
+    Clients send "Authorization: Bearer <access token>". The token is
+    verified without a database read and its user is loaded through the
+    same cache as CachedTokenAuthentication.
+    """
+    keyword = 'Bearer'
+
+    @staticmethod
+    def get_cache_key(user_id):
+        """Return the cache key of a user id."""
+        return 'auth-user:{}'.format(user_id)
+
+    @classmethod
+    def invalidate(cls, *user_ids):
+        """Drop the given users from the cache."""
+        CachedTokenAuthentication.get_cache().delete_many(
+            [cls.get_cache_key(user_id) for user_id in user_ids])
+
+    def authenticate(self, request):
+        """Return the user and token of a valid bearer token."""
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(
+                _('Invalid token header.'))
+
+        try:
+            token = auth[1].decode()
+            user_id, credentials = read_access_token(token)
+        except (UnicodeError, signing.BadSignature):
+            raise exceptions.AuthenticationFailed(
+                _('Invalid or expired token.'))
+        return (self.get_user(user_id, credentials), token)
+
+    def get_user(self, user_id, credentials):
+        """Return an active user, reading the cache first.
+
+        The token's credentials hash must match the current password.
+        """
+        cache = CachedTokenAuthentication.get_cache()
+        cache_key = self.get_cache_key(user_id)
+        user = cache.get(cache_key)
+        if user is None:
+            user = get_user_model().objects.filter(pk=user_id).first()
+            if user is None:
+                raise exceptions.AuthenticationFailed(
+                    _('User inactive or deleted.'))
+            cache.set(cache_key, user)
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.'))
+        if not check_credentials_hash(user, credentials):
+            raise exceptions.AuthenticationFailed(
+                _('Invalid or expired token.'))
+        return user
+
+    def authenticate_header(self, request):
+        return self.keyword
@@ -55,3 +55,8 @@ class AuthenticationSerializer(serializers.Serializer):
 
         attrs['user'] = user
         return attrs
+
+
+class RefreshTokenSerializer(serializers.Serializer):
+    """Serializer for exchanging a refresh token."""
+    refresh = serializers.CharField(trim_whitespace=False)
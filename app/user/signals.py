@@ -0,0 +1,81 @@
+"""Signal receivers module for user app."""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from core import bus
+from core.models import RefreshToken
+from core.signals import invalidation_received
+
+from .authentication import (
+    CachedTokenAuthentication, SignedTokenAuthentication
+)
+
+
+def invalidate_tokens(user_ids=(), keys=()):
+    """Drop users and token keys now and again once the write commits.
+
+    The second drop keeps a request that authenticated during the
+    transaction from caching the old rows past the commit.
+    """
+    def invalidate():
+        SignedTokenAuthentication.invalidate(*user_ids)
+        CachedTokenAuthentication.invalidate(*keys)
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Drop a deleted token from the token cache."""
+    invalidate_tokens(keys=[instance.key])
+    bus.publish(Token, keys=[instance.key])
+
+
+@receiver(pre_save, sender=get_user_model())
+def detect_password_change(sender, instance, raw=False, update_fields=None,
+                           **kwargs):
+    """Remember whether a save replaces the stored password hash."""
+    instance.password_hash_changed = False
+    if raw or instance.pk is None or (
+            update_fields is not None and 'password' not in update_fields):
+        return
+    stored = sender.objects.filter(pk=instance.pk).values_list(
+        'password', flat=True).first()
+    instance.password_hash_changed = \
+        stored is not None and stored != instance.password
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+    """Drop the tokens of a changed user from the token cache.
+
+    Any saved change, such as a deactivation or a new password, must not
+    keep serving the cached copy of the user. A new password also
+    deletes the user's refresh tokens.
+    """
+    if getattr(instance, 'password_hash_changed', False):
+        RefreshToken.objects.filter(user=instance).delete()
+    if not created:
+        keys = list(Token.objects.filter(user=instance).values_list(
+            'key', flat=True))
+        invalidate_tokens(user_ids=[instance.pk], keys=keys)
+        bus.publish(sender, user_ids=[instance.pk], keys=keys)
+
+
+@receiver(post_delete, sender=get_user_model())
+def invalidate_deleted_user(sender, instance, **kwargs):
+    """Drop a deleted user from the token cache."""
+    invalidate_tokens(user_ids=[instance.pk])
+    bus.publish(sender, user_ids=[instance.pk])
+
+
+@receiver(invalidation_received, sender=Token)
+@receiver(invalidation_received, sender=get_user_model())
+def invalidate_received_tokens(sender, user_ids, keys, **kwargs):
+    """Drop the users and tokens another process changed."""
+    SignedTokenAuthentication.invalidate(*user_ids)
+    CachedTokenAuthentication.invalidate(*keys)
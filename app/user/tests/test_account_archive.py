@@ -0,0 +1,104 @@
+"""Test for the account archive download."""
+import io
+import json
+import tempfile
+import zipfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag, Ingredient
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+
+ARCHIVE_URL = reverse('user:me-archive')
+
+
+class AccountArchiveTest(TestCase):
+    """Test class of streaming account archives."""
+    def setUp(self):
+        super().setUp()
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(MEDIA_ROOT=media.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='test1234567890'
+        )
+        self.__client = APIClient()
+        self.__client.force_authenticate(self.__user)
+        self.__image = bytes(range(256)) * 1024
+        tag = Tag.objects.create(user=self.__user, name='Vegan')
+        Ingredient.objects.create(user=self.__user, name='Salt')
+        self.__recipes = []
+        for i, image in enumerate([self.__image, None, b'gone']):
+            recipe = Recipe.objects.create(
+                user=self.__user, title='Test title{}'.format(i),
+                time_minutes=10, price='10.50')
+            recipe.tags.add(tag)
+            if image is not None:
+                recipe.image.save('photo.png', ContentFile(image))
+            self.__recipes.append(recipe)
+        default_storage.delete(self.__recipes[2].image.name)
+        other = get_user_model().objects.create_user(
+            name='Other name',
+            email='other@example.com',
+            password='test1234567890'
+        )
+        Tag.objects.create(user=other, name='Other')
+
+    def test_download_archive(self):
+        """Test the archive holds the account data and images."""
+        res = self.__client.get(ARCHIVE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Type'], 'application/zip')
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(res.streaming_content)))
+        self.assertIsNone(archive.testzip())
+        first, _, missing = self.__recipes
+        self.assertEqual(archive.namelist(), [
+            'account.json', 'tags.json', 'ingredients.json', 'recipes.json',
+            'images/{}.png'.format(first.id), 'missing_images.json'])
+        self.assertEqual(json.loads(archive.read('account.json')),
+                         {'email': 'test@example.com', 'name': 'Test name'})
+        self.assertEqual([tag['name'] for tag in
+                          json.loads(archive.read('tags.json'))], ['Vegan'])
+        recipes = json.loads(archive.read('recipes.json'))
+        self.assertEqual([recipe['title'] for recipe in recipes],
+                         ['Test title0', 'Test title1', 'Test title2'])
+        self.assertEqual(recipes[0]['tags'][0]['name'], 'Vegan')
+        self.assertEqual(archive.read('images/{}.png'.format(first.id)),
+                         self.__image)
+        self.assertEqual(json.loads(archive.read('missing_images.json')),
+                         [missing.id])
+
+    def test_archive_accept_header(self):
+        """Test the archive media types are accepted."""
+        for accept in ('application/zip', 'application/octet-stream'):
+            res = self.__client.get(ARCHIVE_URL, HTTP_ACCEPT=accept)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res['Content-Type'], 'application/zip')
+            archive = zipfile.ZipFile(
+                io.BytesIO(b''.join(res.streaming_content)))
+            self.assertIn('account.json', archive.namelist())
+
+        res = APIClient().get(ARCHIVE_URL, HTTP_ACCEPT='application/zip')
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res['Content-Type'], 'application/json')
+
+    def test_archive_requires_authentication(self):
+        """Test anonymous users cannot download an archive."""
+        res = APIClient().get(ARCHIVE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,109 @@
+"""Test for cached token authentication."""
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from user.authentication import CachedTokenAuthentication
+
+
+ME_USER_URL = reverse('user:me')
+TOKEN_CACHE_STATS_URL = reverse('user:token-cache-stats')
+
+
+class CachedTokenAuthenticationTest(TestCase):
+    """Test class of the cached token authentication backend."""
+    def setUp(self):
+        super().setUp()
+        CachedTokenAuthentication.get_cache().clear()
+        self.__user = get_user_model().objects.create_user(
+            name='Test name',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.__token = Token.objects.create(user=self.__user)
+        self.__client = APIClient()
+        self.__client.credentials(
+            HTTP_AUTHORIZATION='Token {}'.format(self.__token.key))
+
+    def test_second_request_hits_cache(self):
+        """Test the token lookup runs only on the first request."""
+        before = CachedTokenAuthentication.stats()
+        with self.assertNumQueries(1):
+            res = self.__client.get(ME_USER_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.__client.get(ME_USER_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.__user.email)
+
+        after = CachedTokenAuthentication.stats()
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+
+    def test_invalid_token(self):
+        """Test an unknown token is rejected and not cached."""
+        self.__client.credentials(HTTP_AUTHORIZATION='Token invalid')
+        for _ in range(2):
+            res = self.__client.get(ME_USER_URL)
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token_is_invalidated(self):
+        """Test a deleted token stops authenticating."""
+        self.__client.get(ME_USER_URL)
+        self.__token.delete()
+
+        res = self.__client.get(ME_USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token_is_invalidated_on_commit(self):
+        """Test a token cached again before the delete commits is dropped."""
+        self.__client.get(ME_USER_URL)
+        cache = CachedTokenAuthentication.get_cache()
+        cache_key = CachedTokenAuthentication.get_cache_key(self.__token.key)
+        cached = cache.get(cache_key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.__token.delete()
+            cache.set(cache_key, cached)
+
+        res = self.__client.get(ME_USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_invalidated(self):
+        """Test a deactivated user stops authenticating."""
+        self.__client.get(ME_USER_URL)
+        self.__user.is_active = False
+        self.__user.save()
+
+        res = self.__client.get(ME_USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_is_invalidated(self):
+        """Test a password change drops the cached user."""
+        self.__client.get(ME_USER_URL)
+        self.__client.patch(ME_USER_URL, {'password': 'newpass123'})
+
+        with self.assertNumQueries(1):
+            res = self.__client.get(ME_USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_stats_require_admin(self):
+        """Test only admin users can read the cache counters."""
+        res = self.__client.get(TOKEN_CACHE_STATS_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.__user.is_staff = True
+        self.__user.save()
+        res = self.__client.get(TOKEN_CACHE_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(res.data), {'hits', 'misses'})
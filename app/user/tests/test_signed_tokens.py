@@ -0,0 +1,192 @@
+"""Test for signed access tokens."""
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import RefreshToken
+from user.authentication import (
+    CachedTokenAuthentication, SignedTokenAuthentication
+)
+
+
+SIGNED_TOKEN_URL = reverse('user:token-signed')
+REFRESH_TOKEN_URL = reverse('user:token-refresh')
+ME_USER_URL = reverse('user:me')
+
+
+class SignedTokenTest(TestCase):
+    """Test class of signed access and refresh tokens."""
+    def setUp(self):
+        super().setUp()
+        CachedTokenAuthentication.get_cache().clear()
+        self.__payload = {
+            'email': 'test@example.com',
+            'password': 'testpass123',
+        }
+        self.__user = get_user_model().objects.create_user(
+            name='Test name', **self.__payload)
+        self.__client = APIClient()
+
+    def get_tokens(self):
+        """Return a new token pair for the test user."""
+        res = self.__client.post(SIGNED_TOKEN_URL, self.__payload)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_create_token_pair(self):
+        """Test valid credentials return an access and refresh token."""
+        tokens = self.get_tokens()
+
+        self.assertIn('access', tokens)
+        self.assertIn('refresh', tokens)
+        self.assertTrue(RefreshToken.objects.filter(
+            key=tokens['refresh'], user=self.__user).exists())
+
+    def test_create_token_bad_credentials(self):
+        """Test invalid credentials are rejected."""
+        res = self.__client.post(SIGNED_TOKEN_URL, {
+            'email': self.__payload['email'],
+            'password': 'wrong',
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_access_token_without_query(self):
+        """Test a warm access token is verified without the database."""
+        access = self.get_tokens()['access']
+        self.__client.credentials(
+            HTTP_AUTHORIZATION='Bearer {}'.format(access))
+        self.__client.get(ME_USER_URL)
+
+        with self.assertNumQueries(0):
+            res = self.__client.get(ME_USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.__payload['email'])
+
+    def test_tampered_access_token(self):
+        """Test a modified access token is rejected."""
+        access = self.get_tokens()['access']
+        self.__client.credentials(
+            HTTP_AUTHORIZATION='Bearer {}x'.format(access))
+
+        res = self.__client.get(ME_USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(ACCESS_TOKEN_LIFETIME=60)
+    def test_expired_access_token(self):
+        """Test an access token past its lifetime is rejected."""
+        with patch('django.core.signing.time.time',
+                   return_value=timezone.now().timestamp() - 120):
+            access = self.get_tokens()['access']
+        self.__client.credentials(
+            HTTP_AUTHORIZATION='Bearer {}'.format(access))
+
+        res = self.__client.get(ME_USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_access_token(self):
+        """Test access tokens of a deactivated user are rejected."""
+        access = self.get_tokens()['access']
+        self.__client.credentials(
+            HTTP_AUTHORIZATION='Bearer {}'.format(access))
+        self.__client.get(ME_USER_URL)
+        self.__user.is_active = False
+        self.__user.save()
+
+        res = self.__client.get(ME_USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_changes_are_invalidated_on_commit(self):
+        """Test a user cached again before a save or delete commits."""
+        access = self.get_tokens()['access']
+        self.__client.credentials(
+            HTTP_AUTHORIZATION='Bearer {}'.format(access))
+        self.__client.get(ME_USER_URL)
+        cache = CachedTokenAuthentication.get_cache()
+        cache_key = SignedTokenAuthentication.get_cache_key(self.__user.pk)
+        cached = cache.get(cache_key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.__user.set_password('newpass123')
+            self.__user.save()
+            cache.set(cache_key, cached)
+
+        res = self.__client.get(ME_USER_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.__user.delete()
+            cache.set(cache_key, cached)
+
+        self.assertIsNone(cache.get(cache_key))
+
+    def test_refresh_rotates_token(self):
+        """Test a refresh token is exchanged once for a new pair."""
+        refresh = self.get_tokens()['refresh']
+
+        res = self.__client.post(REFRESH_TOKEN_URL, {'refresh': refresh})
+        res_reused = self.__client.post(REFRESH_TOKEN_URL,
+                                        {'refresh': refresh})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res.data['refresh'], refresh)
+        self.assertEqual(res_reused.status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(RefreshToken.objects.count(), 1)
+
+    def test_refresh_expired_token(self):
+        """Test an expired refresh token is rejected."""
+        refresh = self.get_tokens()['refresh']
+        RefreshToken.objects.update(expires_at=timezone.now())
+
+        res = self.__client.post(REFRESH_TOKEN_URL, {'refresh': refresh})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(RefreshToken.objects.exists())
+
+    def test_password_change_revokes_tokens(self):
+        """Test a new password rejects older refresh and access tokens."""
+        tokens = self.get_tokens()
+        self.__client.credentials(
+            HTTP_AUTHORIZATION='Bearer {}'.format(tokens['access']))
+        self.__client.get(ME_USER_URL)
+
+        res = self.__client.patch(ME_USER_URL, {'password': 'newpass123'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(RefreshToken.objects.exists())
+        res = self.__client.get(ME_USER_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.__client.credentials()
+        res = self.__client.post(REFRESH_TOKEN_URL,
+                                 {'refresh': tokens['refresh']})
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.__payload['password'] = 'newpass123'
+        access = self.get_tokens()['access']
+        self.__client.credentials(
+            HTTP_AUTHORIZATION='Bearer {}'.format(access))
+        res = self.__client.get(ME_USER_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_profile_change_keeps_tokens(self):
+        """Test saving a user without a new password keeps its tokens."""
+        tokens = self.get_tokens()
+        self.__user.name = 'New name'
+        self.__user.save()
+        self.__client.credentials(
+            HTTP_AUTHORIZATION='Bearer {}'.format(tokens['access']))
+
+        res = self.__client.get(ME_USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(RefreshToken.objects.exists())
@@ -0,0 +1,76 @@
+"""Signed access token module for user app."""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils import timezone
+
+from core.models import RefreshToken
+
+
+ACCESS_TOKEN_SALT = 'user.tokens.access'
+
+
+def get_credentials_hash(user):
+    """Return a short hash of the user's password hash.
+
+    Access tokens carry it, so a new password rejects older tokens.
+    """
+    return salted_hmac(ACCESS_TOKEN_SALT, user.password).hexdigest()[:16]
+
+
+def create_access_token(user):
+    """Return a signed, timestamped access token for a user."""
+    return signing.dumps({'uid': user.pk, 'pwd': get_credentials_hash(user)},
+                         salt=ACCESS_TOKEN_SALT)
+
+
+def read_access_token(token):
+    """Return the user id and credentials hash of a valid access token.
+
+    The signature and age are checked in Python without any database
+    access. Raises signing.BadSignature, or its subclass
+    signing.SignatureExpired, for rejected tokens.
+    """
+    payload = signing.loads(token, salt=ACCESS_TOKEN_SALT,
+                            max_age=settings.ACCESS_TOKEN_LIFETIME)
+    return payload['uid'], payload.get('pwd', '')
+
+
+def check_credentials_hash(user, credentials):
+    """Return True if credentials is the current hash of the user."""
+    return constant_time_compare(credentials, get_credentials_hash(user))
+
+
+def create_token_pair(user):
+    """Create a refresh token and return it with a new access token."""
+    refresh = RefreshToken.objects.create(
+        user=user,
+        expires_at=timezone.now() +
+        timedelta(seconds=settings.REFRESH_TOKEN_LIFETIME)
+    )
+    return {
+        'access': create_access_token(user),
+        'refresh': refresh.key,
+        'expires_in': settings.ACCESS_TOKEN_LIFETIME,
+    }
+
+
+def rotate_refresh_token(key):
+    """Exchange a refresh token for a new token pair.
+
+    The used refresh token is deleted. Returns None when the key is
+    unknown, expired or belongs to an inactive user.
+    """
+    with transaction.atomic():
+        refresh = RefreshToken.objects.select_for_update().select_related(
+            'user').filter(key=key).first()
+        if refresh is None:
+            return None
+        refresh.delete()
+        if refresh.expires_at <= timezone.now() or \
+                not refresh.user.is_active:
+            return None
+        return create_token_pair(refresh.user)
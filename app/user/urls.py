@@ -1,7 +1,8 @@
 """URLS module for user app"""
 from django.urls import path
 from .views import (
-    CreateUserView, CreateTokenView, MangeUserView
+    CreateUserView, CreateTokenView, MangeUserView, TokenCacheStatsView,
+    CreateSignedTokenView, RefreshSignedTokenView, AccountArchiveView
 )
 
 
@@ -10,5 +11,12 @@ app_name = 'user'
 urlpatterns = [
     path('create/', CreateUserView.as_view(), name='create'),
     path('token/', CreateTokenView.as_view(), name='token'),
-    path('me/', MangeUserView.as_view(), name='me')
+    path('token/signed/', CreateSignedTokenView.as_view(),
+         name='token-signed'),
+    path('token/refresh/', RefreshSignedTokenView.as_view(),
+         name='token-refresh'),
+    path('me/', MangeUserView.as_view(), name='me'),
+    path('me/archive/', AccountArchiveView.as_view(), name='me-archive'),
+    path('token/cache-stats/', TokenCacheStatsView.as_view(),
+         name='token-cache-stats'),
 ]
@@ -1,7 +1,18 @@
 """View module for user app."""
-from .serializer import UserSerializer, AuthenticationSerializer
+from .archive import iter_archive
+from .authentication import (
+    CachedTokenAuthentication, SignedTokenAuthentication
+)
+from .serializer import (
+    UserSerializer, AuthenticationSerializer, RefreshTokenSerializer
+)
+from .tokens import create_token_pair, rotate_refresh_token
 
-from rest_framework import generics, authentication, permissions
+from django.http import StreamingHttpResponse
+
+from core.renderers import OctetStreamRenderer, ZipRenderer
+
+from rest_framework import generics, permissions, views, response, status
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
 
@@ -17,12 +28,69 @@ class CreateTokenView(ObtainAuthToken):
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
 
 
+class CreateSignedTokenView(generics.GenericAPIView):
+    """Create a signed access token and a refresh token for user."""
+    serializer_class = AuthenticationSerializer
+
+    def post(self, request):
+        """Return a new token pair for valid credentials."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return response.Response(
+            create_token_pair(serializer.validated_data['user']))
+
+
+class RefreshSignedTokenView(generics.GenericAPIView):
+    """Exchange a refresh token for a new token pair."""
+    serializer_class = RefreshTokenSerializer
+
+    def post(self, request):
+        """Return a new token pair for a valid refresh token."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        tokens = rotate_refresh_token(serializer.validated_data['refresh'])
+        if tokens is None:
+            return response.Response(
+                {'refresh': ['Invalid or expired refresh token.']},
+                status.HTTP_401_UNAUTHORIZED)
+        return response.Response(tokens)
+
+
 class MangeUserView(generics.RetrieveUpdateAPIView):
     """Manage the authentication user."""
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication,
+                              SignedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
         """Retrive and return the authenticated user."""
         return self.request.user
+
+
+class AccountArchiveView(views.APIView):
+    """Download a zip archive of the authenticated user's account."""
+    authentication_classes = [CachedTokenAuthentication,
+                              SignedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES,
+                        ZipRenderer, OctetStreamRenderer]
+
+    def get(self, request):
+        """Stream the archive while it is being built."""
+        res = StreamingHttpResponse(iter_archive(request.user),
+                                    content_type='application/zip')
+        res['Content-Disposition'] = \
+            'attachment; filename="account-{}.zip"'.format(request.user.pk)
+        return res
+
+
+class TokenCacheStatsView(views.APIView):
+    """Report the token cache hit and miss counters of this process."""
+    authentication_classes = [CachedTokenAuthentication,
+                              SignedTokenAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        """Return the token cache counters."""
+        return response.Response(CachedTokenAuthentication.stats())